@@ -1 +1 @@
-__all__ = ["parser", "models", "utils"]
+__all__ = ["parser", "models", "utils", "catalog", "recommend"]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+import os
+import sys
+import mmap
+import array
+import math
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Iterator, Sequence
+
+from .models import ParsedAudit
+
+# Reader for the binary catalog snapshot the ETL writes (etl/snapshot.py
+# documents the layout). The file is memory-mapped read-only, so every
+# process that opens it shares the same pages and a lookup is a binary
+# search over the sorted id table plus a few unpack_from calls: nothing is
+# parsed or copied up front.
+
+MAGIC = b"CATSNAP\x00"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIIIQ10Q")
+_F32 = struct.Struct("<f")
+_U64 = struct.Struct("<Q")
+_REF = struct.Struct("<II")
+
+# Statuses whose courses count toward gen-ed coverage.
+COUNTED = ("completed", "in_progress", "transfer")
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+@dataclass
+class CatalogEntry:
+    course_id: str
+    title: str
+    credits: Optional[float]
+    gen_eds: List[str] = field(default_factory=list)
+    avg_gpa: Optional[float] = None
+    terms: List[str] = field(default_factory=list)
+
+
+def _opt(x: float) -> Optional[float]:
+    return None if math.isnan(x) else round(x, 3)
+
+
+class CatalogSnapshot:
+    _cache: Dict[str, "CatalogSnapshot"] = {}
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        if len(self._mm) < _HEADER.size:
+            raise SnapshotError(f"{path}: too short for a catalog snapshot")
+        (magic, self.version, self.id_width, self.n, n_geneds, n_terms, self.created,
+         self._ids, self._credits, self._geneds, self._gpa, self._terms, self._titles,
+         gened_names, term_names, self._heap, _heap_len) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: not a catalog snapshot")
+        if self.version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: snapshot format {self.version}, expected {FORMAT_VERSION}")
+        # The name tables are tiny; decode them once.
+        self.gen_ed_names = [self._ref(gened_names, i) for i in range(n_geneds)]
+        self.term_names = [self._ref(term_names, i) for i in range(n_terms)]
+
+    @classmethod
+    def open(cls, path: Optional[str] = None) -> "CatalogSnapshot":
+        """Shared instance per path (default: $CATALOG_SNAPSHOT)."""
+        path = os.path.abspath(path or os.environ.get("CATALOG_SNAPSHOT") or "")
+        if not os.path.isfile(path):
+            raise SnapshotError(f"no catalog snapshot at {path or '(unset CATALOG_SNAPSHOT)'}")
+        snap = cls._cache.get(path)
+        if snap is None:
+            snap = cls._cache[path] = cls(path)
+        return snap
+
+    def close(self) -> None:
+        self._cache.pop(os.path.abspath(self.path), None)
+        for view in self._views:
+            view.release()
+        self._mm.close()
+
+    def _ref(self, table: int, i: int) -> str:
+        off, length = _REF.unpack_from(self._mm, table + 8 * i)
+        start = self._heap + off
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _key(self, i: int) -> bytes:
+        start = self._ids + i * self.id_width
+        return self._mm[start:start + self.id_width]
+
+    def _bits(self, mask: int, names: List[str]) -> List[str]:
+        return [name for bit, name in enumerate(names) if mask >> bit & 1]
+
+    def index_of(self, course_id: str) -> int:
+        """Row of a course id, or -1."""
+        key = course_id.encode("utf-8").ljust(self.id_width, b"\0")
+        if len(key) > self.id_width:
+            return -1
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.n and self._key(lo) == key else -1
+
+    def course_id(self, i: int) -> str:
+        return self._key(i).rstrip(b"\0").decode("utf-8")
+
+    def credits(self, i: int) -> Optional[float]:
+        return _opt(_F32.unpack_from(self._mm, self._credits + 4 * i)[0])
+
+    def avg_gpa(self, i: int) -> Optional[float]:
+        return _opt(_F32.unpack_from(self._mm, self._gpa + 4 * i)[0])
+
+    def gen_ed_mask(self, i: int) -> int:
+        return _U64.unpack_from(self._mm, self._geneds + 8 * i)[0]
+
+    def term_mask(self, i: int) -> int:
+        return _U64.unpack_from(self._mm, self._terms + 8 * i)[0]
+
+    def _column(self, offset: int, fmt: str) -> Sequence:
+        """A fixed-width column as a typed sequence: a view of the map (a copy on big-endian hosts)."""
+        raw = memoryview(self._mm)[offset:offset + struct.calcsize(fmt) * self.n]
+        if sys.byteorder != "little":
+            col = array.array(fmt, raw.tobytes())
+            raw.release()
+            col.byteswap()
+            return col
+        col = raw.cast(fmt)
+        self._views += [col, raw]
+        return col
+
+    def gpa_column(self) -> Sequence[float]:
+        """avgGpa of every row (NaN where unknown), for scans over the whole catalog."""
+        return self._column(self._gpa, "f")
+
+    def term_column(self) -> Sequence[int]:
+        """Terms-offered bitmask of every row (bits index term_names)."""
+        return self._column(self._terms, "Q")
+
+    def entry(self, i: int) -> CatalogEntry:
+        return CatalogEntry(
+            course_id=self.course_id(i),
+            title=self._ref(self._titles, i),
+            credits=self.credits(i),
+            gen_eds=self._bits(self.gen_ed_mask(i), self.gen_ed_names),
+            avg_gpa=self.avg_gpa(i),
+            terms=self._bits(self.term_mask(i), self.term_names),
+        )
+
+    def lookup(self, course_id: str) -> Optional[CatalogEntry]:
+        i = self.index_of(course_id)
+        return self.entry(i) if i >= 0 else None
+
+    def __contains__(self, course_id: str) -> bool:
+        return self.index_of(course_id) >= 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return (self.entry(i) for i in range(self.n))
+
+
+def enrich(audit: ParsedAudit, snapshot: CatalogSnapshot) -> ParsedAudit:
+    """
+    Attach catalog fields to each parsed course (course.catalog) and add
+    audit.catalog: the snapshot's version, gen-ed coverage (gen-ed name ->
+    counted course ids carrying it) and course ids the snapshot lacks.
+    """
+    coverage: Dict[str, List[str]] = {}
+    missing: List[str] = []
+    for course in audit.courses:
+        if not course.subject or not course.number:
+            continue
+        course_id = f"{course.subject} {course.number}"
+        entry = snapshot.lookup(course_id)
+        if entry is None:
+            if course_id not in missing:
+                missing.append(course_id)
+            continue
+        course.catalog = {
+            "title": entry.title,
+            "credits": entry.credits,
+            "gen_eds": entry.gen_eds,
+            "avg_gpa": entry.avg_gpa,
+            "terms": entry.terms,
+        }
+        if course.status in COUNTED:
+            for gen_ed in entry.gen_eds:
+                ids = coverage.setdefault(gen_ed, [])
+                if course_id not in ids:
+                    ids.append(course_id)
+
+    audit.catalog = {
+        "snapshot": {"path": snapshot.path, "version": snapshot.version, "created": snapshot.created, "courses": len(snapshot)},
+        "gen_ed_coverage": {g: coverage[g] for g in sorted(coverage)},
+        "missing_courses": missing,
+    }
+    return audit
@@ -6,12 +6,16 @@ import click
 # Support both module and direct execution
 try:
     from .parser import parse  # preferred
+    from .catalog import CatalogSnapshot, enrich
+    from .recommend import Criteria, recommend
 except ImportError:
     import sys, os
     pkg_root = os.path.dirname(os.path.dirname(__file__))
     if pkg_root not in sys.path:
         sys.path.insert(0, pkg_root)
     from audit_parser.parser import parse  # type: ignore
+    from audit_parser.catalog import CatalogSnapshot, enrich  # type: ignore
+    from audit_parser.recommend import Criteria, recommend  # type: ignore
 
 
 @click.group()
@@ -24,8 +28,33 @@ def cli():
 @click.option("-o", "--out", "out_path", type=click.Path(dir_okay=False), default="-", help="Output JSON path (default: stdout)")
 @click.option("--debug", is_flag=True, help="Print basic debugging info to stderr.")
 @click.option("--keep-pii", is_flag=True, help="Include a hash of Student ID if present. Off by default.")
-def parse_cmd(pdf_path: str, out_path: str, debug: bool, keep_pii: bool):
+@click.option("--catalog", "catalog_path", type=click.Path(exists=True, dir_okay=False), envvar="CATALOG_SNAPSHOT",
+              default=None, help="Catalog snapshot from the ETL; adds catalog fields and gen-ed coverage.")
+@click.option("--recommend", "do_recommend", is_flag=True,
+              help="Rank the remaining options of every open item (needs --catalog).")
+@click.option("--next-term", default=None, help="Term to rank 'offered next term' against, e.g. 2026-sp (default: newest in the snapshot).")
+@click.option("--top-k", type=int, default=5, show_default=True, help="Options kept per item.")
+@click.option("--weight", "weights", multiple=True, metavar="NAME=W",
+              help="Ranking weight: gpa, next_term or overlap (repeatable; defaults 1, 1, 0.5).")
+def parse_cmd(pdf_path: str, out_path: str, debug: bool, keep_pii: bool, catalog_path: str,
+              do_recommend: bool, next_term: str, top_k: int, weights):
+    if do_recommend and not catalog_path:
+        raise click.UsageError("--recommend needs --catalog (or CATALOG_SNAPSHOT)")
+    criteria = Criteria(top_k=top_k, term=next_term)
+    for w in weights:
+        name, _, value = w.partition("=")
+        if name not in ("gpa", "next_term", "overlap"):
+            raise click.BadParameter(f"unknown weight {name!r}", param_hint="--weight")
+        try:
+            setattr(criteria, name, float(value))
+        except ValueError:
+            raise click.BadParameter(f"{w!r} is not NAME=number", param_hint="--weight")
     pa = parse(pdf_path, debug=debug, keep_pii=keep_pii)
+    if catalog_path:
+        snapshot = CatalogSnapshot.open(catalog_path)
+        enrich(pa, snapshot)
+        if do_recommend:
+            recommend(pa, snapshot, criteria)
     payload = pa.to_dict()
     txt = json.dumps(payload, indent=2, ensure_ascii=False)
     if out_path == "-" or out_path is None:
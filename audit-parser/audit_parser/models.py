@@ -17,6 +17,7 @@ class ParsedCourse:
     flags: List[str] = field(default_factory=list)
     status: Status = "completed"
     raw: str = ""
+    catalog: Optional[Dict[str, Any]] = None  # from the catalog snapshot, when enriched
 
 @dataclass
 class RequirementItem:
@@ -49,6 +50,8 @@ class ParsedAudit:
     sections: List[RequirementSection] = field(default_factory=list)
     counters: Dict[str, Any] = field(default_factory=dict)
     warnings: List[str] = field(default_factory=list)
+    catalog: Optional[Dict[str, Any]] = None  # snapshot info + gen-ed coverage, when enriched
+    recommendations: Optional[Dict[str, Any]] = None  # ranked options per open item, see recommend.py
 
     def to_dict(self) -> Dict[str, Any]:
         def _dc(o):
@@ -5,7 +5,7 @@ from typing import List, Dict, Optional, Tuple
 from .models import ParsedAudit, ParsedCourse, RequirementSection, RequirementItem
 from .utils import (
     is_section_header, slugify, sha256, normalize_catalog_year,
-    parse_float, trim_flags, normalize_unit, course_level
+    parse_float, trim_flags, normalize_unit, course_level, normalize_options
 )
 
 # --------------------
@@ -470,22 +470,7 @@ def parse(pdf_path: str, debug: bool=False, keep_pii: bool=False) -> ParsedAudit
                     it.kind = "courses"
 
             if it.select_from:
-                norm_opts: List[str] = []
-                last_subj = None
-                for token in it.select_from:
-                    token = token.strip()
-                    if not token:
-                        continue
-                    m = re.match(r"^([A-Z]{2,5})\s*(\d{2,3}[A-Z]?)$", token)
-                    if m:
-                        last_subj = m.group(1)
-                        norm_opts.append(f"{m.group(1)} {m.group(2)}")
-                    else:
-                        m2 = re.match(r"^(\d{2,3}[A-Z]?)$", token)
-                        if m2 and last_subj:
-                            norm_opts.append(f"{last_subj} {m2.group(1)}")
-                        else:
-                            norm_opts.append(token)
+                norm_opts = normalize_options(it.select_from)
                 chosen = set(it.satisfied_by)
                 remaining = [o for o in norm_opts if o not in chosen]
                 if it.needed is not None and it.unit and it.unit.startswith("COURSE"):
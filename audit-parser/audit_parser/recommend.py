@@ -0,0 +1,219 @@
+from __future__ import annotations
+import math
+import heapq
+import weakref
+import regex as re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple
+
+from .models import ParsedAudit, RequirementItem
+from .catalog import CatalogSnapshot, COUNTED
+from .utils import normalize_options
+
+# Ranks the remaining options of every open requirement item against the
+# catalog snapshot the ETL writes. The parser's needed_courses are just the
+# first options in SELECT FROM order; here each option gets a score
+#
+#   gpa * avgGpa/4  +  next_term * offered_next  +  overlap * shared
+#
+# where shared is the fraction of the other open items the option also
+# appears in. Options taken already (completed, in progress, transfer) are
+# left out, unknown avgGpa counts as the catalog mean, and the best top_k
+# per item come out of a heap. Combinations ("CS 233 + CS 341") score the
+# mean GPA of their members and count as offered only if all members are.
+#
+# The GPA and term columns are read straight from the memory-mapped
+# snapshot, and the id -> row table is built once per snapshot, so a whole
+# audit is one pass over its options with each distinct course looked up
+# and scored once.
+
+SEASONS = {"sp": 0, "su": 1, "fa": 2, "wi": 3}
+TERM_RE = re.compile(r"^(\d{4})-([a-z]{2})$")
+MAX_GPA = 4.0
+
+
+@dataclass
+class Criteria:
+    gpa: float = 1.0                    # weight of avgGpa (scaled to 0..1)
+    next_term: float = 1.0              # weight of being offered next term
+    overlap: float = 0.5                # weight of also counting toward other open items
+    top_k: int = 5                      # options per item (never fewer than the item still needs)
+    term: Optional[str] = None          # next term, e.g. "2026-sp" (default: the snapshot's newest)
+    offered_only: bool = False          # drop options not offered next term
+
+
+@dataclass
+class RankedOption:
+    course_id: str
+    score: float
+    avg_gpa: Optional[float] = None
+    offered_next: bool = False
+    also_satisfies: List[str] = field(default_factory=list)  # other open item ids
+    in_catalog: bool = True
+
+
+@dataclass
+class ItemRecommendation:
+    item_id: str
+    section_id: str
+    header_raw: str
+    needed: Optional[float]
+    unit: Optional[str]
+    options: List[RankedOption] = field(default_factory=list)
+
+
+def term_key(term: str) -> Tuple[int, int, str]:
+    """Chronological sort key for "2025-fa" style terms; others sort first, by name."""
+    m = TERM_RE.match(term)
+    if not m or m.group(2) not in SEASONS:
+        return (0, 0, term)
+    return (int(m.group(1)), SEASONS[m.group(2)], term)
+
+
+class _Tables:
+    """Per-snapshot lookups: course id -> row, avgGpa and term masks (views of the map), mean GPA."""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.row = {snapshot.course_id(i): i for i in range(len(snapshot))}
+        self.gpa = snapshot.gpa_column()
+        self.terms = snapshot.term_column()
+        known = [g for g in self.gpa if not math.isnan(g)]
+        self.mean_gpa = sum(known) / len(known) if known else None
+        self.chrono = sorted(snapshot.term_names, key=term_key)
+        self.bit = {name: 1 << i for i, name in enumerate(snapshot.term_names)}
+
+
+_tables: "weakref.WeakKeyDictionary[CatalogSnapshot, _Tables]" = weakref.WeakKeyDictionary()
+
+
+def _tables_for(snapshot: CatalogSnapshot) -> _Tables:
+    t = _tables.get(snapshot)
+    if t is None:
+        t = _tables[snapshot] = _Tables(snapshot)
+    return t
+
+
+def next_term_mask(snapshot: CatalogSnapshot, term: Optional[str] = None) -> Tuple[Optional[str], Optional[str], int]:
+    """
+    (next term, term whose offerings stand in for it, its bit). A term the
+    snapshot has no schedule for yet falls back to the latest term of the
+    same season ("2026-sp" -> "2025-sp").
+    """
+    t = _tables_for(snapshot)
+    if not t.chrono:
+        return term, None, 0
+    term = term or t.chrono[-1]
+    if term in t.bit:
+        return term, term, t.bit[term]
+    m = TERM_RE.match(term)
+    same = [name for name in t.chrono if m and name.endswith("-" + m.group(2))]
+    if same:
+        return term, same[-1], t.bit[same[-1]]
+    return term, None, 0
+
+
+def _options(item: RequirementItem, taken: set) -> List[str]:
+    """Remaining options of an item: untaken courses, then unsatisfied combinations."""
+    out = [o for o in normalize_options(item.select_from) if o not in taken and o not in item.satisfied_by]
+    if item.combos and not any(all(c in taken for c in combo) for combo in item.combos):
+        out += [" + ".join(combo) for combo in item.combos]
+    return list(dict.fromkeys(out))
+
+
+def _courses_needed(item: RequirementItem) -> int:
+    if item.needed and item.unit and item.unit.startswith("COURSE"):
+        return int(round(item.needed))
+    return 0
+
+
+def recommend(audit: ParsedAudit, snapshot: CatalogSnapshot, criteria: Optional[Criteria] = None) -> List[ItemRecommendation]:
+    """
+    Ranked options for every open item of the audit (status not complete,
+    something still needed, options left). Also stored on
+    audit.recommendations with the criteria and the next term used.
+    """
+    criteria = criteria or Criteria()
+    tables = _tables_for(snapshot)
+    term, basis, mask = next_term_mask(snapshot, criteria.term)
+
+    taken = {f"{c.subject} {c.number}" for c in audit.courses if c.subject and c.number and c.status in COUNTED}
+    open_items: List[Tuple[str, RequirementItem, List[str]]] = []
+    for sec in audit.sections:
+        for it in sec.items:
+            if it.status == "complete" or it.needed in (0, 0.0):
+                continue
+            opts = _options(it, taken)
+            if opts:
+                open_items.append((sec.section_id, it, opts))
+
+    # Which open items each course counts toward.
+    users: Dict[str, List[str]] = {}
+    for _, it, opts in open_items:
+        for opt in opts:
+            for cid in opt.split(" + "):
+                ids = users.setdefault(cid, [])
+                if it.id not in ids:
+                    ids.append(it.id)
+
+    # Everything that doesn't depend on the item, once per course:
+    # (avgGpa, offered next term, in the catalog).
+    facts: Dict[str, Tuple[Optional[float], bool, bool]] = {}
+    for cid in users:
+        i = tables.row.get(cid, -1)
+        if i < 0:
+            facts[cid] = (None, False, False)
+        else:
+            g = tables.gpa[i]
+            facts[cid] = (None if math.isnan(g) else round(g, 3), bool(tables.terms[i] & mask), True)
+    fill = tables.mean_gpa if tables.mean_gpa is not None else 0.0
+    others_max = max(1, len(open_items) - 1)
+
+    def option(opt: str) -> Tuple[Optional[float], bool, bool, List[str]]:
+        if " + " not in opt:
+            return (*facts[opt], users[opt])
+        members = opt.split(" + ")
+        rows = [facts[cid] for cid in members]
+        known = [g for g, _, _ in rows if g is not None]
+        gpa = round(sum(known) / len(known), 3) if known else None
+        also = list(dict.fromkeys(j for cid in members for j in users[cid]))
+        return gpa, all(o for _, o, _ in rows), all(c for _, _, c in rows), also
+
+    scored = {opt: option(opt) for _, _, opts in open_items for opt in opts}
+    base = {
+        opt: criteria.gpa * min(max((gpa if gpa is not None else fill) / MAX_GPA, 0.0), 1.0)
+        + criteria.next_term * offered
+        for opt, (gpa, offered, _, _) in scored.items()
+    }
+
+    out: List[ItemRecommendation] = []
+    for section_id, it, opts in open_items:
+        candidates = []
+        for opt in opts:
+            _, offered, known, users_of = scored[opt]
+            if criteria.offered_only and not offered:
+                continue
+            # users_of includes this item itself.
+            score = base[opt] + criteria.overlap * (len(users_of) - 1) / others_max
+            candidates.append((known, score, opt))
+        # Options the catalog doesn't know rank after those it does; nlargest
+        # is stable, so ties keep SELECT FROM order.
+        k = max(criteria.top_k, _courses_needed(it))
+        ranked = []
+        for _, score, opt in heapq.nlargest(k, candidates, key=lambda c: (c[0], c[1])):
+            gpa, offered, known, users_of = scored[opt]
+            ranked.append(RankedOption(
+                course_id=opt, score=round(score, 4), avg_gpa=gpa, offered_next=offered,
+                also_satisfies=[j for j in users_of if j != it.id], in_catalog=known,
+            ))
+        out.append(ItemRecommendation(
+            item_id=it.id, section_id=section_id, header_raw=it.header_raw, needed=it.needed, unit=it.unit,
+            options=ranked,
+        ))
+
+    audit.recommendations = {
+        "term": term,
+        "offered_basis": basis,
+        "criteria": asdict(criteria),
+        "items": [{**vars(r), "options": [dict(vars(o)) for o in r.options]} for r in out],
+    }
+    return out
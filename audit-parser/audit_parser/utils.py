@@ -1,7 +1,7 @@
 from __future__ import annotations
 import hashlib
 import regex as re
-from typing import Optional
+from typing import List, Optional
 
 # Heuristic: UPPERCASE headers (but we'll filter noisy ones)
 UPPER_LINE = re.compile(r"^[A-Z0-9 &()'/\-\.,:!]+$")
@@ -9,6 +9,8 @@ UPPER_LINE = re.compile(r"^[A-Z0-9 &()'/\-\.,:!]+$")
 URL_RE = re.compile(r"https?://", re.I)
 DATE_STAMP_RE = re.compile(r"\b\d{1,2}/\d{1,2}/\d{2,4}\b")
 PAGE_STAMP_RE = re.compile(r"\b\d+/\d+\b")  # "2/6"
+OPTION_RE = re.compile(r"^([A-Z]{2,5})\s*(\d{2,3}[A-Z]?)$")  # "CS 222", "CS222"
+OPTION_NUMBER_RE = re.compile(r"^(\d{2,3}[A-Z]?)$")          # "357" after "CS 222"
 
 def sha256(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
@@ -92,3 +94,26 @@ def course_level(number: Optional[str]) -> Optional[int]:
         return int(m.group(0))
     except:
         return None
+
+def normalize_options(tokens: List[str]) -> List[str]:
+    """
+    SELECT FROM tokens as course ids: "CS 222", and bare numbers after a
+    subject ("CS 222 357") inherit it. Other tokens are kept as they are.
+    """
+    out: List[str] = []
+    last_subj = None
+    for token in tokens:
+        token = token.strip()
+        if not token:
+            continue
+        m = OPTION_RE.match(token)
+        if m:
+            last_subj = m.group(1)
+            out.append(f"{m.group(1)} {m.group(2)}")
+        else:
+            m2 = OPTION_NUMBER_RE.match(token)
+            if m2 and last_subj:
+                out.append(f"{last_subj} {m2.group(1)}")
+            else:
+                out.append(token)
+    return out
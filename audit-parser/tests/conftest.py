@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+# The package is imported as audit_parser from this directory; the catalog
+# snapshots the tests read are written with the ETL's writer (etl/snapshot.py).
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "etl"))
+
+COURSES = [
+    {"courseId": "CS 225", "title": "Data Structures", "credits": 4.0, "avgGpa": 3.1,
+     "genEds": [], "termsOffered": ["2024-fa", "2025-sp", "2025-fa"]},
+    {"courseId": "CS 233", "title": "Computer Architecture", "credits": 4.0, "avgGpa": 2.9,
+     "genEds": [], "termsOffered": ["2025-sp"]},
+    {"courseId": "CS 341", "title": "System Programming", "credits": 4.0, "avgGpa": 3.3,
+     "genEds": [], "termsOffered": ["2024-fa", "2025-fa"]},
+    {"courseId": "CS 357", "title": "Numerical Methods I", "credits": 3.0, "avgGpa": None,
+     "genEds": [], "termsOffered": ["2025-fa"]},
+    {"courseId": "CS 374", "title": "Algorithms & Models of Computation", "credits": 4.0, "avgGpa": 2.6,
+     "genEds": [], "termsOffered": ["2024-fa", "2025-sp", "2025-fa"]},
+    {"courseId": "ECE 385", "title": "Digital Systems Laboratory", "credits": 3.0, "avgGpa": 3.5,
+     "genEds": [], "termsOffered": ["2025-sp"]},
+    {"courseId": "HIST 100", "title": "Global History", "credits": 3.0, "avgGpa": 3.4,
+     "genEds": ["Cultural Studies - Non-West", "Humanities - Hist & Phil"], "termsOffered": ["2025-fa"]},
+    {"courseId": "RHET 105", "title": "Principles of Composition", "credits": None, "avgGpa": 3.6,
+     "genEds": ["Composition I"], "termsOffered": ["2024-fa", "2025-fa"]},
+]
+
+
+@pytest.fixture
+def courses():
+    return [dict(c) for c in COURSES]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """COURSES written by etl/snapshot.py and opened with the audit parser's reader."""
+    from snapshot import write_snapshot
+    from audit_parser.catalog import CatalogSnapshot
+
+    path = str(tmp_path / "catalog.snap")
+    write_snapshot(COURSES, path, created=1_700_000_000)
+    snap = CatalogSnapshot(path)
+    yield snap
+    snap.close()
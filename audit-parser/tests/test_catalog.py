@@ -0,0 +1,99 @@
+import math
+
+import pytest
+
+from audit_parser.catalog import CatalogSnapshot, SnapshotError, enrich
+from audit_parser.models import ParsedAudit, ParsedCourse
+
+
+def test_snapshot_round_trip(snapshot, courses):
+    assert len(snapshot) == len(courses)
+    assert snapshot.created == 1_700_000_000
+    assert snapshot.term_names == ["2024-fa", "2025-fa", "2025-sp"]
+    assert [e.course_id for e in snapshot] == sorted(c["courseId"] for c in courses)
+
+    for c in courses:
+        e = snapshot.lookup(c["courseId"])
+        assert e.title == c["title"]
+        assert e.credits == c["credits"]
+        assert e.avg_gpa == (None if c["avgGpa"] is None else pytest.approx(c["avgGpa"], abs=1e-3))
+        assert sorted(e.gen_eds) == sorted(c["genEds"])
+        assert sorted(e.terms) == sorted(c["termsOffered"])
+
+    assert snapshot.lookup("CS 999") is None
+    assert "CS 2" not in snapshot and "CS 225" in snapshot
+    assert "A VERY LONG COURSE ID" not in snapshot
+
+    gpa = snapshot.gpa_column()
+    assert [None if math.isnan(g) else round(g, 3) for g in gpa] == [snapshot.avg_gpa(i) for i in range(len(snapshot))]
+
+
+def test_snapshot_skips_ids_too_long_to_store(tmp_path, courses):
+    from snapshot import write_snapshot
+
+    path = str(tmp_path / "long.snap")
+    assert write_snapshot(courses + [{"courseId": "X" * 17, "title": "Too long"}], path) == len(courses)
+
+
+def test_snapshot_keeps_the_common_gen_eds_and_recent_terms_that_fit(tmp_path):
+    from snapshot import MAX_BITS, write_snapshot
+
+    names = [f"Gen Ed {i:02d}" for i in range(MAX_BITS + 6)]
+    terms = [f"{y}-{s}" for y in range(2000, 2022) for s in ("sp", "su", "fa")]
+    rows = [{"courseId": f"X {i}", "title": "", "genEds": [g], "termsOffered": terms} for i, g in enumerate(names)]
+    # The names that sort first are the ones most courses carry.
+    rows += [{"courseId": f"Y {i}", "title": "", "genEds": names[:6], "termsOffered": []} for i in range(3)]
+
+    path = str(tmp_path / "wide.snap")
+    with pytest.warns(UserWarning) as caught:
+        write_snapshot(rows, path)
+    assert [str(w.message).split("dropping ")[1] for w in caught] == [
+        ", ".join(names[6:12]), "2000-sp, 2000-su"]
+
+    snap = CatalogSnapshot(path)
+    try:
+        assert len(snap.gen_ed_names) == len(snap.term_names) == MAX_BITS
+        assert snap.lookup("Y 0").gen_eds == names[:6]
+        assert snap.lookup("X 6").gen_eds == []
+        assert sorted(snap.lookup("X 0").terms) == sorted(terms[2:])
+    finally:
+        snap.close()
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.snap"
+    path.write_bytes(b"\0" * 200)
+    with pytest.raises(SnapshotError):
+        CatalogSnapshot(str(path))
+
+
+def test_enrich(snapshot, courses):
+    audit = ParsedAudit(courses=[
+        ParsedCourse(term="FA24", subject="HIST", number="100", section=None, credits=3.0, grade="A"),
+        ParsedCourse(term="SP25", subject="RHET", number="105", section=None, credits=4.0, grade=None,
+                     status="planned"),
+        ParsedCourse(term="SP25", subject="CS", number="225", section=None, credits=4.0, grade=None,
+                     status="in_progress"),
+        ParsedCourse(term="FA23", subject="CS", number="101", section=None, credits=3.0, grade="B"),
+        ParsedCourse(term="FA23", subject="CS", number="101", section=None, credits=3.0, grade="W",
+                     status="ignored"),
+        ParsedCourse(term=None, subject=None, number=None, section=None, credits=None, grade=None),
+    ])
+
+    enrich(audit, snapshot)
+
+    assert audit.courses[0].catalog == {
+        "title": "Global History", "credits": 3.0,
+        "gen_eds": ["Cultural Studies - Non-West", "Humanities - Hist & Phil"],
+        "avg_gpa": pytest.approx(3.4, abs=1e-3), "terms": ["2025-fa"],
+    }
+    assert audit.courses[1].catalog["credits"] is None
+    assert audit.courses[3].catalog is None and audit.courses[5].catalog is None
+    # Planned courses don't count toward coverage.
+    assert audit.catalog["gen_ed_coverage"] == {
+        "Cultural Studies - Non-West": ["HIST 100"],
+        "Humanities - Hist & Phil": ["HIST 100"],
+    }
+    assert audit.catalog["missing_courses"] == ["CS 101"]
+    assert audit.catalog["snapshot"]["courses"] == len(courses)
+    assert audit.to_dict()["catalog"] == audit.catalog
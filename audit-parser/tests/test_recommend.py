@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from audit_parser.models import ParsedAudit, ParsedCourse, RequirementItem, RequirementSection
+from audit_parser.recommend import Criteria, next_term_mask, recommend, term_key
+
+# Known avgGpa in the conftest catalog; CS 357 has none and scores as their mean.
+MEAN_GPA = (3.1 + 2.9 + 3.3 + 2.6 + 3.5 + 3.4 + 3.6) / 7
+
+
+def _audit():
+    return ParsedAudit(
+        courses=[
+            ParsedCourse(term="FA24", subject="RHET", number="105", section=None, credits=4.0, grade="A"),
+            ParsedCourse(term="SP25", subject="CS", number="173", section=None, credits=3.0, grade="B"),
+        ],
+        sections=[
+            RequirementSection(section_id="S1", section_title="Core", items=[
+                RequirementItem(id="A", header_raw="One systems course", needed=1, unit="COURSES",
+                                select_from=["CS 225", "CS 233", "357", "CS 999"]),
+                RequirementItem(id="B", header_raw="Two advanced courses", needed=2, unit="COURSES",
+                                select_from=["CS 374", "CS 225"], combos=[["CS 233", "CS 341"]]),
+                RequirementItem(id="DONE", header_raw="Discrete math", needed=1, unit="COURSES",
+                                select_from=["CS 173"], status="complete"),
+            ]),
+            RequirementSection(section_id="S2", section_title="Gen eds", items=[
+                RequirementItem(id="C", header_raw="Composition or history", needed=3, unit="HOURS",
+                                select_from=["RHET 105", "HIST 100"]),
+            ]),
+        ],
+    )
+
+
+def _ranked(recs):
+    return {r.item_id: [(o.course_id, o.score) for o in r.options] for r in recs}
+
+
+def test_term_key_orders_terms_chronologically():
+    terms = ["2025-fa", "2024-wi", "2025-sp", "2025-su", "other"]
+    assert sorted(terms, key=term_key) == ["other", "2024-wi", "2025-sp", "2025-su", "2025-fa"]
+
+
+def test_next_term_falls_back_to_the_same_season(snapshot):
+    assert next_term_mask(snapshot)[:2] == ("2025-fa", "2025-fa")
+    assert next_term_mask(snapshot, "2026-sp")[:2] == ("2026-sp", "2025-sp")
+    assert next_term_mask(snapshot, "2026-su") == ("2026-su", None, 0)
+
+
+def test_recommend_ranks_by_gpa_offering_and_overlap(snapshot):
+    audit = _audit()
+    recs = recommend(audit, snapshot)
+    # Three open items, so counting toward one other item adds 0.5 / 2.
+    assert _ranked(recs) == {
+        "A": [("CS 225", pytest.approx(3.1 / 4 + 1 + 0.25, abs=1e-3)),
+              ("CS 357", pytest.approx(MEAN_GPA / 4 + 1, abs=1e-3)),
+              ("CS 233", pytest.approx(2.9 / 4 + 0.25, abs=1e-3)),
+              ("CS 999", pytest.approx(MEAN_GPA / 4, abs=1e-3))],
+        "B": [("CS 225", pytest.approx(3.1 / 4 + 1 + 0.25, abs=1e-3)),
+              ("CS 374", pytest.approx(2.6 / 4 + 1, abs=1e-3)),
+              ("CS 233 + CS 341", pytest.approx(3.1 / 4 + 0.25, abs=1e-3))],
+        "C": [("HIST 100", pytest.approx(3.4 / 4 + 1, abs=1e-3))],
+    }
+
+    a = recs[0].options
+    assert a[0].also_satisfies == ["B"] and a[0].offered_next and a[0].avg_gpa == pytest.approx(3.1, abs=1e-3)
+    assert a[1].avg_gpa is None
+    assert not a[3].in_catalog
+    combo = recs[1].options[2]
+    assert combo.avg_gpa == pytest.approx(3.1, abs=1e-3) and not combo.offered_next
+    assert combo.also_satisfies == ["A"]
+
+    assert audit.recommendations["term"] == "2025-fa"
+    assert [i["item_id"] for i in audit.recommendations["items"]] == ["A", "B", "C"]
+    json.dumps(audit.to_dict())
+
+
+def test_recommend_criteria(snapshot):
+    only_offered = _ranked(recommend(_audit(), snapshot, Criteria(offered_only=True)))
+    assert [c for c, _ in only_offered["A"]] == ["CS 225", "CS 357"]
+
+    # By GPA alone CS 357 (no data: the mean) beats CS 225; CS 999 scores the
+    # same but isn't in the catalog, so it stays last.
+    gpa_only = _ranked(recommend(_audit(), snapshot, Criteria(next_term=0, overlap=0)))
+    assert [c for c, _ in gpa_only["A"]] == ["CS 357", "CS 225", "CS 233", "CS 999"]
+
+    # top_k never drops below what an item still needs (B needs two courses).
+    top1 = _ranked(recommend(_audit(), snapshot, Criteria(top_k=1)))
+    assert {k: len(v) for k, v in top1.items()} == {"A": 1, "B": 2, "C": 1}
+
+    spring = recommend(_audit(), snapshot, Criteria(term="2026-sp"))
+    assert spring[0].options[0].course_id == "CS 225"
+    assert [o.offered_next for o in spring[0].options] == [True, True, False, False]
@@ -1,7 +1,7 @@
 import mongoose from "mongoose";
 
 const CourseSchema = new mongoose.Schema({
-    courseId : {type: String, index : true},
+    courseId : {type: String, index : true, unique : true},
     subject : {type: String, index : true},
     number : {type: String, index : true},
     title : String, 
@@ -9,7 +9,14 @@ const CourseSchema = new mongoose.Schema({
     credits : Number,
     genEds : [String],
     prereqText : String, 
-    termsOffered : [String]
+    // Parsed by the seed (etl/prereqs.py): AND/OR expression over course ids,
+    // fewest earlier terms needed, and every course reachable through prereqs.
+    prereqs : Object,
+    prereqDepth : Number,
+    prereqClosure : [String],
+    termsOffered : [String],
+    avgGpa : Number,
+    gpa : Object
     
 }, {timestamps: true});
 
@@ -0,0 +1,17 @@
+import mongoose from "mongoose";
+
+// Written by the seed (etl/search.py); one entry per course. `keys` is the
+// multikey posting list the search routes query (see services/courseSearch.js).
+const CourseSearchSchema = new mongoose.Schema({
+    courseId : {type : String, index : true, unique : true},
+    subject : String,
+    number : String,
+    title : String,
+    level : Number,
+    avgGpa : Number,
+    keys : {type : [String], index : true}
+}, {collection : "coursesearch"});
+
+CourseSearchSchema.index({subject : 1, number : 1});
+
+export default mongoose.models.CourseSearch || mongoose.model("CourseSearch", CourseSearchSchema);
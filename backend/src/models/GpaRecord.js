@@ -8,4 +8,7 @@ const GPARecordSchema = new mongoose.Schema({
     avgGpa : Number
 }, {timestamps : true});
 
+// Same unique key the seed upserts on (etl/staging.py builds it too).
+GPARecordSchema.index({courseId : 1, term : 1, instructor : 1}, {unique : true});
+
 export default mongoose.models.GpaRecord || mongoose.model("GpaRecord", GPARecordSchema);
\ No newline at end of file
@@ -8,15 +8,19 @@ const MeetingSchema = new mongoose.Schema({
 }, {_id : false});
 
 const SectionSchema = new mongoose.Schema({
-    sectionId : {type : String, index : true},
+    sectionId : {type : String, index : true, unique : true},
     courseId : {type : String, index : true},
     term : {type : String, index : true},
     section : String, 
     crn : String, 
+    type : String,
     instructor : String, 
     location : String, 
     modality : String, 
     meetings : [MeetingSchema],
+    // Weekly bitmap, day x 5-minute slot, as 32 int64 words (etl/schedule.py).
+    // BigInt: the words use all 64 bits, which a JS Number can't hold.
+    timeBits : [BigInt],
     notes : String
 }, {timestamps : true});
 
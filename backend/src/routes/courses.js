@@ -1,9 +1,15 @@
 import { Router } from "express";
 import Course from "../models/Course.js";
-import GpaRecord from "../models/GpaRecord.js";
+import { searchCourseIds } from "../services/courseSearch.js";
 
 const router = Router();
 
+// Search results come back from the index in rank order; keep it.
+function inOrder(ids, items) {
+  const pos = new Map(ids.map((id, i) => [id, i]));
+  return items.sort((a, b) => pos.get(a.courseId) - pos.get(b.courseId));
+}
+
 
 router.get("/subjects", async (req, res) => {
   try {
@@ -41,37 +47,29 @@ router.get("/by-subject/:subject", async (req, res) => {
     const level = String(req.query.level || "").trim();
     const limit = Math.min(parseInt(String(req.query.limit || "200"), 10) || 200, 500);
 
-    const match = { subject };
-    const or = [];
-
-    if (/^[1-9]00$/.test(level)) {
-      or.push({ number: new RegExp("^" + level[0], "i") });
-    }
+    const byLevel = /^[1-9]00$/.test(level);
+    let finalMatch = { subject };
+    let ids = null;
 
     if (q) {
-      const safe = q.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
-      or.push({ number: new RegExp("^" + safe, "i") });
-      const rx = new RegExp(safe, "i");
-      or.push({ title: rx }, { description: rx }, { courseId: new RegExp("^" + safe, "i") });
+      // Typeahead goes through the prebuilt index (etl/search.py) instead of regex scans.
+      ids = await searchCourseIds(q, {
+        match: byLevel ? { subject, level: Number(level) } : { subject },
+        sort: { number: 1, title: 1 },
+        limit,
+        description: true,
+        number: true,
+      });
+      finalMatch = { courseId: { $in: ids } };
+    } else if (byLevel) {
+      finalMatch = { subject, number: new RegExp("^" + level[0]) };
     }
 
-    const finalMatch = or.length ? { $and: [match, { $or: or }] } : match;
-
     const pipeline = [
       { $match: finalMatch },
-      {
-        $lookup: {
-          from: "gparecords",
-          localField: "courseId",
-          foreignField: "courseId",
-          as: "gpaDocs",
-        },
-      },
       {
         $addFields: {
-          avgGpa: {
-            $cond: [{ $gt: [{ $size: "$gpaDocs" }, 0] }, { $avg: "$gpaDocs.avgGpa" }, null],
-          },
+          avgGpa: { $ifNull: ["$avgGpa", null] },
           genEds: {
             $ifNull: [
               "$genEds",
@@ -85,13 +83,13 @@ router.get("/by-subject/:subject", async (req, res) => {
           },
         },
       },
-      { $project: { gpaDocs: 0 } },
+      { $project: { gpa: 0, fingerprint: 0, prereqClosure: 0 } },
       { $sort: { number: 1, title: 1 } },
       { $limit: limit },
     ];
 
     const items = await Course.aggregate(pipeline);
-    res.json(items);
+    res.json(ids ? inOrder(ids, items) : items);
   } catch (e) {
     console.error("GET /courses/by-subject/:subject error", e);
     res.status(500).json({ error: "internal" });
@@ -102,26 +100,14 @@ router.get("/by-subject/:subject", async (req, res) => {
 router.get("/", async (req, res) => {
   try {
     const q = (req.query.q || "").toString().trim();
-    const safe = q.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
-    const filter = q
-      ? { $or: [{ courseId: new RegExp("^" + safe, "i") }, { title: new RegExp(safe, "i") }] }
-      : {};
+    const ids = q ? await searchCourseIds(q, { limit: 25 }) : null;
+    const filter = ids ? { courseId: { $in: ids } } : {};
 
     const pipeline = [
       { $match: filter },
-      {
-        $lookup: {
-          from: "gparecords",
-          localField: "courseId",
-          foreignField: "courseId",
-          as: "gpaDocs",
-        },
-      },
       {
         $addFields: {
-          avgGpa: {
-            $cond: [{ $gt: [{ $size: "$gpaDocs" }, 0] }, { $avg: "$gpaDocs.avgGpa" }, null],
-          },
+          avgGpa: { $ifNull: ["$avgGpa", null] },
           genEds: {
             $ifNull: [
               "$genEds",
@@ -135,12 +121,12 @@ router.get("/", async (req, res) => {
           },
         },
       },
-      { $project: { gpaDocs: 0 } },
+      { $project: { gpa: 0, fingerprint: 0, prereqClosure: 0 } },
       { $limit: 25 },
     ];
 
     const courses = await Course.aggregate(pipeline);
-    res.json(courses);
+    res.json(ids ? inOrder(ids, courses) : courses);
   } catch (e) {
     console.error("GET /courses error", e);
     res.status(500).json({ error: "internal" });
@@ -154,17 +140,18 @@ router.get("/:courseId", async (req, res) => {
     const course = await Course.findOne({ courseId }).lean();
     if (!course) return res.status(404).json({ error: "Not found" });
 
-    const gpaAgg = await GpaRecord.aggregate([
-      { $match: { courseId } },
-      { $group: { _id: "$courseId", avg: { $avg: "$avgGpa" }, terms: { $addToSet: "$term" } } },
-    ]);
+    // GPA rollups are materialized onto the course by the seed (etl/rollups.py).
+    const { fingerprint, ...rest } = course;
+    const gpaSummary = course.gpa
+      ? { _id: courseId, avg: course.gpa.avg, terms: course.gpa.terms ?? [] }
+      : null;
 
     const genEds =
       course.genEds ??
       course.genEdCategories ??
       (course.attributes?.genEd ?? []);
 
-    res.json({ ...course, genEds, gpaSummary: gpaAgg[0] || null });
+    res.json({ ...rest, genEds, gpaSummary });
   } catch (e) {
     console.error("GET /courses/:courseId error", e);
     res.status(500).json({ error: "internal" });
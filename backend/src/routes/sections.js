@@ -16,7 +16,16 @@ router.get("/:courseId", async(req, res) => {
         filter.instructor = new RegExp(String(instructor).trim(), "i");
     }
 
-    const sections = await Section.find(filter).lean();
+    // timeBits words are int64s; as JSON numbers they'd lose their low
+    // bits, so they go out as decimal strings (see docs/api.md).
+    const sections = await Section.aggregate([
+        { $match: filter },
+        { $addFields: { timeBits: { $cond: [
+            { $isArray: "$timeBits" },
+            { $map: { input: "$timeBits", in: { $toString: "$$this" } } },
+            "$$REMOVE",
+        ] } } },
+    ]);
     res.json(sections);
 
 });
@@ -0,0 +1,78 @@
+import CourseSearch from "../models/CourseSearch.js";
+
+// Query side of the prebuilt search index (etl/search.py builds it; keep
+// the key scheme and MAX_PREFIX in sync):
+//   c: compact course id prefix   n: number prefix   t: title word prefix
+//   g: title trigram              d: description word prefix (3+ chars)
+const MAX_PREFIX = 15;
+const MIN_DESC_PREFIX = 3;
+
+function tokens(q) {
+  return q.toLowerCase().match(/[a-z0-9]+/g) || [];
+}
+
+function trigrams(q) {
+  const s = q.toLowerCase().replace(/\s+/g, " ").trim();
+  const out = new Set();
+  for (let i = 0; i + 3 <= s.length; i++) out.add(s.slice(i, i + 3));
+  return [...out];
+}
+
+/**
+ * Mongo filter on coursesearch.keys for a typeahead query. Matches a
+ * course-id prefix ("cs 2", "CS225"), every word as a title word prefix
+ * (or description word prefix, with description: true), or the whole
+ * query as a title substring via trigrams.
+ */
+export function searchFilter(q, { description = false, number = false } = {}) {
+  const or = [];
+
+  const compact = q.replace(/\s+/g, "").toUpperCase();
+  if (compact && /^[A-Z0-9]+$/.test(compact)) {
+    or.push({ keys: "c:" + compact.slice(0, MAX_PREFIX) });
+    if (number) or.push({ keys: "n:" + compact.slice(0, MAX_PREFIX) });
+  }
+
+  const words = tokens(q).map((w) => w.slice(0, MAX_PREFIX));
+  if (words.length) {
+    or.push({
+      $and: words.map((w) => {
+        const keys = ["t:" + w];
+        if (description && w.length >= MIN_DESC_PREFIX) keys.push("d:" + w);
+        return { keys: { $in: keys } };
+      }),
+    });
+  }
+
+  const grams = trigrams(q);
+  if (grams.length) or.push({ keys: { $all: grams.map((g) => "g:" + g) } });
+
+  return or.length ? { $or: or } : null;
+}
+
+/**
+ * Ranked course ids for a query. Course-id prefix hits come first, then
+ * courses matching every word in the title, then by level and GPA; pass
+ * sort to override (e.g. { number: 1, title: 1 }).
+ */
+export async function searchCourseIds(q, { match = {}, sort = null, limit = 25, description = false, number = false } = {}) {
+  const filter = searchFilter(q, { description, number });
+  if (!filter) return [];
+
+  const compact = q.replace(/\s+/g, "").toUpperCase().slice(0, MAX_PREFIX);
+  const titleKeys = tokens(q).map((w) => "t:" + w.slice(0, MAX_PREFIX));
+
+  const rows = await CourseSearch.aggregate([
+    { $match: { ...match, ...filter } },
+    {
+      $addFields: {
+        idHit: { $in: ["c:" + compact, "$keys"] },
+        titleHit: titleKeys.length ? { $setIsSubset: [titleKeys, "$keys"] } : false,
+      },
+    },
+    { $sort: sort || { idHit: -1, titleHit: -1, level: 1, avgGpa: -1, courseId: 1 } },
+    { $limit: limit },
+    { $project: { _id: 0, courseId: 1 } },
+  ]);
+  return rows.map((r) => r.courseId);
+}
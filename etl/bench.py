@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from transforms import transform_catalog, transform_gpa, GRADE_WEIGHTS
+from readers import read_frames, check_catalog_columns, CATALOG_DTYPES, GPA_DTYPES
+from loaders import write_catalog, write_gpa
+from memory import MemoryGuard, SeenKeys, peak_rss_mb
+from delta import DeltaTracker
+from sinks import make_sink
+
+# Offline benchmark for the seed pipeline: generates synthetic catalog and
+# GPA CSVs, then loads them into each sink in a fresh process and reports
+# rows/s per stage and peak memory. Needs no database unless a mongodb://
+# sink is listed (point that at a scratch database; it gets written to).
+#
+#   python bench.py --rows 200000 --chunk-size 50000
+#   python bench.py --sink count: --sink mongodb://localhost:27017/seed_bench
+#
+# Stages: read (CSV parse), transform (vectorized column cleanup),
+# documents (building course/section/GPA documents), sink (writes).
+
+SUBJECTS = ["CS", "MATH", "STAT", "ECE", "PHYS", "CHEM", "ECON", "PSYC", "ENG", "BIOE", "LING", "HIST"]
+TERMS = [(y, t, f"{y}-{code}") for y in (2023, 2024, 2025) for t, code in (("Spring", "sp"), ("Fall", "fa"))]
+GEN_EDS = ["", "Quantitative Reasoning II course.", "Humanities - Lit & Arts course.",
+           "Social & Beh Sci - Soc Sci course, and Cultural Studies - Western course."]
+MEETINGS = [("MWF", "9:00 AM", "9:50 AM"), ("MWF", "11:00 AM", "11:50 AM"), ("TR", "12:30 PM", "1:45 PM"),
+            ("TR", "2:00 PM", "3:15 PM"), ("MW", "4:00 PM", "5:15 PM"), ("F", "1:00 PM", "2:50 PM")]
+BUILDINGS = ["Siebel Center", "Altgeld Hall", "Noyes Lab", "ECE Building", "Foellinger Auditorium"]
+INSTRUCTORS = [f"Teacher{i}, {chr(65 + i % 26)}" for i in range(400)]
+
+DEFAULT_SINKS = ["count:", "memory:", "jsonl:", "jsonl.gz:"]
+
+
+def _course_ids(idx):
+    subjects = np.array(SUBJECTS)[idx % len(SUBJECTS)]
+    numbers = (100 + idx // len(SUBJECTS)).astype(str)
+    return subjects, numbers
+
+
+def generate(out_dir : str, catalog_rows : int, gpa_rows : int, seed : int = 0):
+    """Write catalog.csv and gpa.csv with the export's column layout. Returns their paths."""
+    rng = np.random.default_rng(seed)
+    n_courses = max(catalog_rows // 8, 1)
+    os.makedirs(out_dir, exist_ok=True)
+
+    idx = rng.integers(0, n_courses, catalog_rows)
+    subjects, numbers = _course_ids(idx)
+    term = rng.integers(0, len(TERMS), catalog_rows)
+    meeting = rng.integers(0, len(MEETINGS), catalog_rows)
+    catalog = pd.DataFrame({
+        "Year": [TERMS[t][0] for t in term],
+        "Term": [TERMS[t][1] for t in term],
+        "YearTerm": [TERMS[t][2] for t in term],
+        "Subject": subjects,
+        "Number": numbers,
+        "Name": [f"Course {i}" for i in idx],
+        "Description": [f"Topics in area {i % 97}. Prerequisite: {s} {int(n) - 1}." for i, s, n in zip(idx, subjects, numbers)],
+        "Credit Hours": [f"{1 + i % 4} hours." for i in idx],
+        "Degree Attributes": np.array(GEN_EDS)[idx % len(GEN_EDS)],
+        "CRN": (10000 + np.arange(catalog_rows)).astype(str),
+        "Section": [f"L{k}" for k in rng.integers(1, 12, catalog_rows)],
+        "Start Time": [MEETINGS[m][1] for m in meeting],
+        "End Time": [MEETINGS[m][2] for m in meeting],
+        "Days of Week": [MEETINGS[m][0] for m in meeting],
+        "Room": rng.integers(100, 4000, catalog_rows).astype(str),
+        "Building": np.array(BUILDINGS)[rng.integers(0, len(BUILDINGS), catalog_rows)],
+        "Instructors": np.array(INSTRUCTORS)[rng.integers(0, len(INSTRUCTORS), catalog_rows)],
+    })
+    catalog_path = os.path.join(out_dir, "catalog.csv")
+    catalog.to_csv(catalog_path, index=False)
+    del catalog
+
+    idx = rng.integers(0, n_courses, gpa_rows)
+    subjects, numbers = _course_ids(idx)
+    term = rng.integers(0, len(TERMS), gpa_rows)
+    grades = rng.poisson(12, (gpa_rows, len(GRADE_WEIGHTS)))
+    gpa = pd.DataFrame(grades, columns=list(GRADE_WEIGHTS))
+    gpa.insert(0, "Year", [TERMS[t][0] for t in term])
+    gpa.insert(1, "Term", [TERMS[t][1] for t in term])
+    gpa.insert(2, "YearTerm", [TERMS[t][2] for t in term])
+    gpa.insert(3, "Subject", subjects)
+    gpa.insert(4, "Number", numbers)
+    gpa["W"] = rng.poisson(2, gpa_rows)
+    gpa["Primary Instructor"] = np.array(INSTRUCTORS)[rng.integers(0, len(INSTRUCTORS), gpa_rows)]
+    gpa["Students"] = grades.sum(axis=1) + gpa["W"]
+    gpa_path = os.path.join(out_dir, "gpa.csv")
+    gpa.to_csv(gpa_path, index=False)
+
+    return catalog_path, gpa_path
+
+
+class _Stages:
+    """Wall time and (optionally) tracemalloc peak per stage."""
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.seconds = {}
+        self.peak = {}
+
+    def _peak(self, name):
+        if self.trace:
+            self.peak[name] = max(self.peak.get(name, 0), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+    def time(self, name, fn, *args):
+        self._peak("load")
+        t0 = time.perf_counter()
+        out = fn(*args)
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+        self._peak(name)
+        return out
+
+    def frames(self, path, dtypes, guard, transform):
+        """Frames as the loaders see them; whatever runs between two frames is charged to load (documents + sink)."""
+        it = read_frames(path, dtypes, guard)
+        while True:
+            df = self.time("read", next, it, None)
+            if df is None:
+                return
+            t = self.time("transform", transform, df)
+            del df
+            yield t
+
+
+def _bench_sink(spec, catalog_path, gpa_path, chunk_size, trace):
+    """Load both files into one sink; runs in its own process so peak RSS is per sink."""
+    if trace:
+        tracemalloc.start()
+    sink = make_sink(spec)
+    result = {}
+
+    for kind, path, dtypes in (("catalog", catalog_path, CATALOG_DTYPES), ("gpa", gpa_path, GPA_DTYPES)):
+        guard = MemoryGuard(None, chunk_size) if chunk_size else None
+        stages = _Stages(trace)
+        delta = DeltaTracker()
+        if kind == "catalog":
+            frames = stages.frames(path, dtypes, guard, lambda df: transform_catalog(check_catalog_columns(df, path)))
+            stats = write_catalog(sink, frames, delta, SeenKeys(), SeenKeys())
+        else:
+            frames = stages.frames(path, dtypes, guard, transform_gpa)
+            stats = write_gpa(sink, frames, delta, SeenKeys())
+        stages._peak("load")
+        sink.flush()
+
+        # The loaders charge the time spent waiting on frames to transform_s.
+        read_s = stages.seconds.get("read", 0.0)
+        transform_s = stages.seconds.get("transform", 0.0)
+        result[kind] = {
+            "rows": stats["rows"],
+            "seconds": {
+                "read": read_s,
+                "transform": transform_s,
+                "documents": max(stats["transform_s"] - read_s - transform_s, 0.0),
+                "sink": stats["write_s"],
+            },
+            "tracedPeakMb": {k: v / 2**20 for k, v in stages.peak.items()} if trace else None,
+        }
+
+    sink.close()
+    result["peakRssMb"] = peak_rss_mb()
+    return result
+
+
+def _rate(rows, seconds):
+    return f"{rows / seconds:,.0f}" if seconds else "-"
+
+
+def report(results, trace=False):
+    lines = [f"{'sink':<22} {'input':<8} {'rows':>9} {'read/s':>11} {'transform/s':>12} "
+             f"{'documents/s':>12} {'sink/s':>11} {'total/s':>11} {'peak RSS':>10}"]
+    for spec, r in results.items():
+        for kind in ("catalog", "gpa"):
+            k = r[kind]
+            s = k["seconds"]
+            lines.append(
+                f"{spec:<22} {kind:<8} {k['rows']:>9,} {_rate(k['rows'], s['read']):>11} "
+                f"{_rate(k['rows'], s['transform']):>12} {_rate(k['rows'], s['documents']):>12} "
+                f"{_rate(k['rows'], s['sink']):>11} {_rate(k['rows'], sum(s.values())):>11} "
+                f"{r['peakRssMb']:>7.1f} MB"
+            )
+            if trace:
+                peaks = ", ".join(f"{name} {mb:.1f} MB" for name, mb in k["tracedPeakMb"].items())
+                lines.append(f"{'':<22} {'':<8} traced peak: {peaks}")
+    return lines
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark the seed pipeline on synthetic data, without MongoDB.")
+    p.add_argument("--rows", type=int, default=100000, help="Catalog rows to generate (default: 100000).")
+    p.add_argument("--gpa-rows", type=int, default=None, help="GPA rows to generate (default: same as --rows).")
+    p.add_argument("--chunk-size", type=int, default=50000,
+                   help="Stream in chunks of this many rows; 0 reads each file whole (default: 50000).")
+    p.add_argument("--sink", action="append", dest="sinks",
+                   help="Sink spec to benchmark, repeatable (default: count:, memory:, jsonl:, jsonl.gz:). "
+                        "jsonl: and jsonl.gz: without a directory write to a scratch directory.")
+    p.add_argument("--data-dir", default=None,
+                   help="Reuse (or keep) the generated CSVs here instead of a scratch directory.")
+    p.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data.")
+    p.add_argument("--trace-memory", action="store_true",
+                   help="Also report the tracemalloc peak of each stage (slows everything down).")
+    p.add_argument("--json", default=None, help="Write the raw results to this file.")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scratch = tempfile.mkdtemp(prefix="seed-bench-")
+    data_dir = args.data_dir or os.path.join(scratch, "data")
+    try:
+        catalog_path = os.path.join(data_dir, "catalog.csv")
+        gpa_path = os.path.join(data_dir, "gpa.csv")
+        if not (os.path.exists(catalog_path) and os.path.exists(gpa_path)):
+            t0 = time.perf_counter()
+            generate(data_dir, args.rows, args.gpa_rows or args.rows, args.seed)
+            print(f"[bench] generated synthetic CSVs in {data_dir} ({time.perf_counter() - t0:.1f}s)")
+
+        results = {}
+        ctx = mp.get_context("spawn")
+        for i, spec in enumerate(args.sinks or DEFAULT_SINKS):
+            target = spec
+            if spec in ("jsonl:", "jsonl.gz:"):
+                target = spec + os.path.join(scratch, f"out-{i}")
+            with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+                results[spec] = pool.submit(_bench_sink, target, catalog_path, gpa_path,
+                                            args.chunk_size, args.trace_memory).result()
+            print(f"[bench] {spec} done")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    for line in report(results, args.trace_memory):
+        print(line)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
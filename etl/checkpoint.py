@@ -0,0 +1,160 @@
+import os
+import json
+from datetime import datetime, timezone
+from memory import SeenKeys
+
+# Checkpoint of a sequential seed run, so seed.py --resume can continue an
+# interrupted load instead of starting over. The file is rewritten
+# atomically after every committed frame and records:
+#
+#   done      loaders ("catalog", "gpa") that finished, sweep included
+#   current   the loader in progress: its input file and checksum, the
+#             data rows already written, and its cross-frame state (the
+#             loader's course table and counts, seen-key sets)
+#   changes   the delta change log up to the last commit
+#   pending   delta changes journaled before a write the checkpoint
+#             hasn't committed yet
+#   before    the stored fingerprints the run's added/changed keys had
+#             before it (DeltaTracker.before), journaled with them
+#
+# A resumed run skips finished loaders and the rows already written, then
+# replays at most one frame. Its writes are upserts, $addToSet and $bit or,
+# so replaying them is harmless. In delta mode the replayed documents may
+# already match their stored fingerprints. Their keys come from pending
+# instead, which keeps the change log (and the rollups driven by it) the
+# same as in an uninterrupted run.
+
+CHECKPOINT_VERSION = 2
+
+
+class Checkpoint:
+
+    def __init__(self, path : str, options : dict):
+        self.path = path
+        self.options = options
+        self.data = {
+            "version": CHECKPOINT_VERSION,
+            "options": options,
+            "done": [],
+            "current": None,
+            "changes": None,
+            "pending": {},
+            "before": {},
+        }
+
+    @classmethod
+    def load(cls, path : str, options : dict):
+        """
+        The checkpoint left at path, or None if there is none. Raises
+        ValueError if it belongs to a run with other options (sink, mode,
+        input files).
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{path}: checkpoint version {data.get('version')}, expected {CHECKPOINT_VERSION}")
+        if data["options"] != options:
+            diff = sorted(k for k in set(options) | set(data["options"]) if options.get(k) != data["options"].get(k))
+            raise ValueError(f"{path} was written by a run with different {', '.join(diff)}; rerun without --resume")
+        out = cls(path, options)
+        out.data = data
+        return out
+
+    def describe(self) -> str:
+        parts = [f"{kind} done" for kind in self.data["done"]]
+        cur = self.data["current"]
+        if cur:
+            parts.append(f"{cur['kind']} at row {cur['rows']} of {cur['file']}")
+        return ", ".join(parts) or "nothing committed yet"
+
+    def is_done(self, kind : str) -> bool:
+        return kind in self.data["done"]
+
+    def restore_changes(self, delta):
+        """Put the interrupted run's change log (committed + journaled) back into delta."""
+        if self.data["changes"]:
+            delta.changes = self.data["changes"]
+        for coll, log in self.data["pending"].items():
+            for change, keys in log.items():
+                delta.changes[coll][change].extend(keys)
+        for coll, before in self.data["before"].items():
+            delta.before[coll].update(before)
+
+    def position(self, kind : str, path : str, checksum : str, seen : dict):
+        """
+        (data rows already written, loader state) for kind, or (0, None) to
+        start from the top. Restores the saved seen-key sets into seen.
+        Raises ValueError if the input file changed since the checkpoint.
+        """
+        cur = self.data["current"]
+        if not cur or cur["kind"] != kind:
+            return 0, None
+        if cur["file"] != os.path.realpath(path) or cur["checksum"] != checksum:
+            raise ValueError(f"{path} changed since the checkpoint was written; rerun without --resume")
+        for name, state in cur["seen"].items():
+            seen[name].update(SeenKeys.from_state(state))
+        return cur["rows"], cur["state"]
+
+    def journal(self, collection : str, keys : dict, before : dict):
+        """DeltaTracker.journal: make pending changes durable before they are written."""
+        if not any(keys.values()):
+            return
+        log = self.data["pending"].setdefault(collection, {})
+        for change, ks in keys.items():
+            log.setdefault(change, []).extend(ks)
+        self.data["before"].setdefault(collection, {}).update(before)
+        self.save()
+
+    def committer(self, sink, kind : str, path : str, checksum : str, delta, seen : dict):
+        """The loaders' on_commit: flush the sink, then record the frame as written."""
+        cur = self.data["current"]
+        rows = cur["rows"] if cur and cur["kind"] == kind else 0
+
+        def on_commit(frame_rows, state):
+            nonlocal rows
+            rows += frame_rows
+            sink.flush()
+            self.data["current"] = {
+                "kind": kind,
+                "file": os.path.realpath(path),
+                "checksum": checksum,
+                "rows": rows,
+                "state": state,
+                "seen": {name: keys.to_state() for name, keys in seen.items()},
+            }
+            self.data["changes"] = delta.changes
+            self.data["pending"] = {}
+            self.data["before"] = delta.before
+            self.save()
+
+        return on_commit
+
+    def finish(self, kind : str, delta):
+        """kind's loader is done (writes, sweep and manifest)."""
+        # A replayed write can log a key the journal already holds.
+        for log in delta.changes.values():
+            for change, keys in log.items():
+                log[change] = list(dict.fromkeys(keys))
+        self.data["done"].append(kind)
+        self.data["current"] = None
+        self.data["changes"] = delta.changes
+        self.data["pending"] = {}
+        self.data["before"] = delta.before
+        self.save()
+
+    def save(self):
+        self.data["savedAt"] = datetime.now(timezone.utc).isoformat()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        """The run completed; nothing to resume."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,141 @@
+import os
+import glob
+import json
+import time
+import shutil
+import argparse
+from dotenv import load_dotenv
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from readers import (
+    read_frames, frame_pipeline, CSV_SUFFIXES, CATALOG_DTYPES, GPA_DTYPES,
+    NORMALIZED_KEY, ORDER_KEY, SOURCES_KEY,
+)
+from memory import MemoryGuard
+from metrics import RunMetrics
+
+# One-time conversion of the raw catalog/GPA CSVs into normalized Parquet
+# datasets, so nightly seeds skip CSV parsing and the transforms:
+#
+#   python convert.py                      # every CSV under DATA_CATALOG_DIR / DATA_GPA_DIR
+#   python seed.py                         # now reads catalog.parquet / gpa.parquet
+#   python seed.py --terms 2025-fa         # GPA rows of one term only
+#
+# Each dataset holds the transformed frames (credit hours, times and days
+# already parsed; zstd-compressed, typed columns), one part per input file
+# and term:
+#
+#   <dir>/catalog.parquet/term=2025-fa/part-00003.parquet
+#
+# The schema metadata records the kind (etl.normalized), the order the
+# loader reads the parts in (etl.order: input file, then first appearance
+# of the term in it) and the raw files it replaces (etl.sources, relative
+# to <dir>). Rows of a term are regrouped, so the load matches the CSV's
+# exactly when each input file is grouped by term, as the exports are.
+# Rerun the conversion when the CSVs change; seed.py warns if they are
+# newer than the dataset.
+
+load_dotenv()
+CAT_DIR = os.getenv("DATA_CATALOG_DIR", "../data/catalog")
+GPA_DIR = os.getenv("DATA_GPA_DIR", "../data/gpa")
+
+FORMAT_VERSION = b"1"
+
+CATALOG_SCHEMA = pa.schema(
+    [(c, pa.string()) for c in ("courseId", "subject", "number", "title", "description", "prereqText")]
+    + [("credits", pa.float64()), ("genEds", pa.list_(pa.string()))]
+    + [(c, pa.string()) for c in ("term", "section", "sectionId", "crn", "type", "instructor",
+                                  "location", "days", "start", "end", "notes")]
+)
+
+
+def _partition(term : str) -> str:
+    """Hive-style partition directory name; an empty term gets its own."""
+    return "term=" + (term.replace(os.sep, "_") or "__none__")
+
+
+def convert(kind : str, directory : str, out : str, chunk_size : int, metrics : RunMetrics,
+            compression : str = "zstd") -> int:
+    """
+    Convert every raw input of kind under directory into the dataset out
+    (replaced atomically). Returns the number of rows written.
+    """
+    # Not discover_inputs: that hides the CSVs an earlier conversion replaced.
+    sources = sorted({
+        p for suffix in CSV_SUFFIXES
+        for p in glob.glob(os.path.join(directory, "**", "*" + suffix), recursive=True)
+    })
+    if not sources:
+        raise FileNotFoundError(f"No {kind} CSVs under {directory}")
+    dtypes = CATALOG_DTYPES if kind == "catalog" else GPA_DTYPES
+    base = os.path.dirname(os.path.abspath(out))
+    relative = json.dumps([os.path.relpath(os.path.abspath(p), base) for p in sources]).encode("utf-8")
+
+    tmp = out + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    writers = {}
+    rows = 0
+    try:
+        for path in sources:
+            transform, issues = frame_pipeline(kind, path)
+            schema = CATALOG_SCHEMA if kind == "catalog" else None
+            frames = read_frames(path, dtypes, MemoryGuard(chunk_size=chunk_size))
+            for t in metrics.frames(kind, frames, transform, issues):
+                t0 = time.perf_counter()
+                table = pa.Table.from_pandas(t, schema=schema, preserve_index=False)
+                # GPA exports differ in their grade columns, so each input
+                # file keeps the schema of its first chunk.
+                schema = table.schema.remove_metadata()
+                for term in t["term"].unique():
+                    key = (path, term)
+                    if key not in writers:
+                        meta = {NORMALIZED_KEY: kind.encode(), ORDER_KEY: str(len(writers)).encode(),
+                                SOURCES_KEY: relative, b"etl.format": FORMAT_VERSION}
+                        part = os.path.join(tmp, _partition(term), f"part-{len(writers):05d}.parquet")
+                        os.makedirs(os.path.dirname(part), exist_ok=True)
+                        writers[key] = pq.ParquetWriter(part, schema.with_metadata(meta), compression=compression)
+                    writers[key].write_table(table.filter(pc.equal(table["term"], term)))
+                rows += len(t)
+                metrics.stage(f"{kind}.parquet", len(t), time.perf_counter() - t0)
+    except BaseException:
+        for w in writers.values():
+            w.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    for w in writers.values():
+        w.close()
+
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out)
+    print(f"[convert] {kind}: {len(sources)} files, {rows} rows -> {out} ({len(writers)} parts)")
+    return rows
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Convert the raw catalog/GPA CSVs into normalized Parquet datasets.")
+    p.add_argument("--catalog-out", default=os.path.join(CAT_DIR, "catalog.parquet"),
+                   help="Catalog dataset to write (default: catalog.parquet in DATA_CATALOG_DIR).")
+    p.add_argument("--gpa-out", default=os.path.join(GPA_DIR, "gpa.parquet"),
+                   help="GPA dataset to write (default: gpa.parquet in DATA_GPA_DIR).")
+    p.add_argument("--only", choices=["catalog", "gpa"], default=None,
+                   help="Convert just one of the two.")
+    p.add_argument("--chunk-size", type=int, default=int(os.getenv("ETL_CHUNK_SIZE", "50000")),
+                   help="Rows per chunk while converting (default: 50000).")
+    p.add_argument("--compression", default="zstd", help="Parquet codec (default: zstd).")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics = RunMetrics()
+    if args.only in (None, "catalog"):
+        convert("catalog", CAT_DIR, args.catalog_out, args.chunk_size, metrics, args.compression)
+    if args.only in (None, "gpa"):
+        convert("gpa", GPA_DIR, args.gpa_out, args.chunk_size, metrics, args.compression)
+    for reason, i in metrics.report()["rowIssues"].items():
+        print(f"[convert] {i['rows']} rows: {reason} (e.g. {', '.join(map(str, i['examples']))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+
+# Natural key of each collection the seed writes. Composite keys are
+# joined with "|" wherever a single string id is needed (change log).
+KEY_FIELDS = {
+    "courses": ("courseId",),
+    "sections": ("sectionId",),
+    "gparecords": ("courseId", "term", "instructor"),
+}
+
+LOOKUP_BATCH = 1000
+
+
+def doc_key(collection : str, doc) -> str:
+    return "|".join(str(doc.get(f, "")) for f in KEY_FIELDS[collection])
+
+
+def key_filter(collection : str, doc):
+    return {f: doc[f] for f in KEY_FIELDS[collection]}
+
+
+def split_key(collection : str, key : str):
+    """The key fields of a doc_key, as a filter document."""
+    fields = KEY_FIELDS[collection]
+    return dict(zip(fields, key.split("|", len(fields) - 1)))
+
+
+def fingerprint(doc) -> str:
+    """Stable hash of a normalized document (ignoring its own fingerprint)."""
+    body = {k: v for k, v in doc.items() if k not in ("fingerprint", "_id")}
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def file_checksum(path : str) -> str:
+    """SHA-256 of a file; for a directory (a Parquet dataset), of its files' relative paths and checksums."""
+    if os.path.isdir(path):
+        h = hashlib.sha256()
+        for root, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                h.update(f"{os.path.relpath(full, path)}\0{file_checksum(full)}\n".encode("utf-8"))
+        return h.hexdigest()
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Manifest:
+    """Checksums of the input files as of their last successful load."""
+
+    def __init__(self, path : str):
+        self.path = path
+        self.files = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    @staticmethod
+    def _key(path):
+        return os.path.realpath(path)
+
+    def unchanged(self, path : str, checksum : str) -> bool:
+        entry = self.files.get(self._key(path))
+        return bool(entry) and entry.get("sha256") == checksum
+
+    def record(self, path : str, checksum : str):
+        self.files[self._key(path)] = {
+            "sha256": checksum,
+            "loadedAt": datetime.now(timezone.utc).isoformat(),
+        }
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+class DeltaTracker:
+    """
+    Decides which normalized documents go to the sink. Every document carries a
+    fingerprint; with delta enabled, documents whose fingerprint matches the
+    stored one are skipped, and added/changed/removed keys are collected
+    per collection for the run's change log.
+
+    With insert_only (full reload into empty staging collections) documents
+    become plain inserts. Writes that have to touch an already inserted
+    document are deferred (as picklable (method, collection, docs, *args)
+    tuples) until after the indexes are built.
+
+    A streamed load can write a key again in a later frame (a section spread
+    over several chunks, a GPA key repeated further down). before keeps,
+    per collection, the fingerprint each key added or changed by this run
+    had before it (None if it was added): a key is logged the first time
+    only, and settle() takes it back out of "changed" if its stored
+    document ends up as it was. Only keys and hashes are kept, never the
+    documents.
+
+    journal, if set, is called as journal(collection, {change: keys},
+    {key: fingerprint before}) just before those changes go to the sink, so
+    a resumed run (checkpoint.py) knows what an interrupted write may
+    already have applied.
+    """
+
+    def __init__(self, enabled=False, delete_missing=False, insert_only=False):
+        self.enabled = enabled
+        self.delete_missing = delete_missing
+        self.insert_only = insert_only
+        self.skipped_files = []
+        self.deferred = []
+        self.changes = {c: {"added": [], "changed": [], "removed": []} for c in KEY_FIELDS}
+        self.before = {c: {} for c in KEY_FIELDS}
+        self.journal = None
+
+    def _log(self, collection : str, before=None, **keys):
+        if self.journal is not None:
+            self.journal(collection, keys, before or {})
+        for change, ks in keys.items():
+            self.changes[collection][change].extend(ks)
+        if before:
+            self.before[collection].update(before)
+
+    def defer(self, method : str, collection : str, docs, *args):
+        """Queue sink.<method>(collection, docs, *args) until after the indexes are built."""
+        if docs:
+            self.deferred.append((method, collection, list(docs), *args))
+
+    def write(self, sink, collection : str, docs) -> int:
+        """Send the documents that need writing to the sink; returns how many were sent."""
+        # Later rows win for duplicate keys, same as sequential upserts would.
+        latest = {}
+        for doc in docs:
+            doc["fingerprint"] = fingerprint(doc)
+            latest[doc_key(collection, doc)] = doc
+
+        if self.insert_only:
+            sink.insert(collection, list(latest.values()))
+            return len(latest)
+        if not self.enabled:
+            sink.upsert(collection, list(latest.values()))
+            return len(latest)
+
+        existing = sink.fingerprints(collection, latest.values())
+        seen = self.before[collection]
+        added, changed, before, out = [], [], {}, []
+        for key, doc in latest.items():
+            if key in existing and existing[key] == doc["fingerprint"]:
+                continue
+            out.append(doc)
+            if key in seen:
+                # Logged when this run first wrote it; settle() decides.
+                continue
+            (changed if key in existing else added).append(key)
+            before[key] = existing.get(key)
+        self._log(collection, before, added=added, changed=changed)
+        sink.upsert(collection, out)
+        return len(out)
+
+    def settle(self, sink, collection : str):
+        """
+        At the end of a load: drop the keys whose stored document is back to
+        the fingerprint it had before the run from the "changed" log, and
+        forget the run's keys for collection.
+        """
+        before = self.before[collection]
+        keys = [k for k, fp in before.items() if fp is not None]
+        same = set()
+        for i in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[i:i + LOOKUP_BATCH]
+            stored = sink.fingerprints(collection, [split_key(collection, k) for k in batch])
+            same.update(k for k in batch if stored.get(k) == before[k])
+        if same:
+            log = self.changes[collection]
+            log["changed"] = [k for k in log["changed"] if k not in same]
+        before.clear()
+
+    def remove_missing(self, sink, collection : str, seen):
+        """Delete documents whose key did not appear in this run's input."""
+        if not (self.enabled and self.delete_missing):
+            return 0
+        gone = []
+        batch = []
+
+        def flush():
+            gone.extend(k for k, hit in zip(batch, seen.contains(batch)) if not hit)
+            batch.clear()
+
+        for key in sink.keys(collection):
+            batch.append(key)
+            if len(batch) >= LOOKUP_BATCH:
+                flush()
+        if batch:
+            flush()
+
+        self._log(collection, removed=gone)
+        sink.delete(collection, gone)
+        return len(gone)
+
+    def summary(self) -> str:
+        parts = []
+        for c, log in self.changes.items():
+            parts.append(f"{c} +{len(log['added'])} ~{len(log['changed'])} -{len(log['removed'])}")
+        return ", ".join(parts)
+
+    def write_changelog(self, state_dir : str) -> str:
+        now = datetime.now(timezone.utc)
+        stem = os.path.join(state_dir, "changes", now.strftime("%Y%m%dT%H%M%S%fZ"))
+        os.makedirs(os.path.dirname(stem), exist_ok=True)
+        # Never overwrite the log of an earlier run, however close together.
+        path, n = stem + ".json", 0
+        while os.path.exists(path):
+            n += 1
+            path = f"{stem}-{n}.json"
+        with open(path, "x", encoding="utf-8") as f:
+            json.dump({
+                "runAt": now.isoformat(),
+                "skippedFiles": self.skipped_files,
+                "collections": self.changes,
+            }, f, indent=2, ensure_ascii=False)
+        return path
@@ -0,0 +1,126 @@
+import time
+from transforms import catalog_documents, gpa_documents
+from delta import doc_key, fingerprint
+
+
+def _timed(frames, stats):
+    """Iterate frames, charging the time spent producing each one (read + transform) to stats."""
+    it = iter(frames)
+    while True:
+        t0 = time.perf_counter()
+        try:
+            frame = next(it)
+        except StopIteration:
+            return
+        stats["transform_s"] += time.perf_counter() - t0
+        stats["rows"] += len(frame)
+        yield frame
+
+
+def _counts(stats):
+    """A resumed run keeps the counts but times only itself."""
+    return {k: v for k, v in stats.items() if not k.endswith("_s")}
+
+
+def write_catalog(sink, frames, delta, seen_courses, seen_sections, resume=None, on_commit=None):
+    """
+    Write course and section documents from transformed catalog frames
+    (one frame, or successive chunks/shards in file order).
+
+    Sections are written per frame; course documents (and their term sets)
+    are the only state carried across frames and are written once at the
+    end, so the first row of a course wins and termsOffered covers every
+    frame.
+
+    on_commit(rows, state) is called after each frame's writes with the
+    frame's row count and the cross-frame state ({"stats", "courses"});
+    passing that state back as resume continues where it left off.
+    """
+    stats = {"rows": 0, "transform_s": 0.0, "write_s": 0.0, "course_writes": 0, "section_writes": 0}
+    courses = {}
+    if resume:
+        stats.update(_counts(resume["stats"]))
+        courses = resume["courses"]
+
+    for t in _timed(frames, stats):
+        t0 = time.perf_counter()
+        frame_courses, sections = catalog_documents(t)
+        for course in frame_courses:
+            prev = courses.get(course["courseId"])
+            if prev is None:
+                courses[course["courseId"]] = course
+            else:
+                prev["termsOffered"] = sorted(set(prev["termsOffered"]) | set(course["termsOffered"]))
+        ids = [sec["sectionId"] for sec in sections]
+        continued = seen_sections.contains(ids)
+        t1 = time.perf_counter()
+        stats["transform_s"] += t1 - t0
+
+        # A section split across frames keeps the meetings written by the
+        # earlier frame (and ORs its bitmap into timeBits); only its first
+        # appearance replaces the document, and the sink fingerprints the
+        # merged one. In delta mode, settle() below compares that with the
+        # fingerprint from before the run.
+        writes = delta.write(sink, "sections", [sec for sec, cont in zip(sections, continued) if not cont])
+        extra = [sec for sec, cont in zip(sections, continued) if cont]
+        if delta.insert_only:
+            delta.defer("extend", "sections", extra, "meetings", "timeBits")
+        elif extra:
+            sink.extend("sections", extra, "meetings", "timeBits")
+        seen_sections.add(ids)
+        stats["section_writes"] += writes + len(extra)
+        stats["write_s"] += time.perf_counter() - t1
+        if on_commit is not None:
+            on_commit(len(t), {"stats": stats, "courses": courses})
+
+    t1 = time.perf_counter()
+    stats["course_writes"] = delta.write(sink, "courses", list(courses.values()))
+    seen_courses.add(list(courses))
+    delta.settle(sink, "sections")
+    delta.settle(sink, "courses")
+    stats["write_s"] += time.perf_counter() - t1
+
+    stats["courses"] = len(courses)
+    return stats
+
+
+def write_gpa(sink, frames, delta, seen, resume=None, on_commit=None):
+    """
+    Write gparecords documents from transformed GPA frames (resume/on_commit
+    as in write_catalog). A key repeated in a later frame is written again,
+    so the last row wins; with delta enabled it is logged once, against the
+    record stored before the run.
+    """
+    stats = {"rows": 0, "transform_s": 0.0, "write_s": 0.0, "writes": 0}
+    if resume:
+        stats.update(_counts(resume["stats"]))
+
+    for t in _timed(frames, stats):
+        t0 = time.perf_counter()
+        docs = gpa_documents(t)
+        keys = [doc_key("gparecords", d) for d in docs]
+        t1 = time.perf_counter()
+        stats["transform_s"] += t1 - t0
+
+        # Inserts can't overwrite a key an earlier frame already inserted;
+        # those rows replace it once the unique index exists.
+        if delta.insert_only:
+            repeated = seen.contains(keys)
+            again = [doc for doc, rep in zip(docs, repeated) if rep]
+            for doc in again:
+                doc["fingerprint"] = fingerprint(doc)
+            delta.defer("upsert", "gparecords", again)
+            docs = [doc for doc, rep in zip(docs, repeated) if not rep]
+
+        writes = delta.write(sink, "gparecords", docs)
+        if delta.delete_missing or delta.insert_only:
+            seen.add(keys)
+        stats["writes"] += writes
+        stats["write_s"] += time.perf_counter() - t1
+        if on_commit is not None:
+            on_commit(len(t), {"stats": stats})
+
+    t1 = time.perf_counter()
+    delta.settle(sink, "gparecords")
+    stats["write_s"] += time.perf_counter() - t1
+    return stats
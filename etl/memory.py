@@ -0,0 +1,91 @@
+import os
+import sys
+import resource
+import base64
+import hashlib
+import numpy as np
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (falls back to the peak off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryGuard:
+    """
+    Keeps a chunked reader under a memory ceiling. After each chunk the
+    loader calls next_chunk_size(); while RSS is above the ceiling the chunk
+    size is halved, and once it can't shrink any further the run aborts
+    instead of getting OOM-killed halfway through a write.
+    """
+
+    def __init__(self, max_rss_mb=None, chunk_size=50_000, min_chunk_size=1_000):
+        self.max_rss_mb = max_rss_mb
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min(min_chunk_size, chunk_size)
+
+    def next_chunk_size(self) -> int:
+        if not self.max_rss_mb:
+            return self.chunk_size
+        rss = rss_mb()
+        if rss <= self.max_rss_mb:
+            return self.chunk_size
+        if self.chunk_size <= self.min_chunk_size:
+            raise MemoryError(
+                f"RSS {rss:.0f} MB is over the {self.max_rss_mb:.0f} MB ceiling "
+                f"even at the minimum chunk size ({self.min_chunk_size} rows)"
+            )
+        self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+        print(f"[stream] RSS {rss:.0f} MB over ceiling, chunk size -> {self.chunk_size}")
+        return self.chunk_size
+
+
+class SeenKeys:
+    """
+    Compact set of string keys seen in earlier chunks: a sorted array of
+    64-bit hashes, 8 bytes per key instead of a Python str in a set.
+    """
+
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def _hash(keys) -> np.ndarray:
+        return np.fromiter(
+            (int.from_bytes(hashlib.blake2b(k.encode("utf-8"), digest_size=8).digest(), "little") for k in keys),
+            dtype=np.uint64,
+        )
+
+    def contains(self, keys) -> np.ndarray:
+        return np.isin(self._hash(keys), self._keys, assume_unique=False)
+
+    def add(self, keys):
+        self._keys = np.union1d(self._keys, self._hash(keys))
+
+    def update(self, other : "SeenKeys"):
+        self._keys = np.union1d(self._keys, other._keys)
+
+    def to_state(self) -> str:
+        """The hashes as base64, for checkpoints."""
+        return base64.b64encode(self._keys.astype("<u8").tobytes()).decode("ascii")
+
+    @classmethod
+    def from_state(cls, state : str) -> "SeenKeys":
+        out = cls()
+        out._keys = np.frombuffer(base64.b64decode(state), dtype="<u8").astype(np.uint64)
+        return out
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import bisect
+import importlib
+from datetime import datetime, timezone
+import sinks
+from memory import peak_rss_mb, rss_mb
+
+# Run metrics for the seed. One RunMetrics per run collects:
+#
+#   stages      rows and seconds per stage ("catalog.read", "catalog.transform",
+#               "catalog.documents", "catalog.write", "rollups", ...)
+#   batches     bulk-write latency histogram per collection (every
+#               sinks.write_batches call while attached)
+#   rowIssues   rows with a data-quality problem, by reason, with a few
+#               example keys (transforms.catalog_issues / gpa_issues)
+#
+# and ends as a JSON run report. Hooks are callables hook(event, payload)
+# for an external collector: "progress" after every frame, "stage" for
+# every recorded stage, "report" with the final report. --metrics-hook
+# module:function (or ETL_METRICS_HOOK) loads one.
+#
+# With --workers the stage seconds are summed over worker processes.
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PROGRESS_EVERY_S = float(os.getenv("ETL_PROGRESS_EVERY", "5"))
+ISSUE_EXAMPLES = 5
+EXAMPLE_KEYS = ("sectionId", "courseId")
+
+
+class Histogram:
+    """Counts per latency bucket (upper bounds in LATENCY_BUCKETS_MS, then +inf)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.ops = 0
+
+    def observe(self, seconds : float, ops : int = 1):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        self.ops += ops
+
+    def merge(self, other : dict):
+        self.counts = [a + b for a, b in zip(self.counts, other["buckets"].values())]
+        self.total_s += other["totalS"]
+        self.max_s = max(self.max_s, other["maxS"])
+        self.ops += other["ops"]
+
+    def quantile(self, q : float):
+        """Upper bound of the bucket holding the q-quantile (None past the last bound)."""
+        n = sum(self.counts)
+        if not n:
+            return None
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= q * n:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        n = sum(self.counts)
+        labels = [f"le{b}ms" for b in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "batches": n,
+            "ops": self.ops,
+            "totalS": self.total_s,
+            "meanMs": self.total_s / n * 1000 if n else None,
+            "p50Ms": self.quantile(0.5),
+            "p95Ms": self.quantile(0.95),
+            "maxS": self.max_s,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def load_hook(spec : str):
+    """ "package.module:function" -> the callable """
+    module, _, name = spec.partition(":")
+    if not module or not name:
+        raise ValueError(f"Metrics hook must look like module:function, got {spec!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+class RunMetrics:
+
+    def __init__(self, progress=False, hooks=()):
+        self.progress = progress
+        self.hooks = list(hooks)
+        self.started = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._last_progress = 0.0
+        self.stages = {}
+        self.batches = {}
+        self.issues = {}
+        self.attached = False
+
+    def attach(self):
+        """Start timing every sinks.write_batches batch in this process."""
+        if not self.attached:
+            sinks.BATCH_OBSERVERS.append(self.batch)
+            self.attached = True
+        return self
+
+    def detach(self):
+        if self.attached:
+            sinks.BATCH_OBSERVERS.remove(self.batch)
+            self.attached = False
+
+    def emit(self, event : str, payload : dict):
+        for hook in self.hooks:
+            hook(event, payload)
+
+    def batch(self, collection : str, ops : int, seconds : float):
+        self.batches.setdefault(collection, Histogram()).observe(seconds, ops)
+
+    def stage(self, name : str, rows : int, seconds : float):
+        s = self.stages.setdefault(name, {"rows": 0, "seconds": 0.0})
+        s["rows"] += int(rows)
+        s["seconds"] += seconds
+        if self.hooks:
+            self.emit("stage", {"stage": name, "rows": int(rows), "seconds": seconds})
+
+    def issue(self, reason : str, rows : int, examples=()):
+        i = self.issues.setdefault(reason, {"rows": 0, "examples": []})
+        i["rows"] += int(rows)
+        room = ISSUE_EXAMPLES - len(i["examples"])
+        if room > 0:
+            i["examples"].extend(list(examples)[:room])
+
+    def frames(self, kind : str, raw_frames, transform, issues=None):
+        """
+        Wrap a loader's frame pipeline: time reading each raw frame and
+        transforming it (stages <kind>.read / <kind>.transform), count row
+        issues, and report progress.
+        """
+        it = iter(raw_frames)
+        while True:
+            t0 = time.perf_counter()
+            df = next(it, None)
+            if df is None:
+                return
+            t1 = time.perf_counter()
+            t = transform(df)
+            t2 = time.perf_counter()
+            self.stage(f"{kind}.read", len(df), t1 - t0)
+            self.stage(f"{kind}.transform", len(t), t2 - t1)
+            if issues is not None:
+                key = next((c for c in EXAMPLE_KEYS if c in t.columns), None)
+                for reason, mask in issues(df, t).items():
+                    n = int(mask.sum())
+                    if n:
+                        self.issue(reason, n, t.loc[mask, key].head(ISSUE_EXAMPLES).tolist() if key else ())
+            del df
+            self._progress(kind)
+            yield t
+
+    def loaded(self, kind : str, stats : dict, written : int):
+        """
+        Record a loader's document building and sink writes. Its
+        transform_s includes the time spent waiting on frames, which
+        frames() already charged to read/transform.
+        """
+        waited = sum(self.stages.get(f"{kind}.{s}", {}).get("seconds", 0.0) for s in ("read", "transform"))
+        self.stage(f"{kind}.documents", stats["rows"], max(stats["transform_s"] - waited, 0.0))
+        self.stage(f"{kind}.write", written, stats["write_s"])
+
+    def _progress(self, kind : str):
+        now = time.perf_counter() - self._t0
+        read = self.stages.get(f"{kind}.read", {"rows": 0})["rows"]
+        payload = {"kind": kind, "rowsRead": read, "elapsedS": now, "rssMb": rss_mb()}
+        if self.hooks:
+            self.emit("progress", payload)
+        if self.progress and now - self._last_progress >= PROGRESS_EVERY_S:
+            self._last_progress = now
+            print(f"[progress] {kind}: {read:,} rows read, {read / now:,.0f} rows/s overall, "
+                  f"RSS {payload['rssMb']:.0f} MB")
+
+    def state(self) -> dict:
+        """Picklable stages/batches/issues, for merging worker metrics into the parent's."""
+        return {
+            "stages": self.stages,
+            "batches": {c: h.to_dict() for c, h in self.batches.items()},
+            "issues": self.issues,
+        }
+
+    def merge(self, state : dict):
+        for name, s in state["stages"].items():
+            self.stage(name, s["rows"], s["seconds"])
+        for coll, h in state["batches"].items():
+            self.batches.setdefault(coll, Histogram()).merge(h)
+        for reason, i in state["issues"].items():
+            self.issue(reason, i["rows"], i["examples"])
+
+    def report(self, **extra) -> dict:
+        stages = {
+            name: {**s, "rowsPerS": s["rows"] / s["seconds"] if s["seconds"] else None}
+            for name, s in self.stages.items()
+        }
+        return {
+            "startedAt": self.started.isoformat(),
+            "finishedAt": datetime.now(timezone.utc).isoformat(),
+            "durationS": time.perf_counter() - self._t0,
+            **extra,
+            "stages": stages,
+            "writeBatches": {c: h.to_dict() for c, h in sorted(self.batches.items())},
+            "rowIssues": dict(sorted(self.issues.items())),
+            "peakRssMb": peak_rss_mb(),
+        }
+
+    def write_report(self, path : str, **extra) -> dict:
+        report = self.report(**extra)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        self.emit("report", report)
+        return report
+
+
+def default_report_path(state_dir : str) -> str:
+    return os.path.join(state_dir, "runs", datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json")
@@ -0,0 +1,211 @@
+import os
+import glob
+import time
+import zlib
+import shutil
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import pandas as pd
+
+from readers import discover_inputs, read_frames, frame_pipeline, CATALOG_DTYPES, GPA_DTYPES
+from loaders import write_catalog, write_gpa
+from memory import MemoryGuard, SeenKeys
+from delta import DeltaTracker, file_checksum
+from sinks import make_sink
+from metrics import RunMetrics
+
+# Parallel seeding, in two stages per pipeline (catalog, gpa):
+#
+#   split  one task per input file: read + transform, then spill the rows
+#          partitioned by subject shard to a scratch directory
+#   merge  one task per shard: replay that shard's pieces in (file, chunk)
+#          order and write them to the worker's own sink (one MongoClient,
+#          or one output part file, per worker process)
+#
+# A course's rows always land in the same shard, so per-course aggregates
+# like termsOffered are computed exactly as the sequential loader would,
+# and replaying in file order keeps "first row wins" deterministic.
+
+_sink = None
+_metrics = None
+
+
+def _init_worker(sink_spec, staging=False):
+    """One sink (and one write-batch timer) per worker process."""
+    global _sink, _metrics
+    _sink = make_sink(sink_spec, part=os.getpid(), staging=staging)
+    _metrics = RunMetrics().attach()
+
+
+def _take_metrics():
+    """This worker's metrics since the last call, as RunMetrics.state()."""
+    global _metrics
+    state = _metrics.state()
+    _metrics.detach()
+    _metrics = RunMetrics().attach()
+    return state
+
+
+def shard_of(subjects : pd.Series, n_shards : int) -> pd.Series:
+    """Stable subject -> shard assignment (crc32, not hash(), so every process agrees)."""
+    codes = {s: zlib.crc32(s.encode("utf-8")) % n_shards for s in subjects.unique()}
+    return subjects.map(codes)
+
+
+def _split(kind, file_idx, path, n_shards, spill_dir, chunk_size=None, max_rss_mb=None):
+    t0 = time.perf_counter()
+    guard = MemoryGuard(max_rss_mb, chunk_size) if chunk_size else None
+    dtypes = CATALOG_DTYPES if kind == "catalog" else GPA_DTYPES
+    transform, issues = frame_pipeline(kind, path)
+
+    rows = 0
+    metrics = RunMetrics()
+    for chunk_idx, t in enumerate(metrics.frames(kind, read_frames(path, dtypes, guard), transform, issues)):
+        subjects = t["courseId"].str.split(" ", n=1).str[0]
+        for shard, part in t.groupby(shard_of(subjects, n_shards), sort=False):
+            part.to_pickle(os.path.join(spill_dir, f"{kind}-{shard:04d}-{file_idx:05d}-{chunk_idx:05d}.pkl"))
+        rows += len(t)
+
+    return {"pid": os.getpid(), "stage": "split", "rows": rows,
+            "transform_s": time.perf_counter() - t0, "write_s": 0.0, "metrics": metrics.state()}
+
+
+def _merge(kind, shard, spill_dir, delta_enabled, delete_missing, insert_only):
+    pieces = sorted(glob.glob(os.path.join(spill_dir, f"{kind}-{shard:04d}-*.pkl")))
+    frames = (pd.read_pickle(p) for p in pieces)
+    delta = DeltaTracker(enabled=delta_enabled, delete_missing=delete_missing, insert_only=insert_only)
+
+    if kind == "catalog":
+        seen = {"courses": SeenKeys(), "sections": SeenKeys()}
+        stats = write_catalog(_sink, frames, delta, seen["courses"], seen["sections"])
+    else:
+        seen = {"gparecords": SeenKeys()}
+        stats = write_gpa(_sink, frames, delta, seen["gparecords"])
+    _sink.flush()
+
+    stats.update(pid=os.getpid(), stage="merge", kind=kind, metrics=_take_metrics())
+    return stats, delta.changes, seen, delta.deferred
+
+
+def worker_report(reports):
+    """Per-worker throughput. Split is pure CPU; merge splits its time into document building and sink writes."""
+    per = {}
+    for r in reports:
+        w = per.setdefault(r["pid"], {"split_rows": 0, "split_s": 0.0, "merge_rows": 0,
+                                      "merge_cpu_s": 0.0, "merge_write_s": 0.0})
+        if r["stage"] == "split":
+            w["split_rows"] += r["rows"]
+            w["split_s"] += r["transform_s"]
+        else:
+            w["merge_rows"] += r["rows"]
+            w["merge_cpu_s"] += r["transform_s"]
+            w["merge_write_s"] += r["write_s"]
+
+    lines = []
+    for pid, w in sorted(per.items()):
+        split_rate = w["split_rows"] / w["split_s"] if w["split_s"] else 0.0
+        merge_s = w["merge_cpu_s"] + w["merge_write_s"]
+        merge_rate = w["merge_rows"] / merge_s if merge_s else 0.0
+        bound = "sink" if w["merge_write_s"] > w["merge_cpu_s"] else "cpu"
+        if not w["merge_rows"]:
+            bound = "idle"
+        lines.append(
+            f"[parallel] worker {pid}: split {w['split_rows']} rows @ {split_rate:,.0f}/s | "
+            f"merge {w['merge_rows']} rows @ {merge_rate:,.0f}/s "
+            f"(cpu {w['merge_cpu_s']:.2f}s, sink {w['merge_write_s']:.2f}s -> {bound}-bound)"
+        )
+    return lines
+
+
+def run_parallel(sink, sink_spec, cat_dir, gpa_dir, workers, delta, manifest,
+                 chunk_size=None, max_rss_mb=None, shards=None, staging=False, metrics=None):
+    """
+    Seed every catalog and GPA file found under cat_dir/gpa_dir with a pool
+    of worker processes. Both pipelines share the pool and overlap: each
+    pipeline starts merging as soon as its own files are split.
+
+    In delta mode a pipeline is skipped only when none of its files changed;
+    otherwise all of its files are replayed (fingerprints keep unchanged
+    documents from being rewritten), because a course's termsOffered spans
+    files.
+
+    Workers build their own sink from sink_spec; sink is this process's
+    sink, used for the --delete-missing sweep. With staging, workers write
+    into the staging collections and sink should be the matching staging
+    view. Worker stage timings, write batches and row issues are merged
+    into metrics.
+    """
+    metrics = metrics or RunMetrics()
+    pipelines = {"catalog": discover_inputs(cat_dir), "gpa": discover_inputs(gpa_dir)}
+    checksums = {}
+    for kind, files in list(pipelines.items()):
+        if not files:
+            raise FileNotFoundError(f"No {kind} input files found under {cat_dir if kind == 'catalog' else gpa_dir}")
+        sums = {f: file_checksum(f) for f in files}
+        if delta.enabled and manifest is not None and all(manifest.unchanged(f, c) for f, c in sums.items()):
+            print(f"[{kind}] {len(files)} files unchanged since last successful run, skipped")
+            delta.skipped_files.extend(files)
+            del pipelines[kind]
+            continue
+        checksums[kind] = sums
+        print(f"[{kind}] {len(files)} input files")
+
+    n_shards = shards or workers * 4
+    spill_dir = tempfile.mkdtemp(prefix="seed-shards-")
+    reports = []
+    seen = {}
+    ctx = mp.get_context("spawn")
+
+    try:
+        with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker, initargs=(sink_spec, staging)) as pool:
+            pending = {
+                kind: [pool.submit(_split, kind, i, path, n_shards, spill_dir, chunk_size, max_rss_mb)
+                       for i, path in enumerate(files)]
+                for kind, files in pipelines.items()
+            }
+            merges = {}
+            while pending:
+                for kind, futs in list(pending.items()):
+                    if all(f.done() for f in futs):
+                        reports.extend(f.result() for f in futs)
+                        merges[kind] = [
+                            pool.submit(_merge, kind, shard, spill_dir, delta.enabled, delta.delete_missing, delta.insert_only)
+                            for shard in range(n_shards)
+                        ]
+                        del pending[kind]
+                if pending:
+                    wait([f for futs in pending.values() for f in futs], return_when=FIRST_COMPLETED)
+
+            # Collect in shard order so the merged change log is deterministic.
+            for kind, futs in merges.items():
+                for f in futs:
+                    stats, changes, shard_seen, deferred = f.result()
+                    reports.append(stats)
+                    delta.deferred.extend(deferred)
+                    for coll, log in changes.items():
+                        for change, keys in log.items():
+                            delta.changes[coll][change].extend(keys)
+                    for coll, keys in shard_seen.items():
+                        seen.setdefault(coll, SeenKeys()).update(keys)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    for coll, keys in seen.items():
+        delta.remove_missing(sink, coll, keys)
+
+    if manifest is not None:
+        for sums in checksums.values():
+            for path, checksum in sums.items():
+                manifest.record(path, checksum)
+
+    for r in reports:
+        metrics.merge(r.pop("metrics"))
+        if r["stage"] == "merge":
+            written = r.get("writes", r.get("course_writes", 0) + r.get("section_writes", 0))
+            metrics.stage(f"{r['kind']}.documents", r["rows"], r["transform_s"])
+            metrics.stage(f"{r['kind']}.write", written, r["write_s"])
+
+    for line in worker_report(reports):
+        print(line)
+    return reports
@@ -0,0 +1,315 @@
+import re
+from functools import lru_cache
+from pymongo import UpdateOne
+from sinks import write_batches
+
+# Prerequisite expressions, as stored on courses (prereqs):
+#
+#   "CS 225"                          a course that must be taken earlier
+#   {"concurrent": "MATH 241"}        ... or in the same term
+#   {"and": [e, ...]} / {"or": [e, ...]}
+#
+# The catalog's prerequisite sentence ("CS 128 and CS 173; or MATH 213")
+# is parsed clause by clause: ";" separates clauses, which are ANDed unless
+# the next one starts with "or"; inside a clause "and" binds looser than
+# "or", and comma lists take the conjunction that ends them. A bare number
+# ("CS 124 or 125") keeps the last subject seen.
+#
+# PrereqGraph interns course ids as ints and precomputes, per course, the
+# transitive closure (every course reachable through its prerequisites) as
+# an int bitset and its depth: the fewest earlier terms needed to take it,
+# with "and" taking the max and "or" the min over its branches.
+
+PREREQ_RE = r"(?i)prerequisites?\s*:\s*(.*?)(?:\.(?:\s|$)|$)"
+GRAPH_BATCH = 1000
+
+_TOKEN = re.compile(
+    r"(?P<subject>\b[A-Z]{2,5})\s*(?P<number>\d{3})\b"
+    r"|\b(?P<bare>\d{3})\b"
+    r"|\b(?P<op>(?i:and|or))\b"
+    r"|(?P<comma>,)"
+)
+
+
+def _simplify(op, items):
+    flat = []
+    for item in items:
+        if isinstance(item, dict) and op in item:
+            flat.extend(item[op])
+        else:
+            flat.append(item)
+    out = []
+    for item in flat:
+        if item not in out:
+            out.append(item)
+    if not out:
+        return None
+    return out[0] if len(out) == 1 else {op: out}
+
+
+def _parse_clause(clause : str, subject : str):
+    """One ";"-clause -> (expression or None, last subject seen)."""
+    items, seps = [], []
+    for m in _TOKEN.finditer(clause):
+        if m.group("subject"):
+            subject = m.group("subject")
+            course = f"{subject} {m.group('number')}"
+        elif m.group("bare"):
+            if not subject:
+                continue
+            course = f"{subject} {m.group('bare')}"
+        else:
+            sep = m.group("op").lower() if m.group("op") else ","
+            if items and len(seps) < len(items):
+                seps.append(sep)
+            elif sep != "," and seps and seps[-1] == ",":
+                # "A, B, or C": the conjunction after a comma is the
+                # separator; the comma only ended the previous item.
+                seps[-1] = sep
+            continue
+        if len(seps) < len(items):
+            seps.append(",")
+        items.append(course)
+    if not items:
+        return None, subject
+
+    lowered = clause.lower()
+    default = "or" if "one of" in lowered else "and"
+    # A comma takes the conjunction that closes its list ("A, B, or C").
+    resolved = []
+    for i, sep in enumerate(seps):
+        if sep == ",":
+            sep = next((s for s in seps[i + 1:] if s != ","), default)
+        resolved.append(sep)
+
+    groups = [[items[0]]]
+    for sep, item in zip(resolved, items[1:]):
+        if sep == "and":
+            groups.append([item])
+        else:
+            groups[-1].append(item)
+    expr = _simplify("and", [_simplify("or", g) for g in groups])
+
+    if "concurrent" in lowered:
+        expr = {"concurrent": expr}
+    return expr, subject
+
+
+@lru_cache(maxsize=65536)
+def _parse(text : str, subject : str):
+    expr = None
+    for raw in text.split(";"):
+        clause = raw.strip()
+        if not clause:
+            continue
+        joins_or = clause.lower().startswith("or ")
+        part, subject = _parse_clause(clause, subject)
+        if part is None:
+            continue
+        if expr is None:
+            expr = part
+        elif joins_or:
+            expr = _simplify("or", [expr, part])
+        else:
+            expr = _simplify("and", [expr, part])
+    return expr
+
+
+def parse_prereqs(text : str, subject : str = ""):
+    """Prerequisite sentence -> expression (see above), or None when it names no courses."""
+    if not isinstance(text, str) or not text.strip():
+        return None
+    return _parse(text.strip(), subject or "")
+
+
+def expr_courses(expr):
+    """Every course id named in an expression."""
+    if expr is None:
+        return
+    if isinstance(expr, str):
+        yield expr
+    elif "concurrent" in expr:
+        yield from expr_courses(expr["concurrent"])
+    else:
+        for item in next(iter(expr.values())):
+            yield from expr_courses(item)
+
+
+def format_expr(expr) -> str:
+    if isinstance(expr, str):
+        return expr
+    if "concurrent" in expr:
+        return f"{format_expr(expr['concurrent'])} (concurrent ok)"
+    op, items = next(iter(expr.items()))
+    return f" {op} ".join(f"({format_expr(i)})" if isinstance(i, dict) and "concurrent" not in i else format_expr(i) for i in items)
+
+
+class PrereqGraph:
+    """
+    Prerequisite graph over interned course ids. closure[i] and depth[i]
+    are precomputed for every interned course; cycles (which the catalog
+    shouldn't have) are reported and don't stop the build.
+    """
+
+    def __init__(self, exprs):
+        self.ids = {}
+        self.names = []
+        for course_id in sorted(exprs):
+            self.intern(course_id)
+        for expr in exprs.values():
+            for c in expr_courses(expr):
+                self.intern(c)
+
+        self.exprs = {self.ids[c]: e for c, e in exprs.items() if e is not None}
+        self.compiled = {i: self._compile(e) for i, e in self.exprs.items()}
+        self.deps = {i: {self.ids[c] for c in expr_courses(e)} for i, e in self.exprs.items()}
+        self._build()
+
+    def intern(self, course_id : str) -> int:
+        i = self.ids.get(course_id)
+        if i is None:
+            i = self.ids[course_id] = len(self.names)
+            self.names.append(course_id)
+        return i
+
+    def _compile(self, expr, concurrent=False):
+        """Expression -> nested tuples over interned ids: ("c", id, concurrent) / ("and"|"or", parts)."""
+        if isinstance(expr, str):
+            return ("c", self.ids[expr], concurrent)
+        if "concurrent" in expr:
+            return self._compile(expr["concurrent"], True)
+        op, items = next(iter(expr.items()))
+        return (op, tuple(self._compile(i, concurrent) for i in items))
+
+    def _depth_of(self, node):
+        if node[0] == "c":
+            _, i, concurrent = node
+            return self.depth[i] + (0 if concurrent else 1)
+        parts = [self._depth_of(p) for p in node[1]]
+        return max(parts) if node[0] == "and" else min(parts)
+
+    def _build(self):
+        n = len(self.names)
+        self.closure = [0] * n
+        self.depth = [0] * n
+
+        # Kahn's algorithm over "depends on" edges, prerequisites first.
+        dependents = {}
+        pending = [0] * n
+        for i, deps in self.deps.items():
+            pending[i] = len(deps)
+            for d in deps:
+                dependents.setdefault(d, []).append(i)
+        ready = [i for i in range(n) if pending[i] == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for j in dependents.get(i, ()):
+                pending[j] -= 1
+                if pending[j] == 0:
+                    ready.append(j)
+
+        for i in order:
+            self._settle(i)
+
+        # Whatever is left sits on (or behind) a cycle; iterate to a fixed point.
+        left = {i for i in range(n) if pending[i] > 0}
+        self.cycles = sorted(self.names[i] for i in left)
+        changed = bool(left)
+        while changed:
+            changed = False
+            for i in left:
+                before = self.closure[i]
+                self._settle(i, with_depth=False)
+                changed |= self.closure[i] != before
+        for i in left:
+            self.depth[i] = max((self.depth[d] for d in self.deps.get(i, ()) if d not in left), default=-1) + 1
+
+    def _settle(self, i, with_depth=True):
+        bits = 0
+        for d in self.deps.get(i, ()):
+            bits |= (1 << d) | self.closure[d]
+        self.closure[i] = bits
+        if with_depth and i in self.compiled:
+            self.depth[i] = max(self._depth_of(self.compiled[i]), 0)
+
+    def closure_of(self, course_id : str):
+        i = self.ids.get(course_id)
+        if i is None:
+            return []
+        bits, out = self.closure[i], []
+        while bits:
+            low = bits & -bits
+            out.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return sorted(out)
+
+    def depth_of(self, course_id : str) -> int:
+        i = self.ids.get(course_id)
+        return self.depth[i] if i is not None else 0
+
+    def _satisfied(self, node, before, through):
+        if node[0] == "c":
+            _, i, concurrent = node
+            return bool((through if concurrent else before) >> i & 1)
+        test = all if node[0] == "and" else any
+        return test(self._satisfied(p, before, through) for p in node[1])
+
+    def validate_plan(self, terms, completed=()):
+        """
+        Check a multi-term plan in one pass over its terms. terms is a list
+        of course-id lists in term order; completed are courses already
+        taken. Returns one problem per course whose prerequisites aren't
+        met by earlier terms (or by the same term, where concurrent
+        registration is allowed): {"term", "courseId", "requires"}.
+        """
+        # Courses the graph doesn't know are nobody's prerequisite, so
+        # they need no bit.
+        before = 0
+        for c in completed:
+            if c in self.ids:
+                before |= 1 << self.ids[c]
+
+        problems = []
+        for t, courses in enumerate(terms):
+            ids = [self.ids.get(c) for c in courses]
+            through = before
+            for i in ids:
+                if i is not None:
+                    through |= 1 << i
+            for course_id, i in zip(courses, ids):
+                node = self.compiled.get(i)
+                if node is not None and not self._satisfied(node, before, through):
+                    problems.append({"term": t, "courseId": course_id, "requires": format_expr(self.exprs[i])})
+            before = through
+        return problems
+
+    @classmethod
+    def from_db(cls, db):
+        exprs = {c["courseId"]: c.get("prereqs") for c in db.courses.find({}, {"_id": 0, "courseId": 1, "prereqs": 1})}
+        return cls(exprs)
+
+
+def plan_terms(plan):
+    """A stored plan's semesters -> the terms list validate_plan takes."""
+    return [[c["courseId"] for c in s.get("courses") or []] for s in plan.get("semesters") or []]
+
+
+def build_prereq_graph(db):
+    """
+    Build the graph from the stored courses and write each course's
+    prereqDepth and prereqClosure where they changed. The closure is
+    transitive, so it is always recomputed over the whole catalog.
+    Returns (graph, courses updated).
+    """
+    graph = PrereqGraph.from_db(db)
+    projection = {"_id": 0, "courseId": 1, "prereqDepth": 1, "prereqClosure": 1}
+    ops = []
+    for c in db.courses.find({}, projection):
+        depth = graph.depth_of(c["courseId"])
+        closure = graph.closure_of(c["courseId"])
+        if c.get("prereqDepth") != depth or c.get("prereqClosure") != closure:
+            ops.append(UpdateOne({"courseId": c["courseId"]}, {"$set": {"prereqDepth": depth, "prereqClosure": closure}}))
+    write_batches(db.courses, ops, GRAPH_BATCH)
+    return graph, len(ops)
@@ -0,0 +1,263 @@
+import os
+import glob
+import json
+import pandas as pd
+from transforms import GRADE_WEIGHTS, transform_catalog, transform_gpa, catalog_issues, gpa_issues
+
+# Columns the transforms actually read. Everything else in the export is
+# dropped at parse time, and all catalog fields are read as text so chunks
+# never disagree on inferred dtypes.
+CATALOG_COLUMNS = [
+    "Subject", "Number", "Name", "Description", "Prerequisites", "Credit Hours", "Degree Attributes",
+    "YearTerm", "Section", "CRN", "Type Code", "Instructors", "Room", "Building",
+    "Days of Week", "Start Time", "End Time", "Section Info", "Schedule Information",
+]
+CATALOG_DTYPES = {c: str for c in CATALOG_COLUMNS}
+CATALOG_REQUIRED = ["Subject", "Number", "Name", "Credit Hours", "YearTerm", "Section", "CRN"]
+
+# The grade counts are read as text too: exports put "--" or blanks in
+# some cells, and transform_gpa coerces those (to 0 for grade counts)
+# rather than the reader failing on them.
+GPA_TEXT_COLUMNS = ["Subject", "Number", "YearTerm", "Term", "Primary Instructor", "Instructor"]
+GPA_NUMERIC_COLUMNS = list(GRADE_WEIGHTS.keys()) + ["W", "Students"]
+GPA_DTYPES = {c: str for c in GPA_TEXT_COLUMNS + GPA_NUMERIC_COLUMNS}
+
+# Inputs can be CSV (optionally compressed; pandas picks the codec from the
+# suffix) or columnar: Parquet or Arrow IPC/Feather files, or a directory
+# of Parquet files (a dataset, e.g. written by convert.py). Columnar inputs
+# are read with pyarrow's multithreaded scanner, only the needed columns,
+# and whole CSV files with pandas' pyarrow engine when pyarrow is installed
+# (ETL_CSV_ENGINE=c turns that off).
+#
+# convert.py writes normalized datasets: the transformed frames, typed,
+# one part per input file and term, tagged "catalog"/"gpa" under
+# NORMALIZED_KEY in the schema metadata. Those are loaded as they are,
+# without the transforms.
+CSV_SUFFIXES = (".csv", ".csv.gz", ".csv.bz2", ".csv.xz", ".csv.zst")
+COLUMNAR_SUFFIXES = (".parquet", ".arrow", ".feather")
+INPUT_PATTERNS = ["*" + s for s in CSV_SUFFIXES + COLUMNAR_SUFFIXES]
+
+CSV_ENGINE = os.getenv("ETL_CSV_ENGINE", "pyarrow")
+READ_THREADS = int(os.getenv("ETL_READ_THREADS", "0"))
+
+NORMALIZED_KEY = b"etl.normalized"
+ORDER_KEY = b"etl.order"
+SOURCES_KEY = b"etl.sources"
+
+
+def _arrow():
+    """pyarrow and pyarrow.dataset; ImportError with a hint if pyarrow is missing."""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow inputs need pyarrow: pip install pyarrow") from e
+    if READ_THREADS and pa.cpu_count() != READ_THREADS:
+        pa.set_cpu_count(READ_THREADS)
+    return pa, ds
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def is_columnar(path : str) -> bool:
+    return path.endswith(COLUMNAR_SUFFIXES)
+
+
+def _format(path : str) -> str:
+    return "parquet" if path.endswith(".parquet") else "ipc"
+
+
+def _metadata(path : str) -> dict:
+    _, ds = _arrow()
+    return ds.dataset(path, format=_format(path)).schema.metadata or {}
+
+
+def columnar_files(path : str):
+    """The files behind a columnar input, in load order (a dataset's parts by their etl.order)."""
+    if not os.path.isdir(path):
+        return [path]
+    files = glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True)
+    if not files:
+        raise FileNotFoundError(f"No Parquet files under {path}")
+    return sorted(files, key=lambda f: (int(_metadata(f).get(ORDER_KEY, b"0")), f))
+
+
+def normalized_kind(path : str):
+    """ "catalog"/"gpa" for a convert.py dataset or file, None for raw inputs. """
+    if not is_columnar(path):
+        return None
+    kind = _metadata(columnar_files(path)[0]).get(NORMALIZED_KEY)
+    return kind.decode("utf-8") if kind else None
+
+
+def converted_sources(dataset : str):
+    """The raw files a convert.py dataset was built from (absolute paths)."""
+    meta = _metadata(columnar_files(dataset)[0])
+    base = os.path.dirname(os.path.abspath(dataset))
+    return [os.path.normpath(os.path.join(base, p)) for p in json.loads(meta.get(SOURCES_KEY, b"[]"))]
+
+
+def stale_sources(dataset : str):
+    """Sources modified after the dataset was written: it needs converting again."""
+    written = min(os.path.getmtime(f) for f in columnar_files(dataset))
+    return [p for p in converted_sources(dataset) if os.path.exists(p) and os.path.getmtime(p) > written]
+
+
+def discover_inputs(directory : str):
+    """
+    Every input file under a data directory (one per term/year), in sorted
+    path order. A convert.py dataset stands in for the raw files it was
+    built from, and contributes its parts in load order.
+    """
+    found = set()
+    for pattern in INPUT_PATTERNS:
+        found.update(glob.glob(os.path.join(directory, "**", pattern), recursive=True))
+    datasets = sorted(p for p in found if os.path.isdir(p))
+    replaced = {p for d in datasets for p in converted_sources(d)}
+
+    out = []
+    for p in sorted(found):
+        if p in datasets:
+            out.extend(columnar_files(p))
+        elif (os.path.isfile(p) and os.path.normpath(os.path.abspath(p)) not in replaced
+              and not any(p.startswith(d + os.sep) for d in datasets)):
+            out.append(p)
+    return out
+
+
+def find_input(directory : str, name : str) -> str:
+    """
+    The sequential loader's input in directory: name.parquet (file or
+    dataset directory), name.arrow, name.feather, then name.csv[.gz|...].
+    Falls back to name.csv, so a missing input still reports that path.
+    """
+    for suffix in COLUMNAR_SUFFIXES + CSV_SUFFIXES:
+        path = os.path.join(directory, name + suffix)
+        if os.path.exists(path):
+            return path
+    return os.path.join(directory, name + ".csv")
+
+
+def _coerce(df : pd.DataFrame, dtypes) -> pd.DataFrame:
+    """A raw columnar frame with the dtypes the CSV reader gives (numbers in text columns become text)."""
+    for c, t in dtypes.items():
+        if c not in df.columns:
+            continue
+        if t is str:
+            df[c] = df[c].map(lambda v: v if isinstance(v, str) else str(v), na_action="ignore").astype(object)
+        else:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype(t)
+    return df
+
+
+def _scan(path, dtypes, terms):
+    """Record batches of one columnar file: only the needed columns, only the terms asked for."""
+    _, ds = _arrow()
+    dataset = ds.dataset(path, format=_format(path))
+    names = dataset.schema.names
+    normalized = NORMALIZED_KEY in (dataset.schema.metadata or {})
+    columns = names if normalized else [c for c in names if c in dtypes]
+    # convert.py writes one term per part, so the row-group statistics let
+    # the scanner skip the other terms' parts without decoding them.
+    term_col = next((c for c in ("term", "YearTerm", "Term") if c in names), None)
+    where = ds.field(term_col).isin(sorted(terms)) if terms and term_col else None
+    return dataset.scanner(columns=columns, filter=where, use_threads=True).to_batches()
+
+
+def _read_columnar(path, dtypes, guard, skip_rows, terms):
+    pa, _ = _arrow()
+    normalized = normalized_kind(path) is not None
+
+    def frame(tables):
+        df = pa.concat_tables(tables).to_pandas()
+        return df if normalized else _coerce(df, dtypes)
+
+    # Parts with the same columns make one frame (whole input) or are
+    # re-chunked to the guard's size (streaming). A change of columns,
+    # e.g. a GPA export without a W column, starts a new frame.
+    buf, have = [], 0
+    size = guard.next_chunk_size() if guard else None
+    for f in columnar_files(path):
+        for batch in _scan(f, dtypes, terms):
+            if skip_rows:
+                if batch.num_rows <= skip_rows:
+                    skip_rows -= batch.num_rows
+                    continue
+                batch, skip_rows = batch.slice(skip_rows), 0
+            if not batch.num_rows:
+                continue
+            table = pa.Table.from_batches([batch])
+            if buf and not table.schema.equals(buf[0].schema):
+                yield frame(buf)
+                buf, have = [], 0
+            buf.append(table)
+            have += batch.num_rows
+            while size and have >= size:
+                table = pa.concat_tables(buf)
+                yield frame([table.slice(0, size)])
+                rest = table.slice(size)
+                buf, have = [rest] if rest.num_rows else [], rest.num_rows
+                size = guard.next_chunk_size()
+    if have:
+        yield frame(buf)
+
+
+def read_frames(path, dtypes, guard=None, skip_rows=0, terms=None):
+    """
+    Yield the input as DataFrames: the whole file at once, or successive
+    chunks sized by the MemoryGuard when streaming. skip_rows data rows
+    (records, not lines) are skipped first, for resumed runs. terms limits
+    columnar inputs to those terms' rows.
+    """
+    if is_columnar(path):
+        yield from _read_columnar(path, dtypes, guard, skip_rows, terms)
+        return
+
+    kwargs = dict(dtype=dtypes, usecols=lambda c: c in dtypes)
+    if skip_rows:
+        kwargs["skiprows"] = range(1, skip_rows + 1)
+    if guard is None:
+        if CSV_ENGINE == "pyarrow" and not skip_rows and _has_pyarrow():
+            # The pyarrow engine parses on all cores but only takes a column list.
+            header = pd.read_csv(path, nrows=0).columns
+            kwargs.update(engine="pyarrow", usecols=[c for c in header if c in dtypes])
+        yield pd.read_csv(path, **kwargs)
+        return
+
+    with pd.read_csv(path, chunksize=guard.chunk_size, **kwargs) as reader:
+        while True:
+            try:
+                chunk = reader.get_chunk(guard.next_chunk_size())
+            except StopIteration:
+                return
+            yield chunk
+
+
+def check_catalog_columns(df : pd.DataFrame, path : str = ""):
+    for c in CATALOG_REQUIRED:
+        if c not in df.columns:
+            where = f" in {path}" if path else ""
+            raise ValueError(f"Missing required catalog column: '{c}'{where}")
+    return df
+
+
+def frame_pipeline(kind : str, path : str):
+    """
+    (transform, issues) for the frames read_frames yields from path:
+    transform_* plus its row-issue check for raw inputs; normalized inputs
+    pass through (their issues were reported when they were converted).
+    """
+    normalized = normalized_kind(path)
+    if normalized is not None:
+        if normalized != kind:
+            raise ValueError(f"{path} is a normalized {normalized} dataset, not {kind}")
+        return (lambda t: t), None
+    if kind == "catalog":
+        return (lambda df: transform_catalog(check_catalog_columns(df, path))), catalog_issues
+    return transform_gpa, gpa_issues
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+from transforms import GRADE_WEIGHTS
+from sinks import write_batches
+
+# GPA rollups materialized onto course documents, so the API reads one
+# course document instead of $lookup-ing and averaging gparecords per
+# request. Averages are student-weighted: summed grade points over summed
+# graded students, not a mean of per-section averages.
+
+GRADES = list(GRADE_WEIGHTS.keys())
+WEIGHTS = np.array([GRADE_WEIGHTS[g] for g in GRADES], dtype=float)
+ROLLUP_BATCH = 500
+
+
+def _read_records(db, course_ids=None) -> pd.DataFrame:
+    query = {} if course_ids is None else {"courseId": {"$in": sorted(course_ids)}}
+    projection = {"_id": 0, "courseId": 1, "term": 1, "instructor": 1, "counts": 1, "W": 1}
+    rows = []
+    for r in db.gparecords.find(query, projection):
+        counts = r.get("counts") or {}
+        rows.append([r.get("courseId", ""), r.get("term", ""), r.get("instructor", ""), r.get("W") or 0]
+                    + [counts.get(g, 0.0) or 0.0 for g in GRADES])
+    df = pd.DataFrame(rows, columns=["courseId", "term", "instructor", "W"] + GRADES)
+    df[GRADES + ["W"]] = df[GRADES + ["W"]].apply(pd.to_numeric, errors="coerce").fillna(0.0).astype(float)
+    df["students"] = df[GRADES].to_numpy() @ np.ones(len(GRADES))
+    df["points"] = df[GRADES].to_numpy() @ WEIGHTS
+    return df
+
+
+def _summarize(df : pd.DataFrame, by) -> pd.DataFrame:
+    g = df.groupby(by, sort=True)[["students", "points", "W"]].sum()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        g["avg"] = np.where(g["students"] > 0, g["points"] / g["students"], np.nan)
+        total = g["students"] + g["W"]
+        g["wRate"] = np.where(total > 0, g["W"] / total, np.nan)
+    return g
+
+
+def _num(x, digits):
+    return None if pd.isna(x) else round(float(x), digits)
+
+
+def _entry(row, **extra):
+    return {
+        **extra,
+        "avg": _num(row.avg, 3),
+        "students": int(row.students),
+        "W": int(row.W),
+        "wRate": _num(row.wRate, 4),
+    }
+
+
+def course_rollups(df : pd.DataFrame):
+    """courseId -> rollup document, from a frame of GPA records."""
+    if df.empty:
+        return {}
+
+    course = _summarize(df, "courseId")
+    dist = df.groupby("courseId", sort=True)[GRADES].sum()
+    by_instr = _summarize(df, ["courseId", "instructor"])
+    by_term = _summarize(df, ["courseId", "term"])
+    terms = df.loc[df["term"] != ""].groupby("courseId")["term"].unique()
+
+    rollups = {}
+    for r in course.itertuples():
+        rollups[r.Index] = {
+            **_entry(r),
+            "distribution": {g: int(round(v)) for g, v in zip(GRADES, dist.loc[r.Index].tolist())},
+            "terms": sorted(terms.get(r.Index, [])),
+            "byInstructor": [],
+            "byTerm": [],
+        }
+    for r in by_instr.itertuples():
+        course_id, instr = r.Index
+        rollups[course_id]["byInstructor"].append(_entry(r, instructor=instr))
+    for r in by_term.itertuples():
+        course_id, term = r.Index
+        rollups[course_id]["byTerm"].append(_entry(r, term=term))
+    for roll in rollups.values():
+        roll["byInstructor"].sort(key=lambda e: (-e["students"], e["instructor"]))
+    return rollups
+
+
+def affected_courses(changes):
+    """Course ids whose rollup may differ after a delta run."""
+    ids = set(changes["courses"]["added"])
+    for change in ("added", "changed", "removed"):
+        ids.update(k.split("|", 1)[0] for k in changes["gparecords"][change])
+    return ids
+
+
+def build_rollups(db, course_ids=None) -> int:
+    """
+    Recompute GPA rollups and store them on the course documents as
+    avgGpa (student-weighted) and gpa (distribution, per-instructor and
+    per-term breakdowns, W rates). course_ids limits the work to those
+    courses; None rebuilds every course.
+    """
+    if course_ids is not None and not course_ids:
+        return 0
+
+    if course_ids is None:
+        course_ids = db.courses.distinct("courseId")
+    targets = sorted(course_ids)
+
+    # Courses go in bounded batches so the records held in memory stay small.
+    updated = 0
+    for i in range(0, len(targets), ROLLUP_BATCH):
+        batch = targets[i:i + ROLLUP_BATCH]
+        rollups = course_rollups(_read_records(db, batch))
+        ops = []
+        for course_id in batch:
+            roll = rollups.get(course_id)
+            ops.append(UpdateOne(
+                {"courseId": course_id},
+                {"$set": {"avgGpa": roll["avg"] if roll else None, "gpa": roll}}
+            ))
+        write_batches(db.courses, ops)
+        updated += len(ops)
+    return updated
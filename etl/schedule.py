@@ -0,0 +1,179 @@
+from functools import lru_cache
+import numpy as np
+
+# Weekly meeting bitmaps. A section's schedule is one bit per (day,
+# 5-minute slot), day-major over DAYS, padded to WORDS 64-bit words.
+# Sections store it as timeBits: WORDS signed int64s (so MongoDB can
+# keep it as plain longs and $bit-or meetings into it), and two sections
+# conflict iff their bitmaps share a bit.
+#
+# A meeting covers [start, end) rounded outward to whole slots, so a class
+# ending at 09:50 doesn't collide with one starting at 09:50.
+
+DAYS = "MTWRFSU"
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WORDS = (len(DAYS) * SLOTS_PER_DAY + 63) // 64
+
+EMPTY = np.zeros(WORDS, dtype=np.uint64)
+EMPTY.flags.writeable = False
+
+# Section type codes that stand in for a lecture (combined lecture-
+# discussion, online); a student takes one of them, not one of each.
+COMPONENT = {"LCD": "LEC", "ONL": "LEC", "OLC": "LEC"}
+
+# Partial schedules extended per step of find_schedules' depth-first join.
+JOIN_BLOCK = 4096
+
+
+def _minutes(hhmm : str):
+    """ "09:50" -> 590; anything else (including "25:00", which would spill into the next day) -> None """
+    if not isinstance(hhmm, str) or len(hhmm) != 5 or hhmm[2] != ":":
+        return None
+    try:
+        hh, mm = int(hhmm[:2]), int(hhmm[3:])
+    except ValueError:
+        return None
+    return hh * 60 + mm if 0 <= hh < 24 and 0 <= mm < 60 else None
+
+
+@lru_cache(maxsize=4096)
+def meeting_bits(days : str, start : str, end : str) -> np.ndarray:
+    """Bitmap of one meeting row; empty when the days or times are missing (arranged/online)."""
+    lo, hi = _minutes(start), _minutes(end)
+    if lo is None or hi is None or hi <= lo:
+        return EMPTY
+    first, last = lo // SLOT_MINUTES, -(-hi // SLOT_MINUTES)
+
+    mask = np.zeros(WORDS * 64, dtype=bool)
+    for d in days:
+        i = DAYS.find(d)
+        if i >= 0:
+            mask[i * SLOTS_PER_DAY + first:i * SLOTS_PER_DAY + last] = True
+    bits = np.packbits(mask, bitorder="little").view(np.uint64)
+    bits.flags.writeable = False
+    return bits
+
+
+def section_bits(meetings) -> np.ndarray:
+    """OR of the section's meeting bitmaps (meetings as stored: days list, "HH:MM" start/end)."""
+    out = EMPTY.copy()
+    for m in meetings or []:
+        out |= meeting_bits("".join(m.get("days") or []), m.get("start") or "", m.get("end") or "")
+    return out
+
+
+def to_words(bits : np.ndarray) -> list:
+    """Bitmap -> the stored timeBits list (signed int64s)."""
+    return bits.astype(np.uint64).view(np.int64).tolist()
+
+
+def from_words(words) -> np.ndarray:
+    """Stored timeBits -> bitmap; missing -> empty."""
+    if not words:
+        return EMPTY.copy()
+    return np.asarray(words, dtype=np.int64).view(np.uint64)
+
+
+def conflicts(a : np.ndarray, b : np.ndarray) -> bool:
+    return bool(np.bitwise_and(a, b).any())
+
+
+def conflict_matrix(bits : np.ndarray) -> np.ndarray:
+    """(n, WORDS) bitmaps -> (n, n) bool matrix of pairwise conflicts."""
+    return np.bitwise_and(bits[:, None, :], bits[None, :, :]).any(axis=2)
+
+
+def find_schedules(groups, limit=None) -> np.ndarray:
+    """
+    Conflict-free ways to pick one option from each group (all of them,
+    or the first limit).
+
+    groups is a list of (n_i, WORDS) bitmap arrays, one per thing that
+    needs a slot (a course's lecture, its discussion, ...). Returns an
+    (m, len(groups)) array of option indices, one row per schedule.
+
+    The option-vs-option conflicts between every pair of groups are
+    computed up front with one broadcast AND per pair. Partial schedules
+    are then joined against the next group (smallest first) by gathering
+    rows of those tables, and extended depth-first in blocks of
+    JOIN_BLOCK, so dead ends are pruned early and a limit stops the search
+    as soon as enough schedules are found.
+    """
+    if not groups:
+        return np.zeros((0, 0), dtype=np.intp)
+    order = sorted(range(len(groups)), key=lambda g: len(groups[g]))
+    options = [np.asarray(groups[g], dtype=np.uint64).reshape(-1, WORDS) for g in order]
+    k = len(options)
+
+    clash = {
+        (a, b): np.bitwise_and(options[a][:, None, :], options[b][None, :, :]).any(axis=2)
+        for b in range(k) for a in range(b)
+    }
+
+    def join(picks, level):
+        free = np.ones((len(picks), len(options[level])), dtype=bool)
+        for a in range(level):
+            free &= ~clash[a, level][picks[:, a]]
+        rows, cols = np.nonzero(free)
+        return np.column_stack([picks[rows], cols])
+
+    found, total = [], 0
+    stack = [(np.zeros((1, 0), dtype=np.intp), 0)]
+    while stack and not (limit and total >= limit):
+        picks, level = stack.pop()
+        if level == k:
+            found.append(picks)
+            total += len(picks)
+            continue
+        joined = join(picks, level)
+        stack.extend(
+            (joined[i:i + JOIN_BLOCK], level + 1)
+            for i in reversed(range(0, len(joined), JOIN_BLOCK))
+        )
+
+    picks = np.concatenate(found) if found else np.zeros((0, k), dtype=np.intp)
+    out = np.empty_like(picks)
+    out[:, order] = picks
+    return out[:limit] if limit else out
+
+
+def term_options(db, course_ids, term):
+    """
+    The groups find_schedules takes, from the stored sections of the given
+    courses in one term: one group per (course, component), where the
+    component is the section type code folded through COMPONENT. Returns
+    (labels, section ids per group, bitmaps per group).
+
+    Raises ValueError if a course has no sections that term.
+    """
+    found = {}
+    projection = {"_id": 0, "sectionId": 1, "courseId": 1, "type": 1, "timeBits": 1, "meetings": 1}
+    for s in db.sections.find({"courseId": {"$in": list(course_ids)}, "term": term}, projection):
+        bits = from_words(s["timeBits"]) if s.get("timeBits") else section_bits(s.get("meetings"))
+        kind = s.get("type") or ""
+        found.setdefault((s["courseId"], COMPONENT.get(kind, kind)), []).append((s["sectionId"], bits))
+
+    missing = sorted(set(course_ids) - {c for c, _ in found})
+    if missing:
+        raise ValueError(f"No sections in {term} for: {', '.join(missing)}")
+
+    labels, ids, groups = [], [], []
+    for label in sorted(found):
+        options = sorted(found[label], key=lambda o: o[0])
+        labels.append(label)
+        ids.append([sid for sid, _ in options])
+        groups.append(np.stack([bits for _, bits in options]))
+    return labels, ids, groups
+
+
+def schedules(db, course_ids, term, limit=100):
+    """Conflict-free section choices for a course load: a list of {courseId: [sectionId, ...]}."""
+    labels, ids, groups = term_options(db, course_ids, term)
+    out = []
+    for row in find_schedules(groups, limit):
+        pick = {}
+        for (course_id, _), options, i in zip(labels, ids, row):
+            pick.setdefault(course_id, []).append(options[i])
+        out.append(pick)
+    return out
@@ -0,0 +1,123 @@
+import re
+from pymongo import ReplaceOne
+from sinks import write_batches
+from rollups import affected_courses
+
+# Course search index, one entry per course in the coursesearch
+# collection. Each entry carries a multikey "keys" array; the index on it
+# is the posting list, so typeahead queries are index lookups instead of
+# regex scans over courses:
+#
+#   c:<prefix>   compact course id prefixes       "c:CS", "c:CS2", "c:CS225"
+#   n:<prefix>   course number prefixes           "n:2", "n:225"
+#   t:<prefix>   title word prefixes (casefolded) "t:dat", "t:data"
+#   g:<trigram>  title trigrams, for substrings   "g:ata", "g:a s"
+#   d:<prefix>   description word prefixes, MIN_DESC_PREFIX chars and up
+#
+# Entries also carry the ranking fields the routes sort on (level from the
+# course number, avgGpa from the GPA rollup). backend/src/services/
+# courseSearch.js builds queries against the same key scheme.
+
+SEARCH_COLLECTION = "coursesearch"
+SEARCH_BATCH = 500
+MAX_PREFIX = 15
+MIN_DESC_PREFIX = 3
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "the", "this", "to", "with", "course", "credit", "hours",
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SPACES = re.compile(r"\s+")
+
+_PROJECTION = {"_id": 0, "courseId": 1, "subject": 1, "number": 1, "title": 1, "description": 1, "avgGpa": 1}
+
+
+def tokens(text) -> list:
+    return _TOKEN.findall(str(text or "").casefold())
+
+
+def _prefixes(word : str, shortest : int = 1):
+    return (word[:n] for n in range(shortest, min(len(word), MAX_PREFIX) + 1))
+
+
+def trigrams(text) -> set:
+    s = _SPACES.sub(" ", str(text or "").casefold()).strip()
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def course_level(number) -> int:
+    """100 for 1xx, 400 for 4xx, ...; 0 when the number doesn't start with a digit."""
+    number = str(number or "")
+    return int(number[0]) * 100 if number[:1].isdigit() else 0
+
+
+def search_entry(course) -> dict:
+    subject = str(course.get("subject") or "")
+    number = str(course.get("number") or "")
+    title = course.get("title") or ""
+
+    keys = set()
+    keys.update("c:" + p for p in _prefixes((subject + number).upper()))
+    keys.update("n:" + p for p in _prefixes(number.upper()))
+    for word in tokens(title):
+        keys.update("t:" + p for p in _prefixes(word))
+    keys.update("g:" + g for g in trigrams(title))
+    for word in tokens(course.get("description")):
+        if word not in STOPWORDS:
+            keys.update("d:" + p for p in _prefixes(word, MIN_DESC_PREFIX))
+
+    return {
+        "courseId": course["courseId"],
+        "subject": subject,
+        "number": number,
+        "title": title,
+        "level": course_level(number),
+        "avgGpa": course.get("avgGpa"),
+        "keys": sorted(keys),
+    }
+
+
+def changed_courses(changes) -> set:
+    """Course ids whose search entry may differ after a delta run (course text or GPA rollup changed)."""
+    ids = affected_courses(changes)
+    for change in ("added", "changed", "removed"):
+        ids.update(changes["courses"][change])
+    return ids
+
+
+def build_search_index(db, course_ids=None) -> int:
+    """
+    (Re)build search entries from the course documents; run it after the
+    rollups so avgGpa is current. course_ids limits the work to those
+    courses, dropping entries for any that no longer exist; None rebuilds
+    every entry and drops entries for removed courses.
+    """
+    if course_ids is not None and not course_ids:
+        return 0
+
+    index = db[SEARCH_COLLECTION]
+    if course_ids is None:
+        live = set(db.courses.distinct("courseId"))
+        stale = set(index.distinct("courseId")) - live
+        targets = sorted(live)
+    else:
+        targets = sorted(course_ids)
+        stale = set()
+
+    written = 0
+    for i in range(0, len(targets), SEARCH_BATCH):
+        batch = targets[i:i + SEARCH_BATCH]
+        found = {c["courseId"]: c for c in db.courses.find({"courseId": {"$in": batch}}, _PROJECTION)}
+        stale.update(c for c in batch if c not in found)
+        ops = [
+            ReplaceOne({"courseId": course_id}, search_entry(course), upsert=True)
+            for course_id, course in found.items()
+        ]
+        write_batches(index, ops)
+        written += len(ops)
+
+    if stale:
+        index.delete_many({"courseId": {"$in": sorted(stale)}})
+    return written
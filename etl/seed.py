@@ -1,280 +1,368 @@
 import os 
-import re 
-import math 
-import pandas as pd 
-from pymongo import MongoClient
+import time
+import hashlib
+import argparse
 from dotenv import load_dotenv
+from readers import (
+    read_frames, frame_pipeline, discover_inputs, find_input, is_columnar, stale_sources,
+    CATALOG_DTYPES, GPA_DTYPES,
+)
+from loaders import write_catalog, write_gpa
+from memory import MemoryGuard, SeenKeys, peak_rss_mb
+from delta import DeltaTracker, Manifest, file_checksum
+from parallel import run_parallel
+from rollups import build_rollups, affected_courses
+from search import build_search_index, changed_courses
+from prereqs import build_prereq_graph
+from sinks import make_sink, MongoSink
+from snapshot import snapshot_from_db
+from metrics import RunMetrics, load_hook, default_report_path
+from checkpoint import Checkpoint
+import staging
 
 load_dotenv()
 MONGO_URL = os.getenv("MONGODB_URI", "mongodb://localhost:27017/course_planner")
 CAT_DIR = os.getenv("DATA_CATALOG_DIR", "../data/catalog")
 GPA_DIR = os.getenv("DATA_GPA_DIR", "../data/gpa")
 
-CAT_FILE = os.path.join(CAT_DIR, "catalog.csv")
-GPA_FILE = os.path.join(GPA_DIR, "gpa.csv")
-
-client = MongoClient(MONGO_URL)
-db = client.get_default_database()
-
-GRADE_WEIGHTS = {
-    "A+" : 4.0,
-    "A" : 4.0,
-    "A-" : 3.67,
-    "B+": 3.33,
-    "B" : 3.00,
-    "B-" : 2.67,
-    "C+" : 2.33,
-    "C" : 2.00,
-    "C-" : 1.67,
-    "D+" : 1.33,
-    "D" : 1.00,
-    "D-": 0.67,
-    "F":0.00
-}
-
-#Helper Functions
-
-def _is_nan(x) -> bool:
-    return x is None or (isinstance(x, float) and math.isnan(x))
-
-def clean_str(x):
-    return "" if _is_nan(x) else str(x).strip()
-
-def to_float_hours(s : str):
-    """Extract numeric hours from strings like '3 hours', '4.0 Hours', etc."""
-    if not isinstance(s, str):
-        return None
-    m = re.search(r"(\d+(?:\.\d+)?)\s*hour", s.lower())
-    return float(m.group(1)) if m else None
+# catalog.parquet (convert.py) wins over catalog.csv; see readers.find_input.
+CAT_FILE = os.getenv("DATA_CATALOG_FILE") or find_input(CAT_DIR, "catalog")
+GPA_FILE = os.getenv("DATA_GPA_FILE") or find_input(GPA_DIR, "gpa")
+STATE_DIR = os.getenv("ETL_STATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".seed-state"))
 
+#Loader Functions
 
-def split_list(val):
-    """Split by comma OR " and " (gen-eds often formatted with 'and')"""
-    if not isinstance(val, str) or not val.strip():
-        return []
-    s = val.replace(" and ", ",")
-    return [x.strip() for x in s.split(",") if x.strip()]
+def _skip_unchanged(label, path, delta, manifest):
+    """Checksum the input; in delta mode, report whether the last run already loaded it."""
+    if manifest is None:
+        return None, False
+    checksum = file_checksum(path)
+    if delta.enabled and manifest.unchanged(path, checksum):
+        print(f"[{label}] {path} unchanged since last successful run, skipped")
+        delta.skipped_files.append(path)
+        return checksum, True
+    return checksum, False
+
+
+def _check_input(label, path):
+    if os.path.isdir(path):
+        stale = stale_sources(path)
+        if stale:
+            print(f"[{label}] warning: {', '.join(stale)} changed after {path} was converted; rerun convert.py")
+
+
+def _resume_point(checkpoint, kind, path, checksum, sink, delta, seen):
+    """(rows to skip, loader state, on_commit) for one loader; a fresh start without a checkpoint."""
+    if checkpoint is None:
+        return 0, None, None
+    checksum = checksum or file_checksum(path)
+    start, state = checkpoint.position(kind, path, checksum, seen)
+    if start:
+        print(f"[{kind}] resuming after row {start} of {path}")
+    return start, state, checkpoint.committer(sink, kind, path, checksum, delta, seen)
+
+
+def load_catalog_csv(sink, guard=None, delta=None, manifest=None, metrics=None, checkpoint=None):
+    """
+    Expected minimal columns:
+      - Subject, Number, Name, Credit Hours
+    Optional (if present): Description, Degree Attributes / GenEd, Terms Offered, Prerequisites
 
+    With a guard the file is streamed in chunks. Sections are written per
+    chunk; course documents (and their term sets) are the only state carried
+    across chunks and are written once at the end.
 
-def parse_time_to_24h(s : str) -> str:
-    """ "9:00 AM" -> "09:00", "12:50 PM" -> "12:50", empty -> "" """
-    if not isinstance(s, str) or not s.strip():
-        return ""
+    With a checkpoint, progress is recorded after every chunk and a run
+    resumed from it skips the rows already written.
+    """
 
-    s = s.strip().upper()
-    m = re.match(r"^(\d{1,2}):(\d{2})\s*(AM|PM)$", s)
-    if not m:
-        return ""
+    if not os.path.exists(CAT_FILE):
+        raise FileNotFoundError(f"Catalog file not found: {CAT_FILE}")
+    _check_input("catalog", CAT_FILE)
+    if checkpoint is not None and checkpoint.is_done("catalog"):
+        print("[catalog] loaded before the interruption, skipped")
+        return
+
+    delta = delta or DeltaTracker()
+    metrics = metrics or RunMetrics()
+    checksum, skip = _skip_unchanged("catalog", CAT_FILE, delta, manifest)
+    if skip:
+        return
+
+    seen_courses = SeenKeys()
+    seen_sections = SeenKeys()
+    start, state, on_commit = _resume_point(checkpoint, "catalog", CAT_FILE, checksum, sink, delta,
+                                            {"sections": seen_sections})
+    frames = metrics.frames("catalog", read_frames(CAT_FILE, CATALOG_DTYPES, guard, start),
+                            *frame_pipeline("catalog", CAT_FILE))
+    stats = write_catalog(sink, frames, delta, seen_courses, seen_sections, state, on_commit)
+    metrics.loaded("catalog", stats, stats["course_writes"] + stats["section_writes"])
+
+    removed = delta.remove_missing(sink, "courses", seen_courses)
+    removed += delta.remove_missing(sink, "sections", seen_sections)
+
+    if manifest is not None:
+        manifest.record(CAT_FILE, checksum)
+    if checkpoint is not None:
+        checkpoint.finish("catalog", delta)
+
+    print(f"[catalog] {stats['courses']} courses, {len(seen_sections)} sections; "
+          f"wrote {stats['course_writes']} courses, {stats['section_writes']} sections, removed {removed}")
+
+
+def load_gpa_csv(sink, guard=None, delta=None, manifest=None, metrics=None, checkpoint=None, terms=None):
+    """
+    GPA counterpart of load_catalog_csv. terms limits a columnar input to
+    those terms' rows; the file isn't recorded in the manifest then, since
+    only part of it was loaded.
+    """
 
-    hh, mm, ap = int(m.group(1)), m.group(2), m.group(3)
-    if ap == "AM":
-        hh = 0 if hh == 12 else hh
+    if not os.path.exists(GPA_FILE):
+        raise FileNotFoundError(f"GPA file not found: {GPA_FILE}")
+    _check_input("gpa", GPA_FILE)
+    if checkpoint is not None and checkpoint.is_done("gpa"):
+        print("[gpa] loaded before the interruption, skipped")
+        return
+
+    delta = delta or DeltaTracker()
+    metrics = metrics or RunMetrics()
+    checksum, skip = _skip_unchanged("gpa", GPA_FILE, delta, manifest)
+    if skip:
+        return
+
+    seen = SeenKeys()
+    start, state, on_commit = _resume_point(checkpoint, "gpa", GPA_FILE, checksum, sink, delta, {"gparecords": seen})
+    frames = metrics.frames("gpa", read_frames(GPA_FILE, GPA_DTYPES, guard, start, terms),
+                            *frame_pipeline("gpa", GPA_FILE))
+    stats = write_gpa(sink, frames, delta, seen, state, on_commit)
+    metrics.loaded("gpa", stats, stats["writes"])
+
+    removed = delta.remove_missing(sink, "gparecords", seen)
+
+    if manifest is not None and not terms:
+        manifest.record(GPA_FILE, checksum)
+    if checkpoint is not None:
+        checkpoint.finish("gpa", delta)
+
+    print(f"[gpa] {stats['rows']} GPA rows; upserted {stats['writes']} GPA docs, removed {removed}")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Seed courses, sections and GPA records from CSV.")
+    p.add_argument("--stream", action="store_true",
+                   help="Read the CSVs in chunks instead of loading them whole.")
+    p.add_argument("--chunk-size", type=int, default=int(os.getenv("ETL_CHUNK_SIZE", "50000")),
+                   help="Rows per chunk when streaming (default: 50000).")
+    p.add_argument("--max-rss-mb", type=float, default=float(os.getenv("ETL_MAX_RSS_MB", "0")) or None,
+                   help="Memory ceiling when streaming; chunks shrink to stay under it.")
+    p.add_argument("--delta", action="store_true",
+                   help="Skip unchanged files and write only new or changed documents.")
+    p.add_argument("--delete-missing", action="store_true",
+                   help="With --delta, delete documents that are no longer in the input.")
+    p.add_argument("--full-reload", action="store_true",
+                   help="Load into staging collections with plain inserts, build indexes, "
+                        "validate, then swap them over the live collections.")
+    p.add_argument("--state-dir", default=STATE_DIR,
+                   help="Where the file manifest and change logs are kept.")
+    p.add_argument("--workers", type=int, default=int(os.getenv("ETL_WORKERS", "0")),
+                   help="Load every CSV under DATA_CATALOG_DIR/DATA_GPA_DIR with this many "
+                        "processes, sharded by subject (default: sequential, single files).")
+    p.add_argument("--sink", default=MONGO_URL,
+                   help="Where documents go: a mongodb:// URL (default: MONGODB_URI), "
+                        "jsonl:DIR, jsonl.gz:DIR, memory: or count:.")
+    p.add_argument("--shards", type=int, default=None,
+                   help="Subject shards for --workers (default: 4 per worker).")
+    p.add_argument("--terms", type=lambda s: [t for t in s.split(",") if t], default=None,
+                   help="Load only these terms' GPA rows, comma-separated (e.g. 2025-fa); needs a "
+                        "Parquet/Arrow GPA input, which is read partition by partition (see convert.py).")
+    p.add_argument("--resume", action="store_true",
+                   help="Continue the interrupted run recorded in --state-dir/checkpoint.json "
+                        "(sequential runs only).")
+    p.add_argument("--progress", action="store_true",
+                   help="Print rows read, rows/s and RSS every ETL_PROGRESS_EVERY seconds (default: 5).")
+    p.add_argument("--report", default=None,
+                   help="Where to write the JSON run report (default: runs/<timestamp>.json in --state-dir).")
+    p.add_argument("--metrics-hook", action="append", dest="metrics_hooks",
+                   default=[h for h in os.getenv("ETL_METRICS_HOOK", "").split(",") if h],
+                   help="module:function called as hook(event, payload) for progress, stages and the "
+                        "final report; repeatable (default: ETL_METRICS_HOOK, comma-separated).")
+    p.add_argument("--snapshot", default=os.getenv("CATALOG_SNAPSHOT"),
+                   help="Where to write the binary catalog snapshot the audit parser maps "
+                        "(default: CATALOG_SNAPSHOT, else catalog.snap in --state-dir; '' to skip).")
+    return p.parse_args(argv)
+
+def load_all(args, sink, guard, delta, manifest, metrics, staging_load=False, checkpoint=None):
+    if args.workers > 0:
+        run_parallel(
+            sink, args.sink, CAT_DIR, GPA_DIR, args.workers, delta, manifest,
+            chunk_size=args.chunk_size if args.stream else None,
+            max_rss_mb=args.max_rss_mb, shards=args.shards, staging=staging_load, metrics=metrics,
+        )
     else:
-        hh = 12 if hh == 12 else hh + 12
-
-    return f"{hh:02d}:{mm}"
+        load_catalog_csv(sink, guard, delta, manifest, metrics, checkpoint)
+        load_gpa_csv(sink, guard, delta, manifest, metrics, checkpoint, args.terms)
 
 
-def parse_days(s : str):
-    """ Accepts "MWF", "M W F" or single "F" """
-    if not isinstance(s, str) or not s.strip():
-        return []
-    
-    s = s.strip().upper().replace(" ", "")
+def post_load(metrics, name, fn, *args):
+    """Run one post-load step, recording it as a stage (rows: the count it returns, or a tuple's last item)."""
+    t0 = time.perf_counter()
+    out = fn(*args)
+    rows = out[-1] if isinstance(out, tuple) else out
+    metrics.stage(name, rows or 0, time.perf_counter() - t0)
+    return out
 
-    out = [ch for ch in s if ch in {"M", "T", "W", "R", "F", "S", "U"}]
 
-    seen = set()
-    dedup = []
+def report_prereqs(target_db, metrics):
+    graph, updated = post_load(metrics, "prereqs", build_prereq_graph, target_db)
+    print(f"[prereqs] {len(graph.exprs)} courses with prerequisites, "
+          f"max depth {max(graph.depth, default=0)}, updated {updated} courses")
+    if graph.cycles:
+        print(f"[prereqs] warning: prerequisite cycle through {', '.join(graph.cycles[:10])}")
 
-    for d in out:
-        if d not in seen:
-            dedup.append(d)
-            seen.add(d)
-    return dedup
 
-def first_instructor(s : str):
-    """ "Siglos,D;Wang, Y" -> "Siglos, D" """
-    if not isinstance(s , str) or not s.strip():
-        return ""
-    return s.split(";")[0].strip()
+def write_catalog_snapshot(args, target_db, metrics):
+    path = os.path.join(args.state_dir, "catalog.snap") if args.snapshot is None else args.snapshot
+    if path:
+        print(f"[snapshot] {post_load(metrics, 'snapshot', snapshot_from_db, target_db, path)} courses -> {path}")
 
-#Loader Functions
 
-def load_catalog_csv():
+def full_reload(args, sink, guard, manifest, metrics):
     """
-    Expected minimal columns:
-      - Subject, Number, Name, Credit Hours
-    Optional (if present): Description, Degree Attributes / GenEd, Terms Offered, Prerequisites
+    Load everything into staging collections with plain inserts, build the
+    indexes once, validate, and swap. Checksums are only recorded after the
+    swap, so a failed reload never makes a later delta run skip a file.
     """
+    db = sink.db
+    stage = staging.prepare(db)
+    stage_sink = MongoSink(stage, batch_size=sink.batch_size)
+    delta = DeltaTracker(insert_only=True)
+    load_all(args, stage_sink, guard, delta, None, metrics, staging_load=True)
 
-    if not os.path.exists(CAT_FILE):
-        raise FileNotFoundError(f"Catalog file not found: {CAT_FILE}")
-    
-    df = pd.read_csv(CAT_FILE)
-
-    must_cols = ["Subject", "Number", "Name", "Credit Hours", "YearTerm", "Section", "CRN"]
-
-    for c in must_cols:
-        if c not in df.columns:
-            raise ValueError(f"Missing required catalog column: '{c}'")
-        
-
-    course_seen = set()
-    course_upserts = 0
-    section_upserts = 0
-
-    for _, r in df.iterrows():
-        subject = clean_str(r.get("Subject"))
-        number = clean_str(r.get("Number"))
-        name = clean_str(r.get("Name"))
-        desc = clean_str(r.get("Description"))
-        yearterm = clean_str(r.get("YearTerm"))
-        geneds = split_list(clean_str(r.get("Degree Attributes")))
-        credits = to_float_hours(clean_str(r.get("Credit Hours")))
-
-        course_id = f"{subject} {number}".strip()
-
-        if course_id not in course_seen:
-
-            terms = sorted(set(clean_str(x) for x in df.loc[
-                (df["Subject"] == r["Subject"]) & (df["Number"] == r["Number"])
-            ]["YearTerm"].tolist()))
-
-            db.courses.update_one(
-                {"courseId" : course_id},
-                {"$set" : {
-                    "courseId" : course_id,
-                    "subject" : subject,
-                    "number" : number,
-                    "title" : name,
-                    "description" : desc,
-                    "credits" : credits,
-                    "genEds" : geneds,
-                    "prereqText" : "",
-                    "termsOffered" : [t for t in terms if t]
-                }},
-                upsert=True
-            )
-
-            course_seen.add(course_id)
-            course_upserts += 1
-        
-        section   = clean_str(r.get("Section"))
-        crn       = clean_str(r.get("CRN"))
-        typ       = clean_str(r.get("Type"))           
-        start     = parse_time_to_24h(clean_str(r.get("Start Time")))
-        end       = parse_time_to_24h(clean_str(r.get("End Time")))
-        days      = parse_days(clean_str(r.get("Days of Week")))
-        room      = clean_str(r.get("Room"))
-        bldg      = clean_str(r.get("Building"))
-        location  = " ".join([x for x in [room, bldg] if x])
-        instr_raw = clean_str(r.get("Instructors"))
-        instructor = first_instructor(instr_raw)
-
-        notes = clean_str(r.get("Section Info"))
-
-        if not notes:
-            notes = clean_str(r.get("Schedule Information"))
-        
-        section_id = f"{course_id}:{yearterm}:{section}"
-
-        db.sections.update_one(
-            {"sectionId": section_id},
-            {"$set" : {
-                "sectionId": section_id,
-                "courseId": course_id,
-                "term": yearterm,
-                "section": section,
-                "crn": crn,
-                "instructor": instructor,
-                "location": location,
-                "modality": "", 
-                "meetings": [{
-                    "days": days,
-                    "start": start,
-                    "end": end,
-                    "raw": f"{''.join(days)} {start}-{end} | {location}".strip()
-                }],
-                "notes": notes
-            }},
-            upsert=True
-        )
-        section_upserts += 1
-    
-    print(f"[catalog] upserted {course_upserts} courses, {section_upserts} sections")
-
+    t0 = time.perf_counter()
+    staging.ensure_indexes(stage)
+    staging.apply_deferred(stage_sink, delta.deferred)
+    metrics.stage("staging.indexes", len(delta.deferred), time.perf_counter() - t0)
+    print(f"[staging] indexes built, {len(delta.deferred)} deferred writes applied")
 
-def load_gpa_csv():
+    rolled = post_load(metrics, "rollups", build_rollups, stage)
+    print(f"[rollups] updated GPA rollups on {rolled} courses")
+    print(f"[search] indexed {post_load(metrics, 'search', build_search_index, stage)} courses")
+    report_prereqs(stage, metrics)
 
-    if not os.path.exists(GPA_FILE):
-        raise FileNotFoundError(f"GPA file not found: {GPA_FILE}")
+    counts = staging.validate(db, stage)
+    staging.swap(db, stage)
+    print(f"[staging] swapped in " + ", ".join(f"{c}={n}" for c, n in counts.items()))
+    write_catalog_snapshot(args, db, metrics)
 
-    df = pd.read_csv(GPA_FILE)
-
-    
-    subj_col   = "Subject"
-    num_col    = "Number"
-    term_col   = "YearTerm" if "YearTerm" in df.columns else "Term"
-    instr_col  = "Primary Instructor" if "Primary Instructor" in df.columns else "Instructor"
-
-    
-    grade_cols = [g for g in GRADE_WEIGHTS.keys() if g in df.columns]
-    has_W      = "W" in df.columns
-    has_students = "Students" in df.columns
-
-    upserts = 0
-    for _, r in df.iterrows():
-        subject = clean_str(r.get(subj_col))
-        number  = clean_str(r.get(num_col))
-        course_id = f"{subject} {number}".strip()
-        term    = clean_str(r.get(term_col))
-        instr   = clean_str(r.get(instr_col))
-
-        counts = {}
-        for g in grade_cols:
-            v = r.get(g, 0)
-            try:
-                counts[g] = float(0 if _is_nan(v) else v)
-            except Exception:
-                counts[g] = 0.0
-
-        total_pts = sum(counts[g] * GRADE_WEIGHTS[g] for g in counts)
-        total_graded = sum(counts[g] for g in counts)
-        avg = round(total_pts / total_graded, 3) if total_graded else None
-
-        doc = {
-            "courseId": course_id,
-            "term": term,
-            "instructor": instr,
-            "counts": counts,
-            "avgGpa": avg
-        }
-
-        if has_W:
-            wv = r.get("W")
-            if not _is_nan(wv):
-                try: doc["W"] = int(wv) # type: ignore
-                except: pass
-        if has_students:
-            sv = r.get("Students")
-            if not _is_nan(sv):
-                try: doc["students"] = int(sv) # type: ignore
-                except: pass
-
-        db.gparecords.update_one(
-            {"courseId": course_id, "term": term, "instructor": instr},
-            {"$set": doc},
-            upsert=True
-        )
-        upserts += 1
+    inputs = discover_inputs(CAT_DIR) + discover_inputs(GPA_DIR) if args.workers > 0 else [CAT_FILE, GPA_FILE]
+    for path in inputs:
+        manifest.record(path, file_checksum(path))
 
-    print(f"[gpa] upserted {upserts} GPA docs")
 
 # -------------------- MAIN --------------------
+def open_checkpoint(args):
+    """The run's checkpoint: the interrupted run's with --resume, else a fresh one (sequential runs only)."""
+    if args.full_reload or args.workers > 0:
+        if args.resume:
+            raise SystemExit("--resume continues sequential runs; it can't be combined with --full-reload or --workers")
+        return None
+
+    # Only what must match for a resume to be safe; the sink spec is hashed
+    # since it may carry credentials.
+    options = {
+        "sink": hashlib.sha256(args.sink.encode("utf-8")).hexdigest()[:16],
+        "delta": args.delta,
+        "deleteMissing": args.delete_missing,
+        "catalog": os.path.realpath(CAT_FILE),
+        "gpa": os.path.realpath(GPA_FILE),
+        "terms": args.terms,
+    }
+    path = os.path.join(args.state_dir, "checkpoint.json")
+    if args.resume:
+        try:
+            checkpoint = Checkpoint.load(path, options)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        if checkpoint is not None:
+            print(f"[checkpoint] resuming: {checkpoint.describe()}")
+            return checkpoint
+        print("[checkpoint] nothing to resume, starting from the top")
+    elif os.path.exists(path):
+        print(f"[checkpoint] discarding the checkpoint of an interrupted run ({path}); use --resume to continue it")
+    return Checkpoint(path, options)
+
+
+def run(args, sink, guard, manifest, metrics):
+    is_mongo = isinstance(sink, MongoSink)
+    if not is_mongo:
+        # The manifest tells delta runs what the database already holds; a
+        # count:/jsonl: run loads nothing there, so it must not record inputs.
+        manifest = None
+    if args.terms:
+        if args.full_reload or args.workers > 0 or args.delete_missing:
+            raise SystemExit("--terms loads part of the GPA data; it can't be combined with "
+                             "--full-reload, --workers or --delete-missing")
+        if not is_columnar(GPA_FILE):
+            raise SystemExit(f"--terms reads term partitions; {GPA_FILE} isn't Parquet/Arrow (see convert.py)")
+    checkpoint = open_checkpoint(args)
+    if args.full_reload:
+        if args.delta:
+            raise SystemExit("--full-reload rewrites everything; it can't be combined with --delta")
+        if not is_mongo:
+            raise SystemExit("--full-reload swaps MongoDB collections; it needs a mongodb:// sink")
+        full_reload(args, sink, guard, manifest, metrics)
+        return None
+
+    if args.delta and not is_mongo:
+        raise SystemExit("--delta compares against stored fingerprints; it needs a mongodb:// sink")
+    delta = DeltaTracker(enabled=args.delta, delete_missing=args.delete_missing)
+    if checkpoint is not None:
+        checkpoint.restore_changes(delta)
+        if delta.enabled:
+            delta.journal = checkpoint.journal
+    if is_mongo:
+        staging.ensure_indexes(sink.db)
+    load_all(args, sink, guard, delta, manifest, metrics, checkpoint=checkpoint)
+    if is_mongo:
+        rolled = post_load(metrics, "rollups", build_rollups, sink.db,
+                           affected_courses(delta.changes) if delta.enabled else None)
+        print(f"[rollups] updated GPA rollups on {rolled} courses")
+        indexed = post_load(metrics, "search", build_search_index, sink.db,
+                            changed_courses(delta.changes) if delta.enabled else None)
+        print(f"[search] indexed {indexed} courses")
+        report_prereqs(sink.db, metrics)
+        write_catalog_snapshot(args, sink.db, metrics)
+    if delta.enabled:
+        print(f"[delta] {delta.summary()}")
+        print(f"[delta] change log: {delta.write_changelog(args.state_dir)}")
+    if checkpoint is not None:
+        checkpoint.clear()
+    if delta.enabled:
+        return {c: {change: len(keys) for change, keys in log.items()} for c, log in delta.changes.items()}
+    return None
+
+
 if __name__ == "__main__":
-    print(f"Connecting to Mongo: {MONGO_URL}")
-    load_catalog_csv()
-    load_gpa_csv()
+    args = parse_args()
+    sink = make_sink(args.sink)
+    is_mongo = isinstance(sink, MongoSink)
+    print(f"Connecting to Mongo: {args.sink}" if is_mongo else f"Writing to sink: {args.sink}")
+    guard = MemoryGuard(args.max_rss_mb, args.chunk_size) if args.stream else None
+    manifest = Manifest(os.path.join(args.state_dir, "manifest.json"))
+    metrics = RunMetrics(progress=args.progress, hooks=[load_hook(h) for h in args.metrics_hooks]).attach()
+    mode = "full-reload" if args.full_reload else "delta" if args.delta else "upsert"
+    report_path = args.report or default_report_path(args.state_dir)
+
+    # The sink URL may carry credentials, so the report only names its kind.
+    run_info = {"mode": mode, "sink": type(sink).__name__, "workers": args.workers, "stream": args.stream}
+    try:
+        summary = run(args, sink, guard, manifest, metrics)
+        sink.close()
+    except (Exception, KeyboardInterrupt) as e:
+        metrics.write_report(report_path, status="failed", error=f"{type(e).__name__}: {e}", **run_info)
+        print(f"[metrics] run report: {report_path}")
+        raise
+    metrics.write_report(report_path, status="ok", delta=summary, **run_info)
+    print(f"[metrics] run report: {report_path}")
+    print(f"[memory] peak RSS {peak_rss_mb():.1f} MB")
     print("✅ Seed complete.")
-
@@ -0,0 +1,271 @@
+import os
+import gzip
+import json
+import time
+from pymongo import MongoClient, InsertOne, UpdateOne
+from delta import KEY_FIELDS, LOOKUP_BATCH, doc_key, key_filter, split_key, fingerprint
+
+# Sinks are where normalized documents go. The loaders only talk to this
+# interface, so the transform pipeline runs (and can be profiled) without
+# a database:
+#
+#   mongodb://...         MongoSink   upserts into the live collections
+#   jsonl:/dir            JsonlSink   one <collection>.jsonl per collection
+#   jsonl.gz:/dir                     ... gzip-compressed
+#   memory:               MemorySink  dict per collection, for tests/benchmarks
+#   count:                CountingSink  discards documents, counts them
+#
+# Documents are identified by their collection's natural key
+# (delta.KEY_FIELDS).
+
+WRITE_BATCH = int(os.getenv("ETL_WRITE_BATCH", "1000"))
+
+# Callables (collection name, ops in the batch, seconds) told about every
+# bulk batch; metrics.RunMetrics registers itself here for the run report.
+BATCH_OBSERVERS = []
+
+
+def write_batches(collection, ops, batch_size=None):
+    """Send pymongo write ops in unordered bulk batches."""
+    batch_size = batch_size or WRITE_BATCH
+    for i in range(0, len(ops), batch_size):
+        t0 = time.perf_counter()
+        collection.bulk_write(ops[i:i + batch_size], ordered=False)
+        if BATCH_OBSERVERS:
+            seconds = time.perf_counter() - t0
+            n = min(batch_size, len(ops) - i)
+            for observe in BATCH_OBSERVERS:
+                observe(collection.name, n, seconds)
+
+
+class Sink:
+    """Base sink: nothing stored, so every document counts as new."""
+
+    def upsert(self, collection : str, docs):
+        """Insert or replace documents by natural key."""
+        raise NotImplementedError
+
+    def insert(self, collection : str, docs):
+        """Documents known not to exist yet (full reload). Defaults to upsert."""
+        self.upsert(collection, docs)
+
+    def extend(self, collection : str, docs, field : str, or_field : str = None):
+        """
+        Add doc[field] items missing from the stored document's list field
+        and fingerprint the merged document. or_field names a list of int64
+        words (timeBits) to OR element-wise into the stored one.
+        """
+        raise NotImplementedError
+
+    def fingerprints(self, collection : str, docs):
+        """doc_key -> stored fingerprint, for those of docs that are stored."""
+        return {}
+
+    def keys(self, collection : str):
+        """Every stored key, for --delete-missing sweeps."""
+        return iter(())
+
+    def delete(self, collection : str, keys):
+        pass
+
+    def flush(self):
+        """Make everything written so far durable (workers call this after each task)."""
+
+    def close(self):
+        self.flush()
+
+
+class MongoSink(Sink):
+    """Writes to a pymongo Database (or a staging.StagingDb view of one)."""
+
+    def __init__(self, db, client=None, batch_size=None):
+        self.db = db
+        self.client = client
+        self.batch_size = batch_size or WRITE_BATCH
+
+    def upsert(self, collection, docs):
+        write_batches(self.db[collection], [
+            UpdateOne(key_filter(collection, d), {"$set": d}, upsert=True) for d in docs
+        ], self.batch_size)
+
+    def insert(self, collection, docs):
+        write_batches(self.db[collection], [InsertOne(d) for d in docs], self.batch_size)
+
+    def extend(self, collection, docs, field, or_field=None):
+        ops = []
+        for d in docs:
+            update = {"$addToSet": {field: {"$each": d[field]}}, "$unset": {"fingerprint": ""}}
+            if or_field:
+                words = {f"{or_field}.{i}": {"or": w} for i, w in enumerate(d[or_field]) if w}
+                if words:
+                    update["$bit"] = words
+            ops.append(UpdateOne(key_filter(collection, d), update))
+        write_batches(self.db[collection], ops, self.batch_size)
+
+        # The merged document is what a later delta run compares against.
+        first = KEY_FIELDS[collection][0]
+        values = sorted({d[first] for d in docs})
+        for i in range(0, len(values), LOOKUP_BATCH):
+            write_batches(self.db[collection], [
+                UpdateOne({"_id": old["_id"]}, {"$set": {"fingerprint": fingerprint(old)}})
+                for old in self.db[collection].find({first: {"$in": values[i:i + LOOKUP_BATCH]}})
+            ], self.batch_size)
+
+    def fingerprints(self, collection, docs):
+        first = KEY_FIELDS[collection][0]
+        projection = {f: 1 for f in KEY_FIELDS[collection]}
+        projection.update({"fingerprint": 1, "_id": 0})
+
+        out = {}
+        values = sorted({d[first] for d in docs})
+        for i in range(0, len(values), LOOKUP_BATCH):
+            for old in self.db[collection].find({first: {"$in": values[i:i + LOOKUP_BATCH]}}, projection):
+                out[doc_key(collection, old)] = old.get("fingerprint")
+        return out
+
+    def keys(self, collection):
+        projection = {f: 1 for f in KEY_FIELDS[collection]}
+        projection["_id"] = 0
+        for d in self.db[collection].find({}, projection):
+            yield doc_key(collection, d)
+
+    def delete(self, collection, keys):
+        keys = list(keys)
+        for i in range(0, len(keys), LOOKUP_BATCH):
+            filters = [split_key(collection, k) for k in keys[i:i + LOOKUP_BATCH]]
+            self.db[collection].delete_many({"$or": filters})
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+
+
+class JsonlSink(Sink):
+    """
+    Appends documents to <dir>/<collection>[.<part>].jsonl[.gz]. Replaying a
+    file in order reproduces the collection: later lines replace earlier
+    ones with the same key, and lines carrying "_extend" add to the named
+    list field instead (and OR the "_or" field's words, if present).
+    """
+
+    def __init__(self, directory : str, compress=False, part=None):
+        self.directory = directory
+        self.compress = compress
+        self.part = part
+        self._files = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, collection : str) -> str:
+        name = collection if self.part is None else f"{collection}.{self.part}"
+        return os.path.join(self.directory, name + (".jsonl.gz" if self.compress else ".jsonl"))
+
+    def _file(self, collection):
+        f = self._files.get(collection)
+        if f is None:
+            path = self.path(collection)
+            f = gzip.open(path, "at", encoding="utf-8") if self.compress else open(path, "a", encoding="utf-8")
+            self._files[collection] = f
+        return f
+
+    def _write(self, collection, docs):
+        f = self._file(collection)
+        f.writelines(json.dumps(d, ensure_ascii=False, default=str) + "\n" for d in docs)
+
+    def upsert(self, collection, docs):
+        if docs:
+            self._write(collection, docs)
+
+    def extend(self, collection, docs, field, or_field=None):
+        def line(d):
+            out = {**key_filter(collection, d), field: d[field], "_extend": field}
+            if or_field:
+                out.update({or_field: d[or_field], "_or": or_field})
+            return out
+        self._write(collection, (line(d) for d in docs))
+
+    def flush(self):
+        # Closing (and reopening in append mode on the next write) keeps
+        # gzip members complete even if a worker process is torn down.
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class MemorySink(Sink):
+    """Keeps every collection as a dict keyed by doc_key."""
+
+    def __init__(self):
+        self.collections = {c: {} for c in KEY_FIELDS}
+
+    def upsert(self, collection, docs):
+        store = self.collections.setdefault(collection, {})
+        for d in docs:
+            store[doc_key(collection, d)] = dict(d)
+
+    def extend(self, collection, docs, field, or_field=None):
+        store = self.collections.setdefault(collection, {})
+        for d in docs:
+            old = store.get(doc_key(collection, d))
+            if old is None:
+                continue
+            items = old.setdefault(field, [])
+            items.extend(x for x in d[field] if x not in items)
+            if or_field:
+                old[or_field] = [a | b for a, b in zip(old.get(or_field) or [0] * len(d[or_field]), d[or_field])]
+            old["fingerprint"] = fingerprint(old)
+
+    def fingerprints(self, collection, docs):
+        store = self.collections.get(collection, {})
+        out = {}
+        for d in docs:
+            k = doc_key(collection, d)
+            if k in store:
+                out[k] = store[k].get("fingerprint")
+        return out
+
+    def keys(self, collection):
+        return iter(list(self.collections.get(collection, {})))
+
+    def delete(self, collection, keys):
+        store = self.collections.get(collection, {})
+        for k in keys:
+            store.pop(k, None)
+
+
+class CountingSink(Sink):
+    """Discards documents and counts them: the transform pipeline's cost alone."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def upsert(self, collection, docs):
+        self.counts[collection] = self.counts.get(collection, 0) + len(docs)
+
+    def extend(self, collection, docs, field, or_field=None):
+        self.counts[collection + ":extend"] = self.counts.get(collection + ":extend", 0) + len(docs)
+
+
+def make_sink(spec : str, part=None, staging=False) -> Sink:
+    """
+    Build a sink from a --sink spec (see the table at the top of this
+    module). part names a per-process output file for file sinks written
+    by several workers; staging wraps a Mongo database in its staging view.
+    """
+    if spec.startswith(("mongodb://", "mongodb+srv://")):
+        client = MongoClient(spec)
+        db = client.get_default_database()
+        if staging:
+            from staging import StagingDb
+            db = StagingDb(db)
+        return MongoSink(db, client)
+
+    kind, _, arg = spec.partition(":")
+    if kind in ("jsonl", "jsonl.gz"):
+        if not arg:
+            raise ValueError(f"{kind} sink needs a directory, e.g. {kind}:/tmp/seed-out")
+        return JsonlSink(arg, compress=kind == "jsonl.gz", part=part)
+    if kind == "memory":
+        return MemorySink()
+    if kind == "count":
+        return CountingSink()
+    raise ValueError(f"Unknown sink: {spec!r}")
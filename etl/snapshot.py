@@ -0,0 +1,159 @@
+import os
+import re
+import time
+import struct
+import warnings
+from collections import Counter
+import numpy as np
+
+# Read-only binary catalog snapshot for in-process lookups (the audit
+# parser memory-maps it: audit-parser/audit_parser/catalog.py). Layout,
+# all little-endian, every section 8-byte aligned:
+#
+#   header     HEADER (magic, format version, id width, counts, build
+#              time, section offsets)
+#   ids        n x ID_WIDTH bytes: course ids, UTF-8, NUL-padded, sorted
+#              bytewise, so lookups are a binary search
+#   credits    n x float32 (NaN = unknown)
+#   geneds     n x uint64 bitmask over the gen-ed name table
+#   gpa        n x float32 avgGpa (NaN = no GPA data)
+#   terms      n x uint64 bitmask over the term name table
+#   titles     n x (uint32 offset, uint32 length) into the heap
+#   gened tbl  (uint32 offset, uint32 length) per gen-ed name
+#   term tbl   (uint32 offset, uint32 length) per term name
+#   heap       UTF-8 string bytes
+#
+# Bump FORMAT_VERSION on any layout change; readers refuse versions they
+# don't know.
+
+MAGIC = b"CATSNAP\x00"
+FORMAT_VERSION = 1
+ID_WIDTH = 16
+MAX_BITS = 64
+
+HEADER = struct.Struct("<8sHHIIIQ10Q")
+SECTIONS = ("ids", "credits", "geneds", "gpa", "terms", "titles", "gened_names", "term_names", "heap", "heap_len")
+
+# Chronological order of the seasons within a year, for "2025-fa" style terms.
+SEASONS = {"sp": 0, "su": 1, "fa": 2, "wi": 3}
+TERM_RE = re.compile(r"^(\d{4})-([a-z]{2})$")
+
+_PROJECTION = {"_id": 0, "courseId": 1, "title": 1, "credits": 1, "genEds": 1, "avgGpa": 1, "termsOffered": 1}
+
+
+def _align(n : int) -> int:
+    return (n + 7) & ~7
+
+
+def _float(x):
+    return np.nan if x is None else float(x)
+
+
+class _Heap:
+    def __init__(self):
+        self.data = bytearray()
+        self.seen = {}
+
+    def add(self, s : str):
+        """(offset, length) of s, stored once."""
+        ref = self.seen.get(s)
+        if ref is None:
+            raw = s.encode("utf-8")
+            ref = self.seen[s] = (len(self.data), len(raw))
+            self.data += raw
+        return ref
+
+
+def _term_key(term : str):
+    """Chronological sort key for "2025-fa" style terms; others sort first, by name."""
+    m = TERM_RE.match(term)
+    if not m or m.group(2) not in SEASONS:
+        return (0, 0, term)
+    return (int(m.group(1)), SEASONS[m.group(2)], term)
+
+
+def _bit_table(names, label, rank):
+    """
+    (names, name -> bit) for at most MAX_BITS names, in name order. When
+    there are more, the MAX_BITS that rank highest are kept and a warning
+    names the ones dropped: courses lose those bits in the snapshot.
+    """
+    names = sorted(names)
+    if len(names) > MAX_BITS:
+        kept = set(sorted(names, key=rank, reverse=True)[:MAX_BITS])
+        dropped = [name for name in names if name not in kept]
+        warnings.warn(f"snapshot: {len(names)} distinct {label} but only {MAX_BITS} bits; "
+                      f"dropping {', '.join(dropped[:10])}{' ...' if len(dropped) > 10 else ''}")
+        names = [name for name in names if name in kept]
+    return names, {name: i for i, name in enumerate(names)}
+
+
+def write_snapshot(courses, path : str, created : int = None) -> int:
+    """
+    Write the snapshot for the given course documents to path, atomically
+    (readers that already mapped the old file keep their copy). Returns
+    the number of courses written.
+    """
+    rows = {}
+    for c in courses:
+        key = c["courseId"].encode("utf-8")
+        if len(key) > ID_WIDTH:
+            print(f"[snapshot] skipping {c['courseId']!r}: id longer than {ID_WIDTH} bytes")
+            continue
+        rows[key] = c
+    keys = sorted(rows)
+    n = len(keys)
+
+    # Over MAX_BITS, keep the gen-eds the most courses carry and the most recent terms.
+    gened_count = Counter(g for c in rows.values() for g in set(c.get("genEds") or []))
+    gened_names, gened_bit = _bit_table(gened_count, "gen-eds", lambda g: (gened_count[g], g))
+    term_names, term_bit = _bit_table({t for c in rows.values() for t in c.get("termsOffered") or []}, "terms",
+                                      _term_key)
+
+    heap = _Heap()
+    ids = np.zeros((n, ID_WIDTH), dtype=np.uint8)
+    credits = np.empty(n, dtype="<f4")
+    gpa = np.empty(n, dtype="<f4")
+    geneds = np.zeros(n, dtype="<u8")
+    terms = np.zeros(n, dtype="<u8")
+    titles = np.zeros((n, 2), dtype="<u4")
+    for i, key in enumerate(keys):
+        c = rows[key]
+        ids[i, :len(key)] = np.frombuffer(key, dtype=np.uint8)
+        credits[i] = _float(c.get("credits"))
+        gpa[i] = _float(c.get("avgGpa"))
+        geneds[i] = sum(1 << gened_bit[g] for g in set(c.get("genEds") or []) if g in gened_bit)
+        terms[i] = sum(1 << term_bit[t] for t in set(c.get("termsOffered") or []) if t in term_bit)
+        titles[i] = heap.add(c.get("title") or "")
+    gened_table = np.array([heap.add(g) for g in gened_names], dtype="<u4").reshape(-1, 2)
+    term_table = np.array([heap.add(t) for t in term_names], dtype="<u4").reshape(-1, 2)
+
+    blobs = [ids, credits, geneds, gpa, terms, titles, gened_table, term_table]
+    offsets = []
+    pos = _align(HEADER.size)
+    for blob in blobs:
+        offsets.append(pos)
+        pos = _align(pos + blob.nbytes)
+    offsets += [pos, len(heap.data)]
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, ID_WIDTH, n, len(gened_names), len(term_names),
+        int(created if created is not None else time.time()), *offsets,
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for off, blob in zip(offsets, blobs):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(blob.tobytes())
+        f.write(b"\0" * (offsets[-2] - f.tell()))
+        f.write(bytes(heap.data))
+    os.replace(tmp, path)
+    return n
+
+
+def snapshot_from_db(db, path : str) -> int:
+    """Snapshot the stored courses; run after rollups so avgGpa is current."""
+    return write_snapshot(db.courses.find({}, _PROJECTION), path)
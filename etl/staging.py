@@ -0,0 +1,180 @@
+from pymongo import ASCENDING
+
+# Full reload: load into empty <name>_staging collections with plain
+# inserts, build indexes once, validate, then rename each staging
+# collection over the live one. Readers keep seeing the old data until the
+# rename, and never see a half-loaded catalog.
+
+SEEDED = ("courses", "sections", "gparecords", "coursesearch")
+STAGING_SUFFIX = "_staging"
+
+# Unique keys match the upsert filters the incremental modes use.
+INDEXES = {
+    "courses": [
+        ([("courseId", ASCENDING)], {"unique": True}),
+        ([("subject", ASCENDING), ("number", ASCENDING)], {}),
+    ],
+    "sections": [
+        ([("sectionId", ASCENDING)], {"unique": True}),
+        ([("courseId", ASCENDING), ("term", ASCENDING)], {}),
+    ],
+    "gparecords": [
+        ([("courseId", ASCENDING), ("term", ASCENDING), ("instructor", ASCENDING)], {"unique": True}),
+        ([("term", ASCENDING)], {}),
+    ],
+    # Multikey index on the search keys (see search.py).
+    "coursesearch": [
+        ([("courseId", ASCENDING)], {"unique": True}),
+        ([("keys", ASCENDING)], {}),
+        ([("subject", ASCENDING), ("number", ASCENDING)], {}),
+    ],
+}
+
+SPOT_CHECK_SAMPLE = 200
+
+
+class StagingDb:
+    """
+    Stands in for the Database object MongoSink and the rollups take:
+    courses/sections/gparecords resolve to their staging collections,
+    anything else passes through.
+    """
+
+    def __init__(self, db, suffix=STAGING_SUFFIX):
+        self._db = db
+        self.suffix = suffix
+
+    def name(self, collection : str) -> str:
+        return collection + self.suffix if collection in SEEDED else collection
+
+    def __getitem__(self, collection):
+        return self._db[self.name(collection)]
+
+    def __getattr__(self, collection):
+        if collection.startswith("_"):
+            raise AttributeError(collection)
+        return self[collection]
+
+
+# Index options copied from the live collections onto the staging ones.
+COPIED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+
+def _index_name(keys) -> str:
+    """MongoDB's default index name for a key spec ("courseId_1")."""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def dedupe(coll, fields) -> int:
+    """Delete all but the newest document of every key in fields that occurs more than once."""
+    pipeline = [
+        {"$sort": {"_id": -1}},
+        {"$group": {"_id": {f: f"${f}" for f in fields}, "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}},
+    ]
+    extra = [i for group in coll.aggregate(pipeline, allowDiskUse=True) for i in group["ids"][1:]]
+    if extra:
+        coll.delete_many({"_id": {"$in": extra}})
+    return len(extra)
+
+
+def ensure_indexes(db):
+    """
+    Create the seed's unique and compound indexes (no-op if they exist).
+    An index of the same name with other options, like the non-unique
+    courseId_1 the API models used to create, is dropped and rebuilt; keys
+    that must become unique are deduplicated first.
+    """
+    for collection, specs in INDEXES.items():
+        coll = db[collection]
+        existing = coll.index_information()
+        for keys, opts in specs:
+            current = existing.get(_index_name(keys))
+            if current is not None and bool(current.get("unique")) != bool(opts.get("unique")):
+                if opts.get("unique"):
+                    removed = dedupe(coll, [field for field, _ in keys])
+                    if removed:
+                        print(f"[indexes] {collection}: removed {removed} duplicate {_index_name(keys)} documents")
+                coll.drop_index(_index_name(keys))
+                print(f"[indexes] {collection}: rebuilding {_index_name(keys)} with {opts or 'default options'}")
+            coll.create_index(keys, **opts)
+
+
+def copy_indexes(source, target):
+    """Create source's indexes that target lacks (same name or same keys), with their options."""
+    have = target.index_information()
+    have_keys = [tuple(map(tuple, info["key"])) for info in have.values()]
+    for name, info in source.index_information().items():
+        keys = [tuple(k) for k in info["key"]]
+        if name in have or tuple(keys) in have_keys:
+            continue
+        target.create_index(keys, name=name, **{k: info[k] for k in COPIED_OPTIONS if k in info})
+
+
+def prepare(db) -> StagingDb:
+    """Drop leftovers from an earlier failed reload and return the staging view."""
+    staging = StagingDb(db)
+    for collection in SEEDED:
+        db.drop_collection(staging.name(collection))
+    return staging
+
+
+def apply_deferred(sink, deferred):
+    """Writes that had to wait for the unique indexes (repeat keys across chunks), in the order they were queued."""
+    for method, collection, docs, *args in deferred:
+        getattr(sink, method)(collection, docs, *args)
+
+
+def validate(db, staging : StagingDb, min_ratio=0.5):
+    """
+    Sanity checks before the swap. Raises ValueError (leaving the live
+    collections untouched) if the staging load looks wrong.
+    """
+    problems = []
+    counts = {c: staging[c].estimated_document_count() for c in SEEDED}
+
+    for c in ("courses", "sections"):
+        if counts[c] == 0:
+            problems.append(f"{c}: staging collection is empty")
+    for c in SEEDED:
+        live = db[c].estimated_document_count()
+        if live and counts[c] < live * min_ratio:
+            problems.append(f"{c}: {counts[c]} staged documents vs {live} live (< {min_ratio:.0%})")
+
+    sample = list(staging.sections.aggregate([
+        {"$sample": {"size": SPOT_CHECK_SAMPLE}},
+        {"$project": {"_id": 0, "sectionId": 1, "courseId": 1, "term": 1}},
+    ]))
+    course_ids = sorted({s["courseId"] for s in sample})
+    known = {
+        c["courseId"]: set(c.get("termsOffered") or [])
+        for c in staging.courses.find({"courseId": {"$in": course_ids}}, {"_id": 0, "courseId": 1, "termsOffered": 1})
+    }
+    for s in sample:
+        if s["courseId"] not in known:
+            problems.append(f"section {s['sectionId']} points at missing course {s['courseId']}")
+        elif s["term"] and s["term"] not in known[s["courseId"]]:
+            problems.append(f"section {s['sectionId']}: term {s['term']} missing from termsOffered")
+
+    bad_gpa = staging.gparecords.count_documents({"avgGpa": {"$not": {"$gte": 0, "$lte": 4}, "$ne": None}})
+    if bad_gpa:
+        problems.append(f"gparecords: {bad_gpa} documents with avgGpa outside [0, 4]")
+
+    if problems:
+        raise ValueError("staging validation failed:\n  " + "\n  ".join(problems[:20]))
+    return counts
+
+
+def swap(db, staging : StagingDb):
+    """
+    Rename each staging collection over its live counterpart, after
+    copying the live indexes it lacks onto it. Each rename
+    is atomic (renameCollection with dropTarget); the three collections are
+    swapped back to back, not in one transaction.
+    """
+    # Indexes the API models create (subject, term, instructor, ...) live
+    # only on the live collections; carry them over so the rename keeps them.
+    for collection in SEEDED:
+        copy_indexes(db[collection], db[staging.name(collection)])
+    for collection in SEEDED:
+        db[staging.name(collection)].rename(collection, dropTarget=True)
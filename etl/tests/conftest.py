@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# etl/ modules import each other as top-level modules (seed.py is run as a
+# script from etl/), so the tests put etl/ on the path the same way.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    """A small bench-generated catalog.csv and gpa.csv, set as seed.py's inputs. Returns their paths."""
+    import bench
+    import seed
+
+    data = tmp_path / "data"
+    cat_file, gpa_file = bench.generate(str(data), 600, 600, seed=1)
+    monkeypatch.setattr(seed, "CAT_DIR", str(data))
+    monkeypatch.setattr(seed, "GPA_DIR", str(data))
+    monkeypatch.setattr(seed, "CAT_FILE", cat_file)
+    monkeypatch.setattr(seed, "GPA_FILE", gpa_file)
+    return cat_file, gpa_file
@@ -0,0 +1,160 @@
+import copy
+import os
+import random
+
+import pandas as pd
+import pytest
+
+from checkpoint import Checkpoint
+from delta import DeltaTracker
+from memory import MemoryGuard
+from rollups import affected_courses, build_rollups
+from sinks import MemorySink
+import seed
+
+CHUNK = 50
+
+
+class Killed(Exception):
+    pass
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    """Counts committed frames; set commits["kill"] = n to interrupt the run right after the n-th."""
+    state = {"n": 0, "kill": None}
+    committer = Checkpoint.committer
+
+    def counting(self, *args):
+        on_commit = committer(self, *args)
+
+        def wrapped(rows, loader_state):
+            on_commit(rows, loader_state)
+            state["n"] += 1
+            if state["n"] == state["kill"]:
+                raise Killed(state["n"])
+        return wrapped
+
+    monkeypatch.setattr(Checkpoint, "committer", counting)
+    return state
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """
+    Counts sink writes and delta journal entries; set writes["kill"] = n to
+    interrupt the run at the n-th: a write after half of its batch went
+    through, a journal entry after it was saved but before its write.
+    """
+    state = {"n": 0, "kill": None}
+
+    def kill_point():
+        state["n"] += 1
+        return state["n"] == state["kill"]
+
+    for method in ("upsert", "extend"):
+        def partial(self, collection, docs, *args, _write=getattr(MemorySink, method)):
+            docs = list(docs)
+            if kill_point():
+                _write(self, collection, docs[:len(docs) // 2], *args)
+                raise Killed(state["n"])
+            _write(self, collection, docs, *args)
+        monkeypatch.setattr(MemorySink, method, partial)
+
+    journal = Checkpoint.journal
+
+    def journaled(self, collection, keys, before):
+        journal(self, collection, keys, before)
+        if any(keys.values()) and kill_point():
+            raise Killed(state["n"])
+
+    monkeypatch.setattr(Checkpoint, "journal", journaled)
+    return state
+
+
+def _run(sink, state_dir, enabled, resume=False):
+    """What seed.run does for a sequential streamed run, on a MemorySink."""
+    options = {"delta": enabled}
+    path = os.path.join(state_dir, "checkpoint.json")
+    checkpoint = (Checkpoint.load(path, options) if resume else None) or Checkpoint(path, options)
+    delta = DeltaTracker(enabled=enabled)
+    checkpoint.restore_changes(delta)
+    if enabled:
+        delta.journal = checkpoint.journal
+    seed.load_catalog_csv(sink, MemoryGuard(chunk_size=CHUNK), delta, checkpoint=checkpoint)
+    seed.load_gpa_csv(sink, MemoryGuard(chunk_size=CHUNK), delta, checkpoint=checkpoint)
+    checkpoint.clear()
+    return {c: {change: sorted(set(keys)) for change, keys in log.items()} for c, log in delta.changes.items()}
+
+
+def _edit_inputs(cat_file, gpa_file):
+    """Change a spread of rows, so a delta run has work in most chunks."""
+    cat = pd.read_csv(cat_file, dtype=str, keep_default_na=False)
+    cat.loc[cat.index[::37], "Room"] = "9999"
+    cat.to_csv(cat_file, index=False)
+    gpa = pd.read_csv(gpa_file, dtype=str, keep_default_na=False)
+    gpa.loc[gpa.index[::41], "A"] = "0"
+    gpa.to_csv(gpa_file, index=False)
+
+
+def _rollups(sink, changes, enabled):
+    """The GPA rollups seed.run would build after the load: courseId -> rollup."""
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().get_database("rollups_test")
+    for c in ("courses", "gparecords"):
+        db[c].insert_many([dict(d) for d in sink.collections[c].values()])
+    build_rollups(db, affected_courses(changes) if enabled else None)
+    return {d["courseId"]: d.get("gpa") for d in db.courses.find({}, {"_id": 0})}
+
+
+@pytest.mark.parametrize("enabled", [False, True], ids=["upsert", "delta"])
+def test_resume_after_a_kill_matches_an_uninterrupted_run(inputs, tmp_path, commits, enabled):
+    base = MemorySink()
+    if enabled:
+        _run(base, str(tmp_path / "base"), False)
+        _edit_inputs(*inputs)
+
+    reference = copy.deepcopy(base)
+    commits["n"] = 0
+    expected = _run(reference, str(tmp_path / "reference"), enabled)
+    total = commits["n"]
+    assert total > 2 * len(inputs)
+
+    for kill in sorted(random.Random(39).sample(range(1, total), 4)):
+        sink, state = copy.deepcopy(base), str(tmp_path / f"kill{kill}")
+        commits.update(n=0, kill=kill)
+        with pytest.raises(Killed):
+            _run(sink, state, enabled)
+        commits["kill"] = None
+        changes = _run(sink, state, enabled, resume=True)
+
+        assert not os.path.exists(os.path.join(state, "checkpoint.json"))
+        assert sink.collections == reference.collections, kill
+        if enabled:
+            assert changes == expected, kill
+
+
+@pytest.mark.parametrize("enabled", [False, True], ids=["upsert", "delta"])
+def test_resume_after_a_kill_mid_write_matches_an_uninterrupted_run(inputs, tmp_path, writes, enabled):
+    base = MemorySink()
+    if enabled:
+        _run(base, str(tmp_path / "base"), False)
+        _edit_inputs(*inputs)
+
+    reference = copy.deepcopy(base)
+    writes["n"] = 0
+    expected = _run(reference, str(tmp_path / "reference"), enabled)
+    rollups = _rollups(reference, expected, enabled)
+    total = writes["n"]
+
+    for kill in sorted(random.Random(39).sample(range(1, total + 1), 8)):
+        sink, state = copy.deepcopy(base), str(tmp_path / f"kill{kill}")
+        writes.update(n=0, kill=kill)
+        with pytest.raises(Killed):
+            _run(sink, state, enabled)
+        writes["kill"] = None
+        changes = _run(sink, state, enabled, resume=True)
+
+        assert sink.collections == reference.collections, kill
+        assert changes == expected, kill
+        assert _rollups(sink, changes, enabled) == rollups, kill
@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+
+from delta import DeltaTracker
+from memory import MemoryGuard
+from sinks import MemorySink
+import seed
+
+
+def _load(sink, guard):
+    delta = DeltaTracker(enabled=True)
+    seed.load_catalog_csv(sink, guard, delta)
+    seed.load_gpa_csv(sink, guard, delta)
+    return delta
+
+
+def test_streamed_delta_rerun_changes_nothing(inputs):
+    # 600 random rows in chunks of 50: many sections and GPA keys span
+    # several chunks.
+    sink = MemorySink()
+    first = _load(sink, MemoryGuard(chunk_size=50))
+    assert first.changes["sections"]["added"]
+
+    again = _load(sink, MemoryGuard(chunk_size=50))
+    assert all(not keys for log in again.changes.values() for keys in log.values()), again.summary()
+
+    whole = MemorySink()
+    _load(whole, None)
+    for c in ("courses", "sections", "gparecords"):
+        assert sink.collections[c] == whole.collections[c]
+
+
+def test_streamed_delta_reports_a_change_in_a_later_chunk(inputs):
+    cat_file, _ = inputs
+    sink = MemorySink()
+    _load(sink, MemoryGuard(chunk_size=50))
+
+    # Move the meeting of the last row whose section started in an earlier chunk.
+    df = pd.read_csv(cat_file, dtype=str, keep_default_na=False)
+    section = df["Subject"] + df["Number"] + df["YearTerm"] + df["Section"]
+    first_chunk = (section.groupby(section).transform(lambda s: s.index.min()) // 50)
+    row = df.index[first_chunk < df.index // 50][-1]
+    df.loc[row, ["Start Time", "End Time"]] = ["07:00 AM", "07:50 AM"]
+    df.to_csv(cat_file, index=False)
+
+    again = _load(sink, MemoryGuard(chunk_size=50))
+    assert len(again.changes["sections"]["changed"]) == 1
+    assert not again.changes["gparecords"]["changed"]
+
+
+def test_changelogs_of_back_to_back_runs_are_kept(tmp_path):
+    paths = {DeltaTracker(enabled=True).write_changelog(str(tmp_path)) for _ in range(3)}
+    assert len(paths) == 3 and all(os.path.exists(p) for p in paths)
+
+
+def test_streamed_delta_logs_a_repeated_gpa_key_once(inputs):
+    _, gpa_file = inputs
+    gpa = pd.read_csv(gpa_file, dtype=str, keep_default_na=False)
+    # The first row again at the end, with other counts: the last row wins.
+    gpa = pd.concat([gpa, gpa.iloc[[0]].assign(A="77")], ignore_index=True)
+    gpa.to_csv(gpa_file, index=False)
+    key = "|".join([f"{gpa.at[0, 'Subject']} {gpa.at[0, 'Number']}", gpa.at[0, "YearTerm"],
+                    gpa.at[0, "Primary Instructor"]])
+
+    sink = MemorySink()
+    first = _load(sink, MemoryGuard(chunk_size=50))
+    assert key in first.changes["gparecords"]["added"]
+    assert key not in first.changes["gparecords"]["changed"]
+    assert sink.collections["gparecords"][key]["counts"]["A"] == 77
+
+    # Only the row that loses changed: nothing to report.
+    gpa.loc[0, "A"] = "1"
+    gpa.to_csv(gpa_file, index=False)
+    assert not _load(sink, MemoryGuard(chunk_size=50)).changes["gparecords"]["changed"]
+
+    gpa.loc[len(gpa) - 1, "A"] = "78"
+    gpa.to_csv(gpa_file, index=False)
+    assert _load(sink, MemoryGuard(chunk_size=50)).changes["gparecords"]["changed"] == [key]
+    assert sink.collections["gparecords"][key]["counts"]["A"] == 78
+    assert all(not before for before in first.before.values())
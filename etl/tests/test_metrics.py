@@ -0,0 +1,83 @@
+import json
+
+import pandas as pd
+import pytest
+
+from metrics import Histogram, RunMetrics, LATENCY_BUCKETS_MS, ISSUE_EXAMPLES
+import seed
+
+
+def test_histogram_buckets_and_merge():
+    h = Histogram()
+    for ms in (0.5, 3, 3, 40, 20_000):
+        h.observe(ms / 1000, ops=10)
+    d = h.to_dict()
+    assert d["batches"] == 5 and d["ops"] == 50
+    assert list(d["buckets"]) == [f"le{b}ms" for b in LATENCY_BUCKETS_MS] + ["inf"]
+    assert d["buckets"]["le1ms"] == 1 and d["buckets"]["le5ms"] == 2 and d["buckets"]["inf"] == 1
+    assert d["p50Ms"] == 5 and d["p95Ms"] is None
+    assert d["maxS"] == pytest.approx(20.0)
+
+    merged = Histogram()
+    merged.merge(d)
+    merged.merge(d)
+    assert merged.to_dict()["batches"] == 10 and merged.to_dict()["ops"] == 100
+
+
+def test_run_report_shape(inputs, tmp_path):
+    mongomock = pytest.importorskip("mongomock")
+    from sinks import MongoSink
+
+    cat_file, _ = inputs
+    cat = pd.read_csv(cat_file, dtype=str, keep_default_na=False)
+    cat.loc[cat.index[::10], "Start Time"] = "25:00 PM"
+    cat.to_csv(cat_file, index=False)
+
+    events = []
+    metrics = RunMetrics(hooks=[lambda event, payload: events.append((event, payload))]).attach()
+    args = seed.parse_args(["--state-dir", str(tmp_path / "state"), "--snapshot", ""])
+    try:
+        seed.run(args, MongoSink(mongomock.MongoClient().get_database("metrics_test")), None, None, metrics)
+    finally:
+        metrics.detach()
+    path = tmp_path / "report.json"
+    metrics.write_report(str(path), status="ok", mode="upsert")
+    report = json.loads(path.read_text())
+
+    assert list(report) == ["startedAt", "finishedAt", "durationS", "status", "mode",
+                            "stages", "writeBatches", "rowIssues", "peakRssMb"]
+    for kind in ("catalog", "gpa"):
+        for stage in ("read", "transform", "documents", "write"):
+            s = report["stages"][f"{kind}.{stage}"]
+            assert set(s) == {"rows", "seconds", "rowsPerS"}
+        assert report["stages"][f"{kind}.read"]["rows"] == 600
+    assert {"rollups", "search"} <= set(report["stages"])
+
+    assert {"courses", "sections", "gparecords"} <= set(report["writeBatches"])
+    sections = report["writeBatches"]["sections"]
+    assert sections["batches"] == sum(sections["buckets"].values())
+
+    bad = report["rowIssues"]["bad Start Time"]
+    assert bad["rows"] == 60
+    assert len(bad["examples"]) == ISSUE_EXAMPLES and all(":" in e for e in bad["examples"])
+
+    kinds = {event for event, _ in events}
+    assert kinds == {"progress", "stage", "report"}
+    assert events[-1] == ("report", report)
+
+
+def test_worker_metrics_merge_into_the_parent():
+    worker = RunMetrics()
+    worker.stage("catalog.read", 100, 0.5)
+    worker.batch("sections", 50, 0.004)
+    worker.issue("bad Start Time", 3, ["a", "b", "c"])
+
+    parent = RunMetrics()
+    parent.stage("catalog.read", 20, 0.1)
+    parent.merge(worker.state())
+    parent.merge(json.loads(json.dumps(worker.state())))
+
+    report = parent.report()
+    assert report["stages"]["catalog.read"]["rows"] == 220
+    assert report["writeBatches"]["sections"]["ops"] == 100
+    assert report["rowIssues"]["bad Start Time"] == {"rows": 6, "examples": ["a", "b", "c", "a", "b"]}
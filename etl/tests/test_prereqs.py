@@ -0,0 +1,29 @@
+import pytest
+
+from prereqs import parse_prereqs, PrereqGraph
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("CS 225", "CS 225"),
+    ("CS 124 or 125", {"or": ["CS 124", "CS 125"]}),
+    ("CS 225, CS 233 and MATH 241", {"and": ["CS 225", "CS 233", "MATH 241"]}),
+    ("One of CS 225, CS 277", {"or": ["CS 225", "CS 277"]}),
+    ("CS 128 and CS 173; or MATH 213", {"or": [{"and": ["CS 128", "CS 173"]}, "MATH 213"]}),
+    ("Credit or concurrent registration in MATH 241", {"concurrent": "MATH 241"}),
+    # Oxford commas: the conjunction after the last comma closes the list.
+    ("CS 125, ECE 220, or CS 124", {"or": ["CS 125", "ECE 220", "CS 124"]}),
+    ("MATH 220, MATH 221, or MATH 234", {"or": ["MATH 220", "MATH 221", "MATH 234"]}),
+    ("CS 225, CS 233, and MATH 241", {"and": ["CS 225", "CS 233", "MATH 241"]}),
+    # Mixed: "and" binds looser than "or".
+    ("CS 173, and CS 225 or CS 233", {"and": ["CS 173", {"or": ["CS 225", "CS 233"]}]}),
+    ("CS 173 or MATH 213, and CS 225", {"and": [{"or": ["CS 173", "MATH 213"]}, "CS 225"]}),
+])
+def test_parse_prereqs(text, expected):
+    assert parse_prereqs(text) == expected
+
+
+def test_validate_plan_with_oxford_comma_or():
+    graph = PrereqGraph({"CS 374": parse_prereqs("CS 125, ECE 220, or CS 124")})
+    assert graph.validate_plan([["CS 124"], ["CS 374"]]) == []
+    problems = graph.validate_plan([["CS 374", "CS 124"]])
+    assert [p["courseId"] for p in problems] == ["CS 374"]
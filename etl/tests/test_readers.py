@@ -0,0 +1,106 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import readers
+import seed
+from memory import MemoryGuard
+from readers import read_frames, GPA_DTYPES
+from sinks import MemorySink
+from transforms import transform_gpa
+
+GPA_CSV = """YearTerm,Subject,Number,A+,A,B,F,W,Students,Primary Instructor
+2025-fa,CS,225,10,--,5,,--,20,"Doe, J"
+2025-fa,CS,233,2,3, ,1,0,6,"Roe, K"
+2025-sp,MATH,241,--,--,--,--,--,--,"Poe, L"
+"""
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+@pytest.mark.parametrize("guard", [None, MemoryGuard(chunk_size=2)], ids=["whole", "stream"])
+def test_gpa_placeholders_load_as_zero_counts(tmp_path, monkeypatch, engine, guard):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(readers, "CSV_ENGINE", engine)
+    path = tmp_path / "gpa.csv"
+    path.write_text(GPA_CSV)
+
+    t = pd.concat([transform_gpa(df) for df in read_frames(str(path), GPA_DTYPES, guard)], ignore_index=True)
+
+    assert t["A"].tolist() == [0.0, 3.0, 0.0]
+    assert t["B"].tolist() == [5.0, 0.0, 0.0]
+    assert t["avgGpa"].round(3).tolist()[:2] == [3.667, 3.333]
+    assert t["avgGpa"].isna().tolist() == [False, False, True]
+    assert t["W"].isna().tolist() == [True, False, True]
+    assert t["students"].tolist()[:2] == [20.0, 6.0]
+
+
+@pytest.fixture
+def grouped_inputs(inputs, tmp_path):
+    """The bench inputs grouped by term, as the exports are, each in its own directory."""
+    out = []
+    for path, kind in zip(inputs, ("catalog", "gpa")):
+        d = tmp_path / kind
+        d.mkdir()
+        df = pd.read_csv(path, dtype=str, keep_default_na=False).sort_values("YearTerm", kind="stable")
+        df.to_csv(d / f"{kind}.csv", index=False)
+        out.append(str(d / f"{kind}.csv"))
+    return out
+
+
+def _load(monkeypatch, cat_file, gpa_file, guard=None, terms=None):
+    monkeypatch.setattr(seed, "CAT_FILE", cat_file)
+    monkeypatch.setattr(seed, "GPA_FILE", gpa_file)
+    sink = MemorySink()
+    seed.load_catalog_csv(sink, guard)
+    seed.load_gpa_csv(sink, guard, terms=terms)
+    return {c: {k: json.dumps(d, sort_keys=True) for k, d in docs.items()} for c, docs in sink.collections.items()}
+
+
+def _variants(cat_csv, gpa_csv, tmp_path, monkeypatch):
+    """name -> (catalog input, GPA input) in every format the loaders read."""
+    import convert
+
+    out = {}
+    for codec in ("gz", "bz2"):
+        paths = []
+        for src in (cat_csv, gpa_csv):
+            dst = tmp_path / f"{os.path.basename(src)}.{codec}"
+            pd.read_csv(src, dtype=str, keep_default_na=False).to_csv(dst, index=False)
+            paths.append(str(dst))
+        out[f"csv.{codec}"] = tuple(paths)
+    # Raw columnar exports keep the types a CSV reader would infer.
+    pd.read_csv(cat_csv).to_parquet(tmp_path / "raw-catalog.parquet")
+    pd.read_csv(gpa_csv).to_feather(tmp_path / "raw-gpa.feather")
+    out["raw parquet/feather"] = (str(tmp_path / "raw-catalog.parquet"), str(tmp_path / "raw-gpa.feather"))
+
+    monkeypatch.setattr(convert, "CAT_DIR", os.path.dirname(cat_csv))
+    monkeypatch.setattr(convert, "GPA_DIR", os.path.dirname(gpa_csv))
+    cat_out, gpa_out = str(tmp_path / "catalog.parquet"), str(tmp_path / "gpa.parquet")
+    convert.main(["--catalog-out", cat_out, "--gpa-out", gpa_out, "--chunk-size", "130"])
+    out["normalized dataset"] = (cat_out, gpa_out)
+    return out
+
+
+def test_columnar_and_compressed_inputs_load_like_csv(grouped_inputs, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(readers, "CSV_ENGINE", "c")
+    reference = _load(monkeypatch, *grouped_inputs)
+    streamed = _load(monkeypatch, *grouped_inputs, MemoryGuard(chunk_size=70))
+    monkeypatch.setattr(readers, "CSV_ENGINE", "pyarrow")
+    assert _load(monkeypatch, *grouped_inputs) == reference
+
+    for name, (cat_file, gpa_file) in _variants(*grouped_inputs, tmp_path, monkeypatch).items():
+        assert _load(monkeypatch, cat_file, gpa_file) == reference, name
+        assert _load(monkeypatch, cat_file, gpa_file, MemoryGuard(chunk_size=70)) == streamed, name
+
+
+def test_normalized_dataset_reads_only_the_terms_asked_for(grouped_inputs, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    reference = _load(monkeypatch, *grouped_inputs)["gparecords"]
+    cat_file, gpa_file = _variants(*grouped_inputs, tmp_path, monkeypatch)["normalized dataset"]
+
+    got = _load(monkeypatch, cat_file, gpa_file, terms=["2024-fa"])["gparecords"]
+    assert got and got == {k: d for k, d in reference.items() if json.loads(d)["term"] == "2024-fa"}
@@ -0,0 +1,95 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import schedule
+from schedule import (
+    DAYS, EMPTY, SLOTS_PER_DAY, WORDS, conflicts, find_schedules, meeting_bits, schedules, section_bits, to_words,
+)
+
+
+def _slots(bits):
+    return np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder="little"))
+
+
+def test_meeting_bits_cover_the_day_they_name():
+    slots = _slots(meeting_bits("MW", "09:00", "09:50"))
+    assert len(slots) == 2 * 10
+    assert {s // SLOTS_PER_DAY for s in slots} == {DAYS.index("M"), DAYS.index("W")}
+
+
+def test_meeting_bits_ignore_times_past_the_end_of_the_day():
+    # "25:00" would otherwise run into Tuesday's slots.
+    assert not _slots(meeting_bits("M", "23:00", "25:00")).size
+    assert not _slots(meeting_bits("U", "23:00", "24:00")).size
+    assert _slots(meeting_bits("U", "23:00", "23:55")).max() < WORDS * 64
+
+
+def _random_groups(rng, sizes):
+    """One bitmap per option: one or two random meetings on the hour grid."""
+    days = ["MWF", "TR", "MW", "F", "R"]
+    groups = []
+    for n in sizes:
+        rows = []
+        for _ in range(n):
+            bits = EMPTY.copy()
+            for _ in range(rng.integers(1, 3)):
+                hour = int(rng.integers(8, 12))
+                bits |= meeting_bits(days[rng.integers(len(days))], f"{hour:02d}:00", f"{hour:02d}:50")
+            rows.append(bits)
+        groups.append(np.stack(rows))
+    return groups
+
+
+def _brute_force(groups):
+    return {
+        pick for pick in itertools.product(*(range(len(g)) for g in groups))
+        if not any(conflicts(groups[a][pick[a]], groups[b][pick[b]])
+                   for a, b in itertools.combinations(range(len(groups)), 2))
+    }
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_find_schedules_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    groups = _random_groups(rng, rng.integers(1, 7, size=rng.integers(1, 5)))
+    expected = _brute_force(groups)
+
+    found = find_schedules(groups)
+    assert found.shape == (len(expected), len(groups))
+    assert {tuple(row) for row in found.tolist()} == expected
+
+    limited = find_schedules(groups, limit=3)
+    assert len(limited) == min(3, len(expected))
+    assert {tuple(row) for row in limited.tolist()} <= expected
+
+
+def test_find_schedules_joins_in_blocks(monkeypatch):
+    # Small blocks force the depth-first split of partial schedules.
+    monkeypatch.setattr(schedule, "JOIN_BLOCK", 2)
+    groups = _random_groups(np.random.default_rng(99), [6, 5, 4])
+    assert {tuple(row) for row in find_schedules(groups).tolist()} == _brute_force(groups)
+
+
+def test_schedules_from_stored_sections():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().get_database("schedule_test")
+
+    def section(sid, course, kind, days, start, end):
+        meetings = [{"days": list(days), "start": start, "end": end}]
+        return {"sectionId": sid, "courseId": course, "term": "2025-fa", "type": kind,
+                "meetings": meetings, "timeBits": to_words(section_bits(meetings))}
+
+    db.sections.insert_many([
+        section("CS 225:AL1", "CS 225", "LEC", "MWF", "10:00", "10:50"),
+        section("CS 225:AD1", "CS 225", "DIS", "T", "09:00", "09:50"),
+        section("CS 225:AD2", "CS 225", "DIS", "R", "11:00", "11:50"),
+        section("MATH 241:ONL", "MATH 241", "ONL", "MWF", "10:00", "10:50"),
+        section("MATH 241:BL1", "MATH 241", "LCD", "TR", "11:00", "12:15"),
+    ])
+
+    got = schedules(db, ["CS 225", "MATH 241"], "2025-fa")
+    assert got == [{"CS 225": ["CS 225:AD1", "CS 225:AL1"], "MATH 241": ["MATH 241:BL1"]}]
+    with pytest.raises(ValueError):
+        schedules(db, ["CS 225", "CS 374"], "2025-fa")
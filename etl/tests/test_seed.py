@@ -0,0 +1,21 @@
+import os
+
+from delta import Manifest
+from metrics import RunMetrics
+from sinks import make_sink
+import seed
+
+
+def test_file_sink_runs_leave_the_manifest_alone(inputs, tmp_path):
+    # A count:/jsonl: run doesn't load the database, so a later Mongo
+    # --delta run must not skip the inputs because of it.
+    state = str(tmp_path / "state")
+    manifest = Manifest(os.path.join(state, "manifest.json"))
+    for spec in ("count:", f"jsonl:{tmp_path / 'out'}"):
+        args = seed.parse_args(["--sink", spec, "--state-dir", state, "--snapshot", ""])
+        sink = make_sink(spec)
+        seed.run(args, sink, None, manifest, RunMetrics())
+        sink.close()
+
+    assert not os.path.exists(manifest.path)
+    assert manifest.files == {}
@@ -0,0 +1,43 @@
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+import staging
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().get_database("seed_test")
+
+
+def test_ensure_indexes_replaces_non_unique_model_indexes(db):
+    # What the API models created before the seed made these keys unique.
+    db.courses.create_index("courseId")
+    db.sections.create_index("sectionId")
+    db.courses.insert_many([{"courseId": "CS 1", "v": 1}, {"courseId": "CS 1", "v": 2}, {"courseId": "CS 2"}])
+
+    staging.ensure_indexes(db)
+    staging.ensure_indexes(db)
+
+    assert db.courses.index_information()["courseId_1"].get("unique")
+    assert db.sections.index_information()["sectionId_1"].get("unique")
+    assert sorted(c["courseId"] for c in db.courses.find()) == ["CS 1", "CS 2"]
+    assert db.courses.find_one({"courseId": "CS 1"})["v"] == 2
+
+
+def test_swap_keeps_live_only_indexes(db):
+    db.courses.create_index("subject")
+    db.sections.create_index([("term", 1)])
+    db.gparecords.create_index("instructor", sparse=True)
+    staging.ensure_indexes(db)
+
+    stage = staging.prepare(db)
+    staging.ensure_indexes(stage)
+    for collection in staging.SEEDED:
+        stage[collection].insert_one({"staged": True})
+    staging.swap(db, stage)
+
+    assert "subject_1" in db.courses.index_information()
+    assert "term_1" in db.sections.index_information()
+    assert db.gparecords.index_information()["instructor_1"].get("sparse")
+    assert db.courses.find_one()["staged"]
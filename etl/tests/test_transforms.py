@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from transforms import (
+    clean_str, to_float_hours, parse_time_to_24h, parse_days, first_instructor,
+    clean_col, hours_col, time_col, days_col, instructor_col,
+    GRADE_WEIGHTS, transform_gpa, gpa_documents,
+)
+
+# Cells as the exports have them, including what the scalar helpers were
+# written around: missing, blank, "ARR" (arranged) and the 12 AM/PM edges.
+CELLS = [
+    np.nan, None, "", "   ", "ARR", "n.a.",
+    "3 hours.", "4.0 Hours", "1 TO 4 hours.", "0.5 hours", "Hours vary",
+    "9:00 AM", " 9:00 am ", "12:00 AM", "12:50 AM", "12:00 PM", "12:50 PM", "11:59 PM", "1:05 PM", "9:00",
+    "13:00 PM", "0:30 AM", "9:60 AM",
+    "MWF", "M W F", "TR", "F", "mwf", "MTWRF", "SU", "MMW",
+    "Siglos, D", "Siglos,D;Wang, Y", " Wang, Y ; Siglos, D ", ";Wang, Y", "Staff",
+]
+
+
+def _same(a, b):
+    missing = lambda v: v is None or (isinstance(v, float) and math.isnan(v))
+    return (missing(a) and missing(b)) or a == b
+
+
+@pytest.mark.parametrize("col_fn, helper, clean", [
+    (clean_col, clean_str, False),
+    (hours_col, to_float_hours, True),
+    (time_col, parse_time_to_24h, True),
+    (days_col, lambda s: "".join(parse_days(s)), True),
+    (instructor_col, first_instructor, True),
+])
+def test_column_transforms_match_scalar_helpers(col_fn, helper, clean):
+    col = pd.Series(CELLS, dtype=object)
+    # transform_catalog hands the parsers clean_col'd columns; they must
+    # also agree on the raw cells.
+    for source in ([col, clean_col(col)] if clean else [col]):
+        got = col_fn(source)
+        assert got.index.equals(source.index)
+        for cell, value in zip(source, got):
+            assert _same(value, helper(cell)), (cell, value, helper(cell))
+
+
+def test_column_transforms_keep_the_frame_index():
+    col = pd.Series(["12:00 AM", "ARR", np.nan], index=[7, 3, 5], dtype=object)
+    assert time_col(col).to_dict() == {7: "00:00", 3: "", 5: ""}
+
+
+def test_times_that_are_not_on_the_clock_are_rejected():
+    # Read as 25:00 they would set bits in the next day's slots.
+    assert parse_time_to_24h("13:00 PM") == ""
+    assert parse_time_to_24h("9:60 AM") == ""
+    assert time_col(pd.Series(["13:00 PM", "12:59 PM"])).tolist() == ["", "12:59"]
+
+
+@pytest.mark.parametrize("rows", [1, 2, 7, 8, 97])
+def test_gpa_average_does_not_depend_on_the_frame_size(rows):
+    counts = dict(zip(GRADE_WEIGHTS, [14, 16, 15, 9, 12, 10, 11, 12, 8, 18, 16, 5, 14]))
+    df = pd.DataFrame([{"YearTerm": "2025-sp", "Subject": "BIOE", "Number": "105", **counts}] * rows)
+    expected = sum(c * GRADE_WEIGHTS[g] for g, c in counts.items()) / sum(counts.values())
+    assert transform_gpa(df)["avgGpa"].tolist() == [expected] * rows
+    assert gpa_documents(transform_gpa(df))[-1]["avgGpa"] == round(expected, 3)
@@ -0,0 +1,351 @@
+import re 
+import math 
+import numpy as np
+import pandas as pd 
+from schedule import section_bits, to_words
+from prereqs import PREREQ_RE, parse_prereqs
+
+GRADE_WEIGHTS = {
+    "A+" : 4.0,
+    "A" : 4.0,
+    "A-" : 3.67,
+    "B+": 3.33,
+    "B" : 3.00,
+    "B-" : 2.67,
+    "C+" : 2.33,
+    "C" : 2.00,
+    "C-" : 1.67,
+    "D+" : 1.33,
+    "D" : 1.00,
+    "D-": 0.67,
+    "F":0.00
+}
+
+#Helper Functions
+
+def _is_nan(x) -> bool:
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+def clean_str(x):
+    return "" if _is_nan(x) else str(x).strip()
+
+def to_float_hours(s : str):
+    """Extract numeric hours from strings like '3 hours', '4.0 Hours', etc."""
+    if not isinstance(s, str):
+        return None
+    m = re.search(r"(\d+(?:\.\d+)?)\s*hour", s.lower())
+    return float(m.group(1)) if m else None
+
+
+def split_list(val):
+    """Split by comma OR " and " (gen-eds often formatted with 'and')"""
+    if not isinstance(val, str) or not val.strip():
+        return []
+    s = val.replace(" and ", ",")
+    return [x.strip() for x in s.split(",") if x.strip()]
+
+
+def parse_time_to_24h(s : str) -> str:
+    """ "9:00 AM" -> "09:00", "12:50 PM" -> "12:50", empty or not a clock time ("13:00 PM") -> "" """
+    if not isinstance(s, str) or not s.strip():
+        return ""
+
+    s = s.strip().upper()
+    m = re.match(r"^(\d{1,2}):(\d{2})\s*(AM|PM)$", s)
+    if not m:
+        return ""
+
+    hh, mm, ap = int(m.group(1)), m.group(2), m.group(3)
+    if hh > 12 or int(mm) > 59:
+        return ""
+    if ap == "AM":
+        hh = 0 if hh == 12 else hh
+    else:
+        hh = 12 if hh == 12 else hh + 12
+
+    return f"{hh:02d}:{mm}"
+
+
+def parse_days(s : str):
+    """ Accepts "MWF", "M W F" or single "F" """
+    if not isinstance(s, str) or not s.strip():
+        return []
+    
+    s = s.strip().upper().replace(" ", "")
+
+    out = [ch for ch in s if ch in {"M", "T", "W", "R", "F", "S", "U"}]
+
+    seen = set()
+    dedup = []
+
+    for d in out:
+        if d not in seen:
+            dedup.append(d)
+            seen.add(d)
+    return dedup
+
+def first_instructor(s : str):
+    """ "Siglos,D;Wang, Y" -> "Siglos, D" """
+    if not isinstance(s , str) or not s.strip():
+        return ""
+    return s.split(";")[0].strip()
+
+
+#Vectorized Transforms
+#
+# Column-wise equivalents of the helpers above. The scalar helpers stay as
+# the reference behaviour; each *_col function must agree with its helper
+# applied cell by cell.
+
+HOURS_RE = r"(\d+(?:\.\d+)?)\s*hour"
+TIME_RE = r"^(\d{1,2}):(\d{2})\s*(AM|PM)$"
+
+
+def _map_unique(col : pd.Series, fn) -> pd.Series:
+    """Apply a scalar helper once per distinct value (days, gen-eds repeat heavily)."""
+    # factorize, not a dict: NaN and None are one missing value (code -1,
+    # the last slot), where a dict keeps both and Series.map rejects that.
+    codes, uniques = pd.factorize(col)
+    lookup = np.empty(len(uniques) + 1, dtype=object)
+    for i, u in enumerate(uniques):
+        lookup[i] = fn(u)
+    lookup[-1] = fn(None)
+    return pd.Series(lookup[codes], index=col.index)
+
+
+def clean_col(col : pd.Series) -> pd.Series:
+    """Column version of clean_str: missing -> "", everything else str().strip()."""
+    return col.astype(object).where(col.notna(), "").astype(str).str.strip()
+
+
+def hours_col(col : pd.Series) -> pd.Series:
+    """Column version of to_float_hours; unmatched cells are NaN."""
+    return col.str.lower().str.extract(HOURS_RE, expand=False).astype(float)
+
+
+def time_col(col : pd.Series) -> pd.Series:
+    """Column version of parse_time_to_24h."""
+    parts = col.str.strip().str.upper().str.extract(TIME_RE)
+    ok = parts[0].notna()
+    hh = pd.to_numeric(parts[0].where(ok, "0")).astype(int)
+    ok &= (hh <= 12) & (pd.to_numeric(parts[1].where(ok, "0")).astype(int) <= 59)
+    hh = hh.where(hh != 12, 0) + 12 * (parts[2] == "PM")
+    out = hh.astype(str).str.zfill(2) + ":" + parts[1].where(ok, "")
+    return out.where(ok, "")
+
+
+def days_col(col : pd.Series) -> pd.Series:
+    """Column version of parse_days, as the joined day string ("MWF")."""
+    return _map_unique(col, lambda s: "".join(parse_days(s)))
+
+
+def instructor_col(col : pd.Series) -> pd.Series:
+    """Column version of first_instructor."""
+    return col.str.extract(r"^([^;]*)", expand=False).fillna("").str.strip()
+
+
+def split_list_col(col : pd.Series) -> pd.Series:
+    """Column version of split_list."""
+    return _map_unique(col, split_list)
+
+
+def _col(df : pd.DataFrame, name : str) -> pd.Series:
+    if name in df.columns:
+        return clean_col(df[name])
+    return pd.Series("", index=df.index, dtype=object)
+
+
+def transform_catalog(df : pd.DataFrame) -> pd.DataFrame:
+    """Normalize raw catalog rows into one typed column per document field."""
+    subject = _col(df, "Subject")
+    number = _col(df, "Number")
+    term = _col(df, "YearTerm")
+    section = _col(df, "Section")
+    course_id = (subject + " " + number).str.strip()
+
+    room = _col(df, "Room")
+    bldg = _col(df, "Building")
+    location = (room + " " + bldg).str.strip()
+
+    # An explicit Prerequisites column wins; otherwise use the
+    # "Prerequisite: ..." sentence of the description.
+    description = _col(df, "Description")
+    prereq = _col(df, "Prerequisites")
+    prereq = prereq.where(prereq != "", description.str.extract(PREREQ_RE, expand=False).fillna("").str.strip())
+
+    notes = _col(df, "Section Info")
+    notes = notes.where(notes != "", _col(df, "Schedule Information"))
+
+    return pd.DataFrame({
+        "courseId": course_id,
+        "subject": subject,
+        "number": number,
+        "title": _col(df, "Name"),
+        "description": description,
+        "prereqText": prereq,
+        "credits": hours_col(_col(df, "Credit Hours")),
+        "genEds": split_list_col(_col(df, "Degree Attributes")),
+        "term": term,
+        "section": section,
+        "sectionId": course_id + ":" + term + ":" + section,
+        "crn": _col(df, "CRN"),
+        "type": _col(df, "Type Code"),
+        "instructor": instructor_col(_col(df, "Instructors")),
+        "location": location,
+        "days": days_col(_col(df, "Days of Week")),
+        "start": time_col(_col(df, "Start Time")),
+        "end": time_col(_col(df, "End Time")),
+        "notes": notes,
+    })
+
+
+def _given_but_empty(df : pd.DataFrame, name : str, parsed : pd.Series) -> pd.Series:
+    """Rows where the raw column has text but the parsed value came out empty/NaN."""
+    raw = _col(df, name)
+    empty = parsed.isna() if parsed.dtype.kind == "f" else parsed == ""
+    return (raw != "") & empty
+
+
+def catalog_issues(df : pd.DataFrame, t : pd.DataFrame) -> dict:
+    """
+    Data-quality problems in a raw catalog frame, as reason -> boolean row
+    mask over its transformed frame. The rows are still loaded; the field
+    the reason names is just left empty.
+    """
+    return {
+        "missing Subject/Number": (t["subject"] == "") | (t["number"] == ""),
+        "unparseable Credit Hours": _given_but_empty(df, "Credit Hours", t["credits"]),
+        "bad Start Time": _given_but_empty(df, "Start Time", t["start"]),
+        "bad End Time": _given_but_empty(df, "End Time", t["end"]),
+        "unknown Days of Week": _given_but_empty(df, "Days of Week", t["days"]),
+    }
+
+
+def catalog_documents(t : pd.DataFrame):
+    """
+    Build course and section documents from a transformed catalog frame.
+    Each course gets the set of terms it appears in; each section gets all
+    of its distinct meeting rows, in file order, and their combined weekly
+    bitmap (timeBits, see schedule.py).
+    """
+    terms = t.loc[t["term"] != ""].groupby("courseId", sort=False)["term"].unique()
+
+    courses = []
+    for r in t.drop_duplicates("courseId").itertuples(index=False):
+        courses.append({
+            "courseId" : r.courseId,
+            "subject" : r.subject,
+            "number" : r.number,
+            "title" : r.title,
+            "description" : r.description,
+            "credits" : None if math.isnan(r.credits) else float(r.credits),
+            "genEds" : list(r.genEds),
+            "prereqText" : r.prereqText,
+            "prereqs" : parse_prereqs(r.prereqText, r.subject),
+            "termsOffered" : sorted(terms.get(r.courseId, [])),
+        })
+
+    meetings = {}
+    meeting_rows = t.drop_duplicates(["sectionId", "days", "start", "end", "location"])
+    for sid, days, start, end, location in zip(
+        meeting_rows["sectionId"], meeting_rows["days"], meeting_rows["start"],
+        meeting_rows["end"], meeting_rows["location"],
+    ):
+        meetings.setdefault(sid, []).append({
+            "days": list(days),
+            "start": start,
+            "end": end,
+            "raw": f"{days} {start}-{end} | {location}".strip()
+        })
+
+    sections = []
+    for r in t.drop_duplicates("sectionId").itertuples(index=False):
+        sections.append({
+            "sectionId": r.sectionId,
+            "courseId": r.courseId,
+            "term": r.term,
+            "section": r.section,
+            "crn": r.crn,
+            "type": r.type,
+            "instructor": r.instructor,
+            "location": r.location,
+            "modality": "",
+            "meetings": meetings[r.sectionId],
+            "timeBits": to_words(section_bits(meetings[r.sectionId])),
+            "notes": r.notes
+        })
+
+    return courses, sections
+
+
+def transform_gpa(df : pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize raw GPA rows. avgGpa is computed on whole grade-count
+    columns, weighted by GRADE_WEIGHTS.
+    """
+    term_col  = "YearTerm" if "YearTerm" in df.columns else "Term"
+    instr_col = "Primary Instructor" if "Primary Instructor" in df.columns else "Instructor"
+
+    grade_cols = [g for g in GRADE_WEIGHTS.keys() if g in df.columns]
+    counts = (
+        df[grade_cols].apply(pd.to_numeric, errors="coerce").fillna(0.0).astype(float)
+        if grade_cols else pd.DataFrame(index=df.index)
+    )
+    m = counts.to_numpy(dtype=float)
+    w = np.array([GRADE_WEIGHTS[g] for g in grade_cols], dtype=float)
+    # Summed column by column, in grade order, like the per-row sum: a BLAS
+    # m @ w may add in another order depending on the frame's size, and
+    # averages that land on a half (2.3375) then round differently per chunk.
+    total_pts = np.zeros(len(m))
+    for j, weight in enumerate(w):
+        total_pts += m[:, j] * weight
+    total_graded = m.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.where(total_graded > 0, total_pts / total_graded, np.nan)
+
+    out = pd.DataFrame({
+        "courseId": (_col(df, "Subject") + " " + _col(df, "Number")).str.strip(),
+        "term": _col(df, term_col),
+        "instructor": _col(df, instr_col),
+        "avgGpa": avg,
+    })
+    for g in grade_cols:
+        out[g] = counts[g]
+    for src, dst in (("W", "W"), ("Students", "students")):
+        if src in df.columns:
+            out[dst] = pd.to_numeric(df[src], errors="coerce")
+    return out
+
+
+def gpa_issues(df : pd.DataFrame, t : pd.DataFrame) -> dict:
+    """GPA counterpart of catalog_issues."""
+    return {
+        "missing Subject/Number": (_col(df, "Subject") == "") | (_col(df, "Number") == ""),
+        "no graded students": t["avgGpa"].isna(),
+    }
+
+
+def gpa_documents(t : pd.DataFrame):
+    """Build gparecords documents from a transformed GPA frame."""
+    grade_cols = [g for g in GRADE_WEIGHTS.keys() if g in t.columns]
+    extra_cols = [c for c in ("W", "students") if c in t.columns]
+
+    docs = []
+    rows = zip(
+        t["courseId"], t["term"], t["instructor"], t["avgGpa"],
+        t[grade_cols].to_numpy(dtype=float).tolist(),
+        t[extra_cols].to_numpy(dtype=float).tolist(),
+    )
+    for course_id, term, instr, avg, counts, extras in rows:
+        doc = {
+            "courseId": course_id,
+            "term": term,
+            "instructor": instr,
+            "counts": dict(zip(grade_cols, counts)),
+            "avgGpa": None if math.isnan(avg) else round(float(avg), 3)
+        }
+        for c, v in zip(extra_cols, extras):
+            if not math.isnan(v):
+                doc[c] = int(v)
+        docs.append(doc)
+    return docs